@@ -6,3 +6,9 @@ from .constants import THIS_APP
 class BaseConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = THIS_APP
+
+    def ready(self):
+        # Implicitly connect signal handlers decorated with @receiver.
+        from . import signals
+        # Register system checks.
+        from . import checks
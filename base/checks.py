@@ -0,0 +1,47 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from django.conf import settings
+from django.core import checks
+
+from utils import is_shared_cache
+
+
+@checks.register(checks.Tags.caches)
+def shared_cache_check(app_configs, **kwargs):
+    """
+    Check the cache is shared between the web worker processes, as the
+    application caches are invalidated via table versions held in the cache
+    :param app_configs: app configs to check
+    :return: list of check messages
+    """
+    messages = []
+    if not settings.DEVELOPMENT and not is_shared_cache():
+        msg = 'The default cache is not shared between processes, so ' \
+              'changes made in one process are not seen by the others.'
+        hint = 'Set CACHE_URL to a shared cache, e.g. redis or dbcache.'
+        messages.append(
+            checks.Error(msg, hint=hint, id='base.E001')
+            if settings.WEB_CONCURRENCY > 1 else
+            checks.Warning(msg, hint=hint, id='base.W001')
+        )
+    return messages
@@ -29,11 +29,18 @@ from recipesnstuff.constants import (
     APP_NAME, ABOUT_MENU_CTX, ABOUT_ROUTE_NAME, NO_ROBOTS_CTX
 )
 from recipesnstuff import VAL_TEST_PATH_PREFIX
-from utils import resolve_req, add_navbar_attr
+from utils import resolve_req, add_navbar_attr, navbar_menu_map
 
 from .constants import APP_NAME_CTX, VAL_TEST_CTX, TOAST_POSITION_CTX
 from .views import ToastPosition
 
+# navbar menus activated by route names
+NAVBAR_MENUS = navbar_menu_map([
+    (HOME_MENU_CTX, [HOME_ROUTE_NAME, RECIPE_HOME_ROUTE_NAME]),
+    (HELP_MENU_CTX, [HELP_ROUTE_NAME]),
+    (ABOUT_MENU_CTX, [ABOUT_ROUTE_NAME]),
+])
+
 
 def base_context(request: HttpRequest) -> dict:
     """
@@ -48,15 +55,9 @@ def base_context(request: HttpRequest) -> dict:
     no_robots = False
     called_by = resolve_req(request)
     if called_by:
-        for ctx, routes in [
-            (HOME_MENU_CTX, [
-                HOME_ROUTE_NAME, RECIPE_HOME_ROUTE_NAME
-            ]),
-            (HELP_MENU_CTX, [HELP_ROUTE_NAME]),
-            (ABOUT_MENU_CTX, [ABOUT_ROUTE_NAME]),
-        ]:
-            add_navbar_attr(
-                context, ctx, is_active=called_by.url_name in routes)
+        active = NAVBAR_MENUS.get(called_by.url_name)
+        for ctx in [HOME_MENU_CTX, HELP_MENU_CTX, ABOUT_MENU_CTX]:
+            add_navbar_attr(context, ctx, is_active=ctx == active)
 
         # set no robots
         # allauth route names start with 'account_' and have no app name
@@ -20,14 +20,17 @@
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
 from collections import namedtuple
-from copy import deepcopy
+from copy import copy
 from dataclasses import dataclass
-from typing import Callable, Union, TypeVar, List, Optional
+from functools import cache
+from inspect import getattr_static
+from typing import Callable, Union, TypeVar, List, Optional, Tuple, Type
 
 import json_fix
 import jsonpickle
 
-from django.db.models import Model
+from django.db.models import Model, JSONField
+from django.db.models.query_utils import DeferredAttribute
 
 from utils import ensure_list
 
@@ -36,10 +39,53 @@ TypeImagePool = TypeVar("TypeImagePool", bound="ImagePool")
 
 ImagePoolUrl = namedtuple('ImagePoolUrl', ['url', 'static'])
 
+FieldSpec = namedtuple(
+    #            attribute name, read via descriptor, copy value
+    'FieldSpec', ['name', 'via_descriptor', 'mutable'])
 
-@dataclass
+MUTABLE_TYPES = (list, dict, set, bytearray)
+""" Types of values which are copied when populating a DTO """
+
+
+@cache
+def model_field_specs(model_class: Type[Model]) -> Tuple[FieldSpec, ...]:
+    """
+    Get the specs of the concrete fields of a model class; the specs are
+    generated once per model class
+    :param model_class: model class
+    :return: tuple of field specs
+    """
+    specs = []
+    for field in model_class._meta.concrete_fields:
+        descriptor = getattr_static(model_class, field.attname, None)
+        specs.append(FieldSpec(
+            name=field.attname,
+            # plain deferred attributes just return the instance value,
+            # others (e.g. file or country fields) wrap it
+            via_descriptor=not isinstance(descriptor, DeferredAttribute)
+            or type(descriptor).__get__ is not DeferredAttribute.__get__,
+            mutable=isinstance(field, JSONField)
+        ))
+    return tuple(specs)
+
+
+@cache
+def model_field_names(model_class: Type[Model]) -> frozenset:
+    """
+    Get the attribute names of the concrete fields of a model class
+    :param model_class: model class
+    :return: set of names
+    """
+    return frozenset(spec.name for spec in model_field_specs(model_class))
+
+
+@dataclass(slots=True)
 class BaseDto:
-    """ Base data transfer object """
+    """
+    Base data transfer object
+    Note: subclasses which are not slotted dataclasses have a `__dict__`, so
+          attributes may be added dynamically
+    """
 
     add_new: bool = False
     """ Add new placeholder flag"""
@@ -48,17 +94,31 @@ class BaseDto:
     def from_model_to_obj(model: Model, instance, exclude: List[str] = None):
         """
         Generate a DTO from the specified `model`
-        :param model: model class
+        Note: field values are immutable or shallow copied, so no model state
+              is shared with the DTO
+        :param model: model instance
         :param instance: DTO instance to populate
         :param exclude: names of fields to exclude; default None
         :return: updated instance
         """
-        if exclude is None:
-            exclude = []
-        for key in list(model.__dict__.keys()):
+        exclude = set(exclude) if exclude else set()
+        values = model.__dict__
+        for spec in model_field_specs(type(model)):
+            if spec.name not in values or spec.name in exclude:
+                continue    # deferred or excluded
+            value = getattr(model, spec.name) if spec.via_descriptor else \
+                values[spec.name]
+            setattr(instance, spec.name,
+                    copy(value) if spec.mutable else value)
+
+        # non-field attributes, e.g. annotations
+        for key in values.keys() - model_field_names(type(model)):
             if key.startswith('_') or key in exclude:
                 continue
-            setattr(instance, key, deepcopy(getattr(model, key)))
+            value = values[key]
+            setattr(instance, key,
+                    copy(value) if isinstance(value, MUTABLE_TYPES)
+                    else value)
         return instance
 
     @staticmethod
@@ -0,0 +1,48 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from typing import Callable
+
+from django.http import HttpRequest
+
+from utils import resolve_req
+
+
+class ResolverMatchMiddleware:
+    """
+    A middleware factory to resolve the request url once, before the other
+    middleware and context processors which check it, and cache the
+    resolver match on the request
+    https://docs.djangoproject.com/en/4.1/topics/http/middleware/
+    """
+    def __init__(self, get_response: Callable):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> Callable:
+        """
+        Code to be executed for each request before the view
+        (and later middleware) are called.
+        :param request:
+        :return: callable for next step in middleware chain
+        """
+        resolve_req(request)
+        return self.get_response(request)
@@ -0,0 +1,52 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from utils import bump_table_version
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def model_written_callback(sender, **kwargs):
+    """
+    Process signal sent when a model instance is saved or deleted;
+    invalidates cached entries generated from the model's table
+    """
+    bump_table_version(sender)
+
+
+@receiver(m2m_changed)
+def m2m_changed_callback(sender, **kwargs):
+    """
+    Process signal sent when a many-to-many relation is changed;
+    invalidates cached entries generated from the relation's tables
+    """
+    # sender is the intermediate model
+    bump_table_version(sender)
+    instance = kwargs.get('instance', None)
+    if instance is not None:
+        bump_table_version(instance)
+    model = kwargs.get('model', None)
+    if model is not None:
+        bump_table_version(model)
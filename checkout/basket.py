@@ -19,8 +19,8 @@
 #  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
-from collections import namedtuple
-from typing import List, Union, TypeVar, Tuple, Optional
+from collections import namedtuple, Counter
+from typing import List, Union, TypeVar, Tuple, Optional, Dict
 from dataclasses import dataclass
 from decimal import Decimal
 
@@ -35,7 +35,8 @@ from base.views import info_toast_payload, ToastTemplate
 from order.misc import generate_order_num
 from order.models import OrderProduct, ProductType
 from order.queries import (
-    get_subscription_product, get_ingredient_box_product, get_delivery_product
+    get_subscription_product, get_ingredient_box_product,
+    get_delivery_product, get_ingredient_box_recipes
 )
 from profiles.enums import AddressType
 from profiles.models import Address
@@ -656,6 +657,21 @@ def add_ingredient_box_to_basket(
     return navbar_basket_html(basket, result)
 
 
+def basket_recipe_counts(basket: Basket) -> Dict[int, int]:
+    """
+    Get the number of ingredient boxes of each recipe in a basket
+    :param basket: basket to count
+    :return: number of ingredient boxes, by recipe id
+    """
+    recipes = get_ingredient_box_recipes(
+        [item.sku for item in basket.items])
+    counts = Counter()
+    for item in basket.items:
+        if item.sku in recipes:
+            counts[recipes[item.sku]] += item.count
+    return dict(counts)
+
+
 def navbar_basket_html(basket: Basket, result: BasketUpdate = None):
     """
     Get the html code for the navbar basket
@@ -191,6 +191,8 @@ RECIPE_NAME = 'name'
 RECIPE_FOOD_ID = 'food_id'
 RECIPE_PREP_TIME = 'prep_time'
 RECIPE_COOK_TIME = 'cook_time'
+RECIPE_TOTAL_TIME = 'total_time'     # derived from prep & cook time
+RECIPE_UPDATED = 'updated'           # import time
 RECIPE_DATE_PUBLISHED = 'date_published'
 RECIPE_DESCRIPTION = 'description'
 RECIPE_SERVINGS = 'servings'
@@ -501,6 +503,7 @@ def load_recipe(args: argparse.Namespace, curs):
         """ Generate recipe values """
         # same order as RECIPE_FIELDS
         values = []
+        total_time = timedelta()
         # RecipeId column so its a DoubleScalar
         patch = RECIPE_PATCHES.get(int(recipe_id.as_py()), None)
         for _, col in RECIPE_COLS.items():
@@ -521,6 +524,7 @@ def load_recipe(args: argparse.Namespace, curs):
                         hours=float(duration.time.hours))
                 else:
                     value = timedelta()
+                total_time += value
             elif col == Cols.AuthorName:
                 value = authors.get(value).new_id
             elif col == Cols.RecipeCategory:
@@ -528,10 +532,14 @@ def load_recipe(args: argparse.Namespace, curs):
             elif col in Cols.int_fields():
                 value = int(value) if value else 0
             values.append('' if value is None else value)
+        values.append(total_time)   # RECIPE_TOTAL_TIME
+        values.append(imported)     # RECIPE_UPDATED
 
         return tuple(values)
 
-    table_fields = ', '.join(RECIPE_FIELDS)
+    imported = datetime.now(timezone.utc)
+    table_fields = ', '.join(
+        RECIPE_FIELDS + [RECIPE_TOTAL_TIME, RECIPE_UPDATED])
     process_data(
         args, curs, progress, 'Recipe', RECIPE_TABLE, table_fields,
         get_recipes_table()[COL_NAMES[Cols.RecipeId]], args.skip_recipe,
@@ -0,0 +1,61 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from django.test import SimpleTestCase, override_settings
+
+from base.checks import shared_cache_check
+
+LOCMEM_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+DB_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'rns_cache',
+    }
+}
+
+
+class TestSharedCacheCheck(SimpleTestCase):
+    """
+    Test the shared cache system check
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+
+    def test_shared_cache_check(self):
+        """ Test a process-local cache is reported in production """
+        for caches, development, workers, expected in [
+            (LOCMEM_CACHES, True, 4, []),
+            (LOCMEM_CACHES, False, 1, ['base.W001']),
+            (LOCMEM_CACHES, False, 4, ['base.E001']),
+            (DB_CACHES, False, 4, []),
+        ]:
+            with self.subTest(caches=caches, development=development,
+                              workers=workers):
+                with override_settings(CACHES=caches,
+                                       DEVELOPMENT=development,
+                                       WEB_CONCURRENCY=workers):
+                    self.assertEqual(
+                        [msg.id for msg in shared_cache_check(None)],
+                        expected)
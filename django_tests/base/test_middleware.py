@@ -0,0 +1,72 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from http import HTTPStatus
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import resolve, reverse
+
+from recipes.constants import RECIPES_ROUTE_NAME
+from recipesnstuff import RECIPES_APP_NAME
+from recipesnstuff.constants import (
+    HELP_ROUTE_NAME, HELP_MENU_CTX, HOME_MENU_CTX, RECIPES_MENU_CTX,
+    CATEGORIES_MENU_CTX
+)
+from user.models import User
+from utils import namespaced_url
+
+
+class TestResolverMatchMiddleware(TestCase):
+    """
+    Test the request url is resolved once per request
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['currencies.json', 'measure.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'a@b.com', 'pass1234')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def get(self, url: str):
+        """ Get a page, counting the url resolutions """
+        with patch('utils.views.resolve', wraps=resolve) as mock_resolve:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(mock_resolve.call_count, 1)
+        return response
+
+    def test_navbar_menus(self):
+        """ Test the navbar menu of the requested page is active """
+        for url, active, inactive in [
+            (reverse(HELP_ROUTE_NAME), HELP_MENU_CTX, HOME_MENU_CTX),
+            (reverse(namespaced_url(RECIPES_APP_NAME, RECIPES_ROUTE_NAME)),
+             RECIPES_MENU_CTX, CATEGORIES_MENU_CTX),
+        ]:
+            with self.subTest(url=url):
+                response = self.get(url)
+                self.assertTrue(response.context[active].active)
+                self.assertFalse(response.context[inactive].active)
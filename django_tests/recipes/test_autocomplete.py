@@ -0,0 +1,168 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from django_tests.user.base_user_test_cls import BaseUserTest
+from recipes.autocomplete import NameIndex
+from recipes.constants import (
+    RECIPE_AUTOCOMPLETE_ROUTE_NAME, THIS_APP, KEYWORDS_URL_CTX
+)
+from recipes.models import Category, Keyword
+from recipesnstuff.constants import HELP_ROUTE_NAME
+from user.models import User
+from utils import reverse_q, namespaced_url
+
+
+class TestNameIndex(TestCase):
+    """
+    Test name index
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+
+    def test_prefix(self):
+        """ Test prefix search """
+        index = NameIndex([
+            ('Chicken breast', 3), ('apple', 1), ('chickpeas', 4),
+            ('Chicken', 2), ('cheese', 5), ('&quot;chilli', 6),
+        ])
+        self.assertEqual(index.size, 6)
+
+        self.assertEqual(index.prefix('chick', 10), [
+            (2, 'Chicken'), (3, 'Chicken breast'), (4, 'chickpeas')
+        ])
+        self.assertEqual(index.prefix('CHICKEN', 10), [
+            (2, 'Chicken'), (3, 'Chicken breast')
+        ])
+        self.assertEqual(index.prefix('chick', 1), [(2, 'Chicken')])
+        self.assertEqual(index.prefix('z', 10), [])
+
+
+@override_settings(AUTOCOMPLETE_INDEX_MIN_AGE=0)
+class TestAutocompleteView(BaseUserTest):
+    """
+    Test autocomplete view
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        for name in ['Dessert', 'Drinks', 'Dinner &amp; Supper', 'Bread']:
+            Category.objects.create(name=name)
+        self.user, _ = self.get_user_by_index(0)
+        self.client.force_login(self.user)
+
+    @staticmethod
+    def url(entity: str, **kwargs) -> str:
+        return reverse_q(
+            namespaced_url(THIS_APP, RECIPE_AUTOCOMPLETE_ROUTE_NAME),
+            args=[entity], query_kwargs=kwargs)
+
+    def names(self, entity: str, **kwargs) -> list[str]:
+        response = self.client.get(self.url(entity, **kwargs))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return [entry['name'] for entry in response.json()['results']]
+
+    def test_autocomplete(self):
+        """ Test autocomplete results """
+        self.assertEqual(self.names('categories', prefix='d'), [
+            'Dessert', 'Dinner &amp; Supper', 'Drinks'
+        ])
+        self.assertEqual(
+            self.names('categories', prefix='d', limit=2),
+            ['Dessert', 'Dinner &amp; Supper'])
+        self.assertEqual(self.names('categories', prefix=''), [])
+        self.assertEqual(self.names('keywords', prefix='d'), [])
+
+        response = self.client.get(self.url('unknown', prefix='d'))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_category_names_valid(self):
+        """ Test category names are accepted by the recipe form """
+        # as per CategoryCharField
+        for name in self.names('categories', prefix='d'):
+            with self.subTest(name=name):
+                self.assertIsNotNone(Category.get_by_field(
+                    Category.NAME_FIELD, name, get_or_404=False))
+
+    def test_login_required(self):
+        """ Test autocomplete requires a logged-in user """
+        self.client.logout()
+        response = self.client.get(self.url('categories', prefix='d'))
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        self.assertNotIn('Dessert', response.content.decode())
+
+        # user without recipe permissions
+        self.user.groups.clear()
+        self.client.force_login(self.user)
+        response = self.client.get(self.url('categories', prefix='d'))
+        self.assertEqual(response.status_code, HTTPStatus.FORBIDDEN)
+
+    def test_refresh_on_write(self):
+        """ Test autocomplete results are refreshed on write """
+        self.assertEqual(self.names('categories', prefix='br'), ['Bread'])
+
+        Category.objects.create(name='Breakfast')
+        self.assertEqual(
+            self.names('categories', prefix='br'), ['Bread', 'Breakfast'])
+
+        Category.objects.filter(name='Bread').delete()
+        self.assertEqual(self.names('categories', prefix='br'), ['Breakfast'])
+
+
+@override_settings(AUTOCOMPLETE_INDEX_MIN_AGE=0)
+class TestKeywordsContext(TestCase):
+    """
+    Test search keywords context
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['currencies.json']
+
+    def test_keywords_url(self):
+        """ Test keywords aren't loaded to render a page """
+        for name in ['easy', 'dinner']:
+            Keyword.objects.create(name=name)
+        self.client.force_login(User.objects.create_superuser(
+            'admin', 'a@b.com', 'pass1234'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(HELP_ROUTE_NAME))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if Keyword._meta.db_table in query['sql']
+        ])
+        self.assertNotContains(response, '<option value="easy">')
+
+        url = response.context[KEYWORDS_URL_CTX]
+        self.assertEqual(url, TestAutocompleteView.url('keywords'))
+        response = self.client.get(url, {'prefix': 'ea'})
+        self.assertEqual(
+            [entry['name'] for entry in response.json()['results']],
+            ['easy'])
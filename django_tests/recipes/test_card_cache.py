@@ -0,0 +1,174 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from datetime import datetime, timezone
+from io import StringIO
+from tempfile import TemporaryDirectory
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from recipes.models import (
+    Category, Ingredient, Instruction, Keyword, Recipe, RecipeIngredient,
+    Image, Measure
+)
+from recipes.views.card_cache import render_recipe_cards, card_stats
+from recipes.views.dto import RecipeCardDto
+from recipes.views.recipe_queries import recipe_card_projection
+from user.models import User
+from utils import table_versions
+
+OLD_STAMP = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+class TestRecipeCardCache(TestCase):
+    """
+    Test recipe revision stamp and rendered recipe card cache
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['measure.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='cook')
+        cls.category = Category.objects.create(name='Dessert')
+        cls.measure = Measure.get_default_unit()
+        cls.sugar = Ingredient.objects.create(
+            name='sugar', measure=cls.measure)
+        cls.keyword = Keyword.objects.create(name='easy')
+        for idx in range(3):
+            Recipe.objects.create(**{
+                f'{Recipe.NAME_FIELD}': f'Cake {idx}',
+                f'{Recipe.CATEGORY_FIELD}': cls.category,
+                f'{Recipe.AUTHOR_FIELD}': cls.author,
+            })
+
+    def setUp(self):
+        cache.clear()
+        Recipe.objects.update(**{Recipe.UPDATED_FIELD: OLD_STAMP})
+        self.recipe = Recipe.objects.order_by(Recipe.id_field()).first()
+
+    def assert_touched(self, recipe: Recipe, touched: bool = True):
+        """ Check if the revision stamp of a recipe was updated """
+        recipe.refresh_from_db()
+        if touched:
+            self.assertGreater(recipe.updated, OLD_STAMP)
+        else:
+            self.assertEqual(recipe.updated, OLD_STAMP)
+
+    def test_revision_stamp(self):
+        """ Test revision stamp updates on changes to recipe parts """
+        for name, change in [
+            ('save', lambda r: r.save()),
+            ('save fields', lambda r: r.save(
+                update_fields=[Recipe.NAME_FIELD])),
+            ('ingredient', lambda r: RecipeIngredient.objects.create(
+                recipe=r, ingredient=self.sugar, quantity='1',
+                measure=self.measure)),
+            ('image', lambda r: Image.objects.create(recipe=r, url='a.jpg')),
+            ('keyword', lambda r: r.keywords.add(self.keyword)),
+            ('keyword reverse', lambda r: self.keyword.recipe_set.remove(r)),
+            ('instruction', lambda r: r.instructions.add(
+                Instruction.objects.create(text='mix', index=1))),
+            ('author', lambda r: self.author.save()),
+        ]:
+            with self.subTest(change=name):
+                Recipe.objects.update(**{Recipe.UPDATED_FIELD: OLD_STAMP})
+                change(self.recipe)
+                self.assert_touched(self.recipe)
+
+    def test_touch_bumps_version(self):
+        """ Test touching recipes invalidates caches keyed on the table """
+        version = table_versions([Recipe])
+        Recipe.touch(pk__in=[])
+        self.assertEqual(table_versions([Recipe]), version)
+
+        Recipe.touch(pk=self.recipe.pk)
+        self.assert_touched(self.recipe)
+        self.assertNotEqual(table_versions([Recipe]), version)
+
+    def test_author_login_no_touch(self):
+        """ Test revision stamp unchanged by author non-username updates """
+        self.author.save(update_fields=['last_login'])
+        self.assert_touched(self.recipe, touched=False)
+
+    def card_dtos(self):
+        """ Get recipe card DTOs """
+        return [
+            RecipeCardDto.from_model(recipe) for recipe in
+            recipe_card_projection(
+                Recipe.objects.order_by(Recipe.id_field()))
+        ]
+
+    def test_render_recipe_cards(self):
+        """ Test rendered cards are cached until the recipe changes """
+        card_stats.reset()
+
+        cards = render_recipe_cards(self.card_dtos(), 'total')
+        self.assertEqual(len(cards), 3)
+        for idx, card in enumerate(cards):
+            self.assertIn(f'Cake {idx}', card)
+        self.assertEqual(card_stats.get()[:2], (0, 3))
+
+        # all hits
+        self.assertEqual(render_recipe_cards(self.card_dtos(), 'total'),
+                         cards)
+        self.assertEqual(card_stats.get()[:2], (3, 3))
+
+        # changed recipe and different time are misses
+        Image.objects.create(recipe=self.recipe, url='https://a.jpg')
+        cards = render_recipe_cards(self.card_dtos(), 'total')
+        self.assertIn('https://a.jpg', cards[0])
+        self.assertEqual(card_stats.get()[:2], (5, 4))
+        render_recipe_cards(self.card_dtos(), 'prep')
+        self.assertEqual(card_stats.get(), (5, 7, 5 / 12))
+
+
+class TestCacheStatsCommand(SimpleTestCase):
+    """
+    Test cache stats management command
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+
+    def test_requires_shared_cache(self):
+        """ Test the command requires a cache shared between processes """
+        with self.assertRaises(CommandError):
+            call_command('cache_stats', stdout=StringIO())
+
+        with TemporaryDirectory() as cache_dir:
+            with override_settings(CACHES={
+                'default': {
+                    'BACKEND':
+                        'django.core.cache.backends.filebased.FileBasedCache',
+                    'LOCATION': cache_dir,
+                }
+            }):
+                card_stats.reset()
+                card_stats.record(hits=3, misses=1)
+                out = StringIO()
+                call_command('cache_stats', '--reset', stdout=out)
+                self.assertIn(
+                    f'{card_stats.name}: hits 3 misses 1 ratio 0.750',
+                    out.getvalue())
+                self.assertEqual(card_stats.get()[:2], (0, 0))
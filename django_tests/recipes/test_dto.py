@@ -0,0 +1,110 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from datetime import timedelta
+
+from django.test import TestCase
+
+from recipes.models import (
+    Category, Ingredient, Instruction, Recipe, RecipeIngredient, Image,
+    Measure
+)
+from recipes.views.dto import RecipeDto, RecipeCardDto
+from recipes.views.recipe_queries import recipe_card_projection
+from user.models import User
+
+
+class TestRecipeDto(TestCase):
+    """
+    Test RecipeDto
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['measure.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create(username='cook')
+        category = Category.objects.create(name='Dessert')
+        measure = Measure.get_default_unit()
+        sugar = Ingredient.objects.create(name='sugar', measure=measure)
+        for idx in range(5):
+            recipe = Recipe.objects.create(**{
+                f'{Recipe.NAME_FIELD}': f'Cake {idx}',
+                f'{Recipe.CATEGORY_FIELD}': category,
+                f'{Recipe.AUTHOR_FIELD}': author,
+                f'{Recipe.PREP_TIME_FIELD}': timedelta(minutes=idx),
+            })
+            for index in [2, 1]:
+                RecipeIngredient.objects.create(
+                    recipe=recipe, ingredient=sugar, quantity=str(index),
+                    index=index, measure=measure)
+                recipe.instructions.add(Instruction.objects.create(
+                    text=f'step {index}', index=index))
+            Image.objects.create(recipe=recipe, url=f'cake{idx}.jpg')
+
+    def test_from_queryset(self):
+        """ Test batched DTO generation """
+        for count in [1, 5]:
+            recipes = list(Recipe.objects.order_by(Recipe.id_field()))[:count]
+            with self.subTest(count=count):
+                # one query per related attribute, regardless of count
+                with self.assertNumQueries(5):
+                    dtos = RecipeDto.from_queryset(recipes)
+                self.assertEqual(len(dtos), count)
+                for recipe, dto in zip(recipes, dtos):
+                    self.assertEqual(dto.id, recipe.id)
+                    self.assertEqual(dto.author.username, 'cook')
+                    self.assertEqual(dto.category.name, 'Dessert')
+                    self.assertEqual(
+                        [ingred.quantity for ingred in dto.ingredients],
+                        ['1', '2'])
+                    self.assertEqual(
+                        [instruct.index for instruct in dto.instructions],
+                        [1, 2])
+                    self.assertEqual(len(dto.images), 1)
+
+    def test_from_queryset_attributes(self):
+        """ Test batched DTO generation of selected attributes """
+        recipes = list(Recipe.objects.all())
+        with self.assertNumQueries(2):
+            dtos = RecipeDto.from_queryset(
+                recipes, Recipe.IMAGES_FIELD, Recipe.AUTHOR_FIELD,
+                all_attrib=False)
+        self.assertEqual(len(dtos), 5)
+        self.assertTrue(all(len(dto.images) == 1 for dto in dtos))
+
+    def test_card_from_model(self):
+        """ Test card DTO generation from card projection """
+        with self.assertNumQueries(1):
+            cards = [
+                RecipeCardDto.from_model(recipe)
+                for recipe in recipe_card_projection(
+                    Recipe.objects.order_by(Recipe.id_field()))
+            ]
+        self.assertEqual(len(cards), 5)
+        for idx, card in enumerate(cards):
+            with self.subTest(idx=idx):
+                self.assertEqual(card.name, f'Cake {idx}')
+                self.assertEqual(card.author_name, 'cook')
+                self.assertEqual(card.total_time, timedelta(minutes=idx))
+                self.assertEqual(
+                    card.main_image.get_image().url, f'cake{idx}.jpg')
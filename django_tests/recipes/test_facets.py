@@ -0,0 +1,156 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from datetime import timedelta
+
+from urllib.parse import quote
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from recipes.constants import RECIPE_SEARCH_ROUTE_NAME
+from recipes.models import Category, Keyword, Recipe
+from recipes.views.recipe_facets import (
+    get_recipe_facets, PREP_TIME_BUCKETS, CALORIE_BUCKETS,
+    CATEGORY_NAME_LOOKUP, KEYWORD_NAME_LOOKUP
+)
+from recipesnstuff import RECIPES_APP_NAME
+from user.models import User
+from utils import SEARCH_QUERY, namespaced_url, reverse_q
+
+FACETS_DIV = 'div__recipe-facets'
+
+
+class TestRecipeFacets(TestCase):
+    """
+    Test recipe search facets
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['currencies.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        author = User.objects.create_superuser(
+            'cook', 'a@b.com', 'pass1234')
+        categories = [
+            Category.objects.create(name=name)
+            for name in ['Chicken Breast', 'Dessert', 'Soup']
+        ]
+        keywords = [
+            Keyword.objects.create(name=name)
+            for name in ['easy', 'vegan', 'dinner']
+        ]
+        for idx in range(12):
+            recipe = Recipe.objects.create(**{
+                f'{Recipe.NAME_FIELD}':
+                    f'Chicken {idx}' if idx % 2 else f'Cake {idx}',
+                f'{Recipe.CATEGORY_FIELD}': categories[idx % 3],
+                f'{Recipe.AUTHOR_FIELD}': author,
+                f'{Recipe.PREP_TIME_FIELD}': timedelta(minutes=7 * idx),
+                f'{Recipe.CALORIES_FIELD}': 110 * idx,
+            })
+            recipe.keywords.add(*keywords[:idx % 3 + 1])
+
+    def setUp(self):
+        cache.clear()
+        self.query_set = Recipe.objects.filter(
+            **{f'{Recipe.NAME_FIELD}__startswith': 'Chicken'})
+
+    def test_facet_counts(self):
+        """ Test facet counts match the filtered query set """
+        facets = get_recipe_facets(self.query_set)
+        self.assertFalse(facets.is_empty)
+
+        for entries, lookup in [
+            (facets.categories, CATEGORY_NAME_LOOKUP),
+            (facets.keywords, KEYWORD_NAME_LOOKUP),
+        ]:
+            self.assertTrue(entries)
+            for entry in entries:
+                with self.subTest(lookup=lookup, label=entry.label):
+                    self.assertEqual(
+                        entry.count,
+                        self.query_set.filter(
+                            **{lookup: entry.label}).count())
+
+        for entries, lookup, buckets in [
+            (facets.prep_time, Recipe.PREP_TIME_FIELD, PREP_TIME_BUCKETS),
+            (facets.calories, Recipe.CALORIES_FIELD, CALORIE_BUCKETS),
+        ]:
+            self.assertEqual(len(entries), len(buckets))
+            for entry, bucket in zip(entries, buckets):
+                with self.subTest(lookup=lookup, label=entry.label):
+                    self.assertEqual(
+                        entry.count,
+                        self.query_set.filter(bucket.q(lookup)).count())
+
+    def test_facet_queries(self):
+        """ Test facets take a fixed number of queries and are cached """
+        # one aggregate pass for the buckets, one each for the top
+        # categories and keywords
+        with self.assertNumQueries(3):
+            facets = get_recipe_facets(self.query_set)
+
+        # ordering is not part of the key, so the cached facets are used
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                get_recipe_facets(
+                    self.query_set.order_by(f'-{Recipe.NAME_FIELD}')),
+                facets)
+
+        # same number of queries from result ids
+        cache.clear()
+        ids = list(self.query_set.values_list(Recipe.id_field(), flat=True))
+        with self.assertNumQueries(3):
+            self.assertEqual(
+                get_recipe_facets(self.query_set, ids=ids), facets)
+
+        # writing to the table invalidates the cached facets
+        Recipe.objects.filter(
+            **{f'{Recipe.NAME_FIELD}': 'Chicken 1'}).delete()
+        facets = get_recipe_facets(self.query_set)
+        self.assertEqual(
+            sum(entry.count for entry in facets.calories),
+            self.query_set.count())
+
+    def test_no_results(self):
+        """ Test facets of an empty result set are empty """
+        facets = get_recipe_facets(self.query_set.filter(
+            **{f'{Recipe.NAME_FIELD}__startswith': 'Pie'}))
+        self.assertTrue(facets.is_empty)
+
+    def test_facets_displayed(self):
+        """ Test facets are only displayed for results """
+        self.client.force_login(User.objects.get(username='cook'))
+        url = reverse_q(
+            namespaced_url(RECIPES_APP_NAME, RECIPE_SEARCH_ROUTE_NAME))
+        for search, displayed in [
+            ('category="Chicken Breast"', True),
+            ('category="Pie"', False),
+        ]:
+            with self.subTest(search=search):
+                response = self.client.get(
+                    f'{url}?{SEARCH_QUERY}={quote(search)}')
+                if displayed:
+                    self.assertContains(response, FACETS_DIV)
+                else:
+                    self.assertNotContains(response, FACETS_DIV)
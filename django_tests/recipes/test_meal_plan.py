@@ -0,0 +1,140 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from http import HTTPStatus
+
+import numpy as np
+from django.test import TestCase
+
+from recipes.constants import (
+    RECIPE_MEAL_PLAN_ROUTE_NAME, DAYS_QUERY, MEALS_QUERY, EXCLUDE_QUERY,
+    SEED_QUERY
+)
+from recipes.models import Category, Recipe
+from recipes.nutrition import NutritionMatrix
+from recipesnstuff import RECIPES_APP_NAME
+from user.models import User
+from utils import reverse_q, namespaced_url, bump_table_version
+
+
+class TestMealPlan(TestCase):
+    """
+    Test meal plans
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['currencies.json', 'measure.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'a@b.com', 'pass1234')
+        cls.categories = [
+            Category.objects.create(name=name)
+            for name in ['Dessert', 'Chicken Breast']
+        ]
+        cls.recipes = [
+            Recipe.objects.create(**{
+                f'{Recipe.NAME_FIELD}': f'Recipe {index}',
+                f'{Recipe.CATEGORY_FIELD}': cls.categories[index % 2],
+                f'{Recipe.AUTHOR_FIELD}': cls.user,
+                f'{Recipe.CALORIES_FIELD}': 600 + 10 * index,
+                f'{Recipe.FAT_CONTENT_FIELD}': 26,
+                f'{Recipe.CARBOHYDRATE_CONTENT_FIELD}': 90,
+                f'{Recipe.FIBRE_CONTENT_FIELD}': 9,
+                f'{Recipe.PROTEIN_CONTENT_FIELD}': 17,
+            }) for index in range(12)
+        ]
+
+    def setUp(self):
+        # test data changes are rolled back without a table version bump
+        self.addCleanup(bump_table_version, Recipe)
+
+    def assertMatrixEqual(self, matrix: NutritionMatrix,
+                          expected: NutritionMatrix):
+        """ Assert matrices are equal """
+        np.testing.assert_array_equal(matrix.recipe_ids, expected.recipe_ids)
+        np.testing.assert_array_equal(matrix.values, expected.values)
+        np.testing.assert_array_equal(
+            matrix.category_ids, expected.category_ids)
+
+    def test_matrix_refresh(self):
+        """ Test incremental refresh of nutrition matrix """
+        matrix = NutritionMatrix.build()
+        self.assertEqual(matrix.size, len(self.recipes))
+        self.assertEqual(
+            matrix.category_ids.tolist(),
+            [recipe.category_id for recipe in self.recipes])
+
+        recipe = self.recipes[0]
+        recipe.calories = 1000
+        recipe.category = self.categories[1]
+        recipe.save()
+        self.recipes[1].delete()
+        Recipe.objects.create(**{
+            f'{Recipe.NAME_FIELD}': 'New',
+            f'{Recipe.CATEGORY_FIELD}': self.categories[0],
+            f'{Recipe.AUTHOR_FIELD}': self.user,
+            f'{Recipe.CALORIES_FIELD}': 500,
+        })
+
+        refreshed = matrix.refresh()
+        self.assertMatrixEqual(refreshed, NutritionMatrix.build())
+        self.assertEqual(refreshed.size, len(self.recipes))
+        self.assertEqual(
+            refreshed.values[0, refreshed.fields.index(
+                Recipe.CALORIES_FIELD)], 1000)
+
+    def test_endpoint(self):
+        """ Test meal plan endpoint """
+        self.client.force_login(self.user)
+        url = reverse_q(
+            namespaced_url(RECIPES_APP_NAME, RECIPE_MEAL_PLAN_ROUTE_NAME))
+
+        response = self.client.get(url, {
+            DAYS_QUERY: 2, MEALS_QUERY: 3, SEED_QUERY: 1
+        })
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        days = response.json()['days']
+        self.assertEqual(len(days), 2)
+        recipe_ids = [
+            recipe['id'] for day in days for recipe in day['recipes']
+        ]
+        self.assertEqual(len(recipe_ids), 6)
+        self.assertEqual(len(set(recipe_ids)), 6)
+        for day in days:
+            self.assertTrue(1800 <= day['totals']['calories'] <= 2200)
+            self.assertEqual(day['daily_values']['calories'], round(
+                day['totals']['calories'] * 100 / 2000))
+        self.assertTrue(days[0]['recipes'][0]['name'].startswith('Recipe'))
+
+        # only 6 chicken recipes, so no 3 day plan
+        response = self.client.get(url, {
+            DAYS_QUERY: 3, MEALS_QUERY: 3, EXCLUDE_QUERY: 'dessert'
+        })
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+        for query in [{DAYS_QUERY: 0}, {MEALS_QUERY: 'x'},
+                      {EXCLUDE_QUERY: 'unknown'}]:
+            with self.subTest(query=query):
+                response = self.client.get(url, query)
+                self.assertEqual(
+                    response.status_code, HTTPStatus.BAD_REQUEST)
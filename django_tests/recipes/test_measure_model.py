@@ -25,7 +25,10 @@ from unittest import skip
 from django.test import TestCase
 
 from recipes.models import Measure
-from recipes.conversion import Measures, Quantity
+from recipes.conversion import (
+    Measures, Quantity, convert, convert_many, measure_registry
+)
+from utils import bump_table_version
 
 
 class TestMeasureModel(TestCase):
@@ -298,3 +301,34 @@ class TestMeasureModelFixtures(TestCase):
             Measure.SYSTEM_FIELD: system,
             Measure.IS_DEFAULT_FIELD: True,
         }
+
+    def test_convert_many(self):
+        """ Test batch conversion """
+        conversions = [
+            (2, Measures.FLUID_OUNCE, Measures.CUP),
+            (1, Measures.POUND, Measures.GRAM),
+            (3, Measures.TEASPOON, Measures.TABLESPOON),
+            (1, Measures.CUP, Measures.GRAM),   # incompatible types
+        ]
+        measure_registry()  # load registry
+        with self.assertNumQueries(0):
+            converted = convert_many(conversions, quantised=True)
+        self.assertEqual(converted, [
+            convert(*conversion, quantised=True)
+            for conversion in conversions
+        ])
+        self.assertEqual(converted[0], Quantity.standardise(Decimal('0.25')))
+        self.assertEqual(converted[2], Quantity.standardise(Decimal(1)))
+        self.assertIsNone(converted[3])
+
+    def test_registry_invalidation(self):
+        """ Test measure registry is rebuilt on measure save """
+        # registry must be rebuilt after the change is rolled back
+        self.addCleanup(bump_table_version, Measure)
+        cup = Measure.objects.get(**{Measure.NAME_FIELD: 'cup'})
+        self.assertEqual(
+            convert(1, Measures.CUP, Measures.FLUID_OUNCE), Decimal(8))
+        cup.base_us = Decimal(10)
+        cup.save()
+        self.assertEqual(
+            convert(1, Measures.CUP, Measures.FLUID_OUNCE), Decimal(10))
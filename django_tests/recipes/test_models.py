@@ -32,12 +32,18 @@
 #
 #
 #
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
 from recipes.models import (
     Category, Keyword, Ingredient, Instruction, Recipe, RecipeIngredient,
     Image, Measure
 )
+from user.models import User
 
 
 class TestCategoryModel(TestCase):
@@ -114,4 +120,102 @@ class TestInstructionModel(TestCase):
                 self.assertEqual(instance.get_field(field), '')
 
 
-# TODO generate fixtures to test Recipe, RecipeIngredient, Image
+class TestRecipeModel(TestCase):
+    """
+    Test Recipe model
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+
+    def test_total_time(self):
+        """ Test Recipe total time is maintained """
+        instance = Recipe.objects.create(**{
+            f'{Recipe.CATEGORY_FIELD}': Category.objects.create(),
+            f'{Recipe.AUTHOR_FIELD}': User.objects.create(username='cook'),
+            f'{Recipe.PREP_TIME_FIELD}': timedelta(minutes=10),
+            f'{Recipe.COOK_TIME_FIELD}': timedelta(minutes=25),
+        })
+        instance.refresh_from_db()
+        self.assertEqual(instance.total_time, timedelta(minutes=35))
+
+        instance.cook_time = timedelta(hours=1)
+        instance.save(update_fields=[Recipe.COOK_TIME_FIELD])
+        instance.refresh_from_db()
+        self.assertEqual(instance.total_time, timedelta(minutes=70))
+
+
+class TestRecipeIngredientModel(TestCase):
+    """
+    Test RecipeIngredient model
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['measure.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.recipe = Recipe.objects.create(**{
+            f'{Recipe.CATEGORY_FIELD}': Category.objects.create(),
+            f'{Recipe.AUTHOR_FIELD}': User.objects.create(username='cook'),
+        })
+        cls.ingredient = Ingredient.objects.create(
+            name='flour', measure=Measure.get_default_unit())
+
+    def create(self, quantity: str) -> RecipeIngredient:
+        """ Create a recipe ingredient """
+        return RecipeIngredient.objects.create(**{
+            f'{RecipeIngredient.RECIPE_FIELD}': self.recipe,
+            f'{RecipeIngredient.INGREDIENT_FIELD}': self.ingredient,
+            f'{RecipeIngredient.MEASURE_FIELD}': Measure.get_default_unit(),
+            f'{RecipeIngredient.QUANTITY_FIELD}': quantity,
+        })
+
+    def test_parse_amount(self):
+        """ Test RecipeIngredient amount parsing """
+        for quantity, expected in [
+            ('2', (Decimal('2'), None)),
+            ('1 1/2', (Decimal('1.5'), None)),
+            ('1/3', (Decimal('0.3333'), None)),
+            ('1 -2', (Decimal('1'), Decimal('2'))),
+            ('2 to 2', (Decimal('2'), None)),
+            ('', (None, None)),
+            ('pinch', (None, None)),
+            ('123456789', (None, None)),
+        ]:
+            with self.subTest(quantity=quantity):
+                self.assertEqual(
+                    RecipeIngredient.parse_amount(quantity), expected)
+
+    def test_amount(self):
+        """ Test RecipeIngredient amount is maintained """
+        instance = self.create('1/2')
+        instance.refresh_from_db()
+        self.assertEqual(instance.amount, Decimal('0.5'))
+        self.assertIsNone(instance.amount_upper)
+
+        instance.quantity = '2-3'
+        instance.save(update_fields=[RecipeIngredient.QUANTITY_FIELD])
+        instance.refresh_from_db()
+        self.assertEqual(instance.amount, Decimal('2'))
+        self.assertEqual(instance.amount_upper, Decimal('3'))
+
+    def test_backfill(self):
+        """ Test RecipeIngredient amount backfill """
+        instances = [self.create(quantity) for quantity in ['1', '½', 'few']]
+        # bulk loaded rows don't have amounts
+        RecipeIngredient.objects.update(**{
+            RecipeIngredient.AMOUNT_FIELD: None
+        })
+
+        out = StringIO()
+        call_command('backfill_amounts', '--chunk-size=2', stdout=out)
+        self.assertIn('Updated 2 of 3', out.getvalue())
+        self.assertEqual([
+            RecipeIngredient.objects.get(pk=instance.pk).amount
+            for instance in instances
+        ], [Decimal('1'), Decimal('0.5'), None])
+
+        out = StringIO()
+        call_command('backfill_amounts', stdout=out)
+        self.assertIn('Updated 0 of 3', out.getvalue())
+
+
+# TODO generate fixtures to test Image
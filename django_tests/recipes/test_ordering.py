@@ -0,0 +1,149 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from http import HTTPStatus
+from typing import Iterable, List
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from recipes.constants import (
+    RECIPE_INGREDIENT_ID_ROUTE_NAME, RECIPE_INSTRUCTION_ID_ROUTE_NAME
+)
+from recipes.models import (
+    Category, Ingredient, Instruction, Measure, Recipe, RecipeIngredient
+)
+from recipes.views.ingredient_by import check_ingredient_ordering
+from recipes.views.instruction_by import check_instruction_ordering
+from recipesnstuff import RECIPES_APP_NAME
+from user.models import User
+from utils import reverse_q, namespaced_url
+
+
+class TestOrdering(TestCase):
+    """
+    Test recipe ingredient and instruction ordering
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['measure.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'a@b.com', 'pass1234')
+        cls.recipe = Recipe.objects.create(**{
+            f'{Recipe.NAME_FIELD}': 'Cake',
+            f'{Recipe.CATEGORY_FIELD}': Category.objects.create(
+                name='Dessert'),
+            f'{Recipe.AUTHOR_FIELD}': cls.user,
+        })
+        unit = Measure.get_default_unit()
+        cls.ingredient = Ingredient.objects.create(name='flour', measure=unit)
+
+    def create_ingredients(
+            self, indices: Iterable[int]) -> List[RecipeIngredient]:
+        """ Create recipe ingredients with the specified indices """
+        return [
+            RecipeIngredient.objects.create(**{
+                f'{RecipeIngredient.RECIPE_FIELD}': self.recipe,
+                f'{RecipeIngredient.INGREDIENT_FIELD}': self.ingredient,
+                f'{RecipeIngredient.MEASURE_FIELD}':
+                    Measure.get_default_unit(),
+                f'{RecipeIngredient.INDEX_FIELD}': index,
+            }) for index in indices
+        ]
+
+    def ingredient_indices(self) -> List[int]:
+        """ Get the indices of the recipe ingredients """
+        return list(
+            RecipeIngredient.objects.filter(**{
+                f'{RecipeIngredient.RECIPE_FIELD}': self.recipe
+            }).order_by(
+                RecipeIngredient.INDEX_FIELD, RecipeIngredient.id_field()
+            ).values_list(RecipeIngredient.INDEX_FIELD, flat=True)
+        )
+
+    def test_ingredient_ordering(self):
+        """ Test ingredient indices are updated in a single update """
+        self.create_ingredients([2, 4, 4, 5, 9, 10])
+        updated = self.recipe.updated
+
+        with CaptureQueriesContext(connection) as queries:
+            check_ingredient_ordering(self.recipe.pk)
+        updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "recipes_recipeingredient"')
+        ]
+        self.assertEqual(len(updates), 1)
+        # alternatives keep the same index
+        self.assertEqual(self.ingredient_indices(), [1, 2, 2, 3, 4, 5])
+
+        self.recipe.refresh_from_db()
+        self.assertGreater(self.recipe.updated, updated)
+
+        # no updates if already in order
+        with CaptureQueriesContext(connection) as queries:
+            check_ingredient_ordering(self.recipe)
+        self.assertFalse([
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE')
+        ])
+
+    def test_delete_ingredient(self):
+        """ Test ingredients are reindexed after a delete """
+        ingredients = self.create_ingredients(range(1, 6))
+        self.client.force_login(self.user)
+
+        response = self.client.delete(reverse_q(
+            namespaced_url(RECIPES_APP_NAME, RECIPE_INGREDIENT_ID_ROUTE_NAME),
+            args=[ingredients[0].pk]))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(self.ingredient_indices(), [1, 2, 3, 4])
+
+    def test_delete_instruction(self):
+        """ Test instructions are reindexed after a delete """
+        instructions = [
+            Instruction.objects.create(text=f'step {index}', index=index)
+            for index in range(1, 5)
+        ]
+        self.recipe.instructions.add(*instructions)
+        self.client.force_login(self.user)
+
+        response = self.client.delete(reverse_q(
+            namespaced_url(RECIPES_APP_NAME, RECIPE_INSTRUCTION_ID_ROUTE_NAME),
+            args=[instructions[1].pk]))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(list(
+            self.recipe.instructions.order_by(
+                Instruction.INDEX_FIELD
+            ).values_list(Instruction.TEXT_FIELD, Instruction.INDEX_FIELD)
+        ), [('step 1', 1), ('step 3', 2), ('step 4', 3)])
+
+        # gaps are closed
+        Instruction.objects.filter(text='step 4').update(index=7)
+        check_instruction_ordering(self.recipe)
+        self.assertEqual(list(
+            self.recipe.instructions.order_by(
+                Instruction.INDEX_FIELD
+            ).values_list(Instruction.INDEX_FIELD, flat=True)
+        ), [1, 2, 3])
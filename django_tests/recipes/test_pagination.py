@@ -0,0 +1,230 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from urllib.parse import quote
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Value
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from recipes.constants import RECIPES_ROUTE_NAME, RECIPE_SEARCH_ROUTE_NAME
+from recipes.models import Category, Image, Recipe
+from recipesnstuff import RECIPES_APP_NAME
+from user.models import User
+from utils import (
+    CountingPaginator, CountStrategy, cached_result_ids, ResultIdList,
+    SEARCH_QUERY, namespaced_url, reverse_q
+)
+
+
+class TestCountingPaginator(TestCase):
+    """
+    Test counting paginator
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+
+    def setUp(self):
+        cache.clear()
+        for idx in range(5):
+            Category.objects.create(name=f'category {idx}')
+
+    def test_cached_count(self):
+        """ Test cached count is reused for the same query """
+        query_set = Category.objects.filter(name__startswith='category')
+
+        paginator = CountingPaginator(
+            query_set.order_by('name'), 2,
+            count_strategy=CountStrategy.CACHED)
+        self.assertEqual(paginator.count, 5)
+        self.assertFalse(paginator.is_estimate)
+
+        # ordering is not part of the key, so the cached count is used
+        with self.assertNumQueries(0):
+            paginator = CountingPaginator(
+                query_set.order_by('-name'), 2,
+                count_strategy=CountStrategy.CACHED)
+            self.assertEqual(paginator.count, 5)
+
+        # writing to the table invalidates the cached count
+        Category.objects.create(name='category 5')
+
+        paginator = CountingPaginator(
+            query_set, 2, count_strategy=CountStrategy.CACHED)
+        self.assertEqual(paginator.count, 6)
+
+    def test_count_list(self):
+        """ Test the count list is counted instead of the object list """
+        query_set = Category.objects.filter(name__startswith='category')
+        for strategy in CountStrategy:
+            with self.subTest(strategy=strategy):
+                cache.clear()
+                paginator = CountingPaginator(
+                    query_set.annotate(marker=Value('projected')), 2,
+                    count_strategy=strategy, count_list=query_set)
+                with CaptureQueriesContext(connection) as queries:
+                    self.assertEqual(paginator.count, 5)
+                self.assertFalse([
+                    query for query in queries.captured_queries
+                    if 'projected' in query['sql']
+                ])
+
+    def test_estimated_count_fallback(self):
+        """ Test estimated count falls back to exact count """
+        # estimates are only available from postgres
+        paginator = CountingPaginator(
+            Category.objects.all(), 2,
+            count_strategy=CountStrategy.ESTIMATED)
+        self.assertEqual(paginator.count, 5)
+        self.assertFalse(paginator.is_estimate)
+
+
+class TestResultIds(TestCase):
+    """
+    Test cached result ids
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+
+    def setUp(self):
+        cache.clear()
+        for idx in range(5):
+            Category.objects.create(name=f'category {idx}')
+
+    def test_cached_result_ids(self):
+        """ Test result ids are cached in order and invalidated on write """
+        query_set = Category.objects.order_by('-name')
+        expected = list(query_set.values_list('id', flat=True))
+
+        self.assertEqual(cached_result_ids(query_set), (expected, 5))
+        with self.assertNumQueries(0):
+            self.assertEqual(cached_result_ids(query_set), (expected, 5))
+
+        # different ordering is a different result
+        self.assertEqual(
+            cached_result_ids(query_set.order_by('name')),
+            (list(reversed(expected)), 5))
+
+        Category.objects.create(name='category 5')
+        ids, count = cached_result_ids(query_set)
+        self.assertEqual((len(ids), count), (6, 6))
+
+    def test_cached_result_ids_prefix(self):
+        """ Test only the first ids of large results are cached """
+        query_set = Category.objects.filter(
+            name__startswith='category').order_by('-name')
+        expected = list(query_set.values_list('id', flat=True))
+
+        self.assertEqual(
+            cached_result_ids(query_set, max_ids=3), (expected[:3], 5))
+        with self.assertNumQueries(0):
+            ids, count = cached_result_ids(query_set, max_ids=3)
+        self.assertEqual((ids, count), (expected[:3], 5))
+
+        id_list = ResultIdList(ids, Category.objects.all(), count=count,
+                               remainder=query_set)
+        self.assertEqual(len(id_list), 5)
+        self.assertFalse(id_list.is_complete)
+        # pages within the cached ids are fetched by id
+        with self.assertNumQueries(1):
+            page = id_list[0:2]
+        self.assertEqual([obj.pk for obj in page], expected[0:2])
+        # deeper pages are queried
+        with self.assertNumQueries(1):
+            page = id_list[2:4]
+        self.assertEqual([obj.pk for obj in page], expected[2:4])
+        self.assertEqual(id_list[4].pk, expected[4])
+        self.assertEqual([obj.pk for obj in id_list], expected)
+
+        paginator = CountingPaginator(
+            id_list, 2, count_strategy=CountStrategy.CACHED)
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.num_pages, 3)
+
+    def test_result_id_list(self):
+        """ Test result id list only fetches requested rows """
+        query_set = Category.objects.order_by('-name')
+        ids, _ = cached_result_ids(query_set)
+        id_list = ResultIdList(ids, Category.objects.all(), chunk_size=2)
+
+        self.assertEqual(len(id_list), 5)
+        self.assertTrue(id_list.is_complete)
+        with self.assertNumQueries(1):
+            page = id_list[1:3]
+        self.assertEqual([obj.pk for obj in page], ids[1:3])
+        self.assertEqual(id_list[0].pk, ids[0])
+        with self.assertNumQueries(3):
+            self.assertEqual([obj.pk for obj in id_list], ids)
+
+        paginator = CountingPaginator(
+            id_list, 2, count_strategy=CountStrategy.CACHED)
+        with self.assertNumQueries(0):
+            self.assertEqual(paginator.num_pages, 3)
+
+
+class TestRecipeListCount(TestCase):
+    """
+    Test recipe list counts
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['currencies.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'cook', 'a@b.com', 'pass1234')
+        category = Category.objects.create(name='Soup')
+        for idx in range(5):
+            Recipe.objects.create(**{
+                f'{Recipe.NAME_FIELD}': f'Soup {idx}',
+                f'{Recipe.CATEGORY_FIELD}': category,
+                f'{Recipe.AUTHOR_FIELD}': cls.user,
+            })
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    @override_settings(RESULT_IDS_CACHE_MAX=2)
+    def test_count_not_projected(self):
+        """ Test the card projection is not applied to the counted list """
+        for route, query in [
+            (RECIPES_ROUTE_NAME, ''),
+            (RECIPE_SEARCH_ROUTE_NAME,
+             f'?{SEARCH_QUERY}=' + quote('category="Soup"')),
+        ]:
+            with self.subTest(route=route):
+                url = reverse_q(namespaced_url(RECIPES_APP_NAME, route))
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(f'{url}{query}')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(
+                    response.context['paginator'].count, 5)
+                counts = [
+                    query['sql'] for query in queries.captured_queries
+                    if 'COUNT(' in query['sql']
+                ]
+                self.assertTrue(counts)
+                self.assertFalse([
+                    sql for sql in counts
+                    if Image._meta.db_table in sql
+                ])
@@ -0,0 +1,179 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from http import HTTPStatus
+from tempfile import TemporaryDirectory
+
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.http import http_date
+
+from recipes.constants import (
+    RECIPE_ID_ROUTE_NAME, RECIPE_INSTRUCTION_ID_ROUTE_NAME
+)
+from recipes.models import (
+    Category, Image, Keyword, Recipe, Instruction, Ingredient,
+    RecipeIngredient, Measure
+)
+from recipesnstuff import RECIPES_APP_NAME
+from user.models import User
+from utils import reverse_q, namespaced_url
+
+
+class TestRecipeDetailConditional(TestCase):
+    """
+    Test recipe detail conditional GET
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['currencies.json', 'measure.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'a@b.com', 'pass1234')
+        cls.recipe = Recipe.objects.create(**{
+            f'{Recipe.NAME_FIELD}': 'Cake',
+            f'{Recipe.CATEGORY_FIELD}': Category.objects.create(
+                name='Dessert'),
+            f'{Recipe.AUTHOR_FIELD}': cls.user,
+        })
+        cls.url = reverse_q(
+            namespaced_url(RECIPES_APP_NAME, RECIPE_ID_ROUTE_NAME),
+            args=[cls.recipe.pk])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        # first response sets the csrf cookie
+        self.client.get(self.url)
+
+    def login_again(self):
+        """ Logout and login again """
+        self.client.logout()
+        self.client.force_login(self.user)
+        self.client.get(self.url)
+
+    def test_etag(self):
+        """ Test not modified response for matching ETag """
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        etag = response.headers['ETag']
+        self.assertNotIn('Last-Modified', response.headers)
+        self.assertIn('private', response.headers['Cache-Control'])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+        self.assertEqual(response.headers['ETag'], etag)
+
+        for name, change in [
+            ('recipe', lambda: Image.objects.create(
+                recipe=self.recipe, url='https://a.jpg')),
+            ('table', lambda: Keyword.objects.create(name='easy')),
+            ('viewer', self.login_again),
+        ]:
+            with self.subTest(change=name):
+                change()
+                response = self.client.get(
+                    self.url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+                self.assertNotEqual(response.headers['ETag'], etag)
+                etag = response.headers['ETag']
+
+    def assert_modified(self, change, content: str):
+        """
+        Check a change to the page content changes the ETag
+        :param change: function to make the change
+        :param content: content displayed after the change
+        """
+        etag = self.client.get(self.url).headers['ETag']
+        change()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotEqual(response.headers['ETag'], etag)
+        self.assertContains(response, content)
+
+    def test_instruction_deleted(self):
+        """ Test deleting the last instruction changes the ETag """
+        instruction = Instruction.objects.create(text='Mix well', index=1)
+        self.recipe.instructions.add(instruction)
+        revision = Recipe.objects.get(pk=self.recipe.pk).updated
+
+        def delete():
+            response = self.client.delete(reverse_q(
+                namespaced_url(
+                    RECIPES_APP_NAME, RECIPE_INSTRUCTION_ID_ROUTE_NAME),
+                args=[instruction.pk]))
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+
+        self.assert_modified(delete, 'Cake')
+        self.assertNotContains(self.client.get(self.url), 'Mix well')
+        self.assertGreater(
+            Recipe.objects.get(pk=self.recipe.pk).updated, revision)
+
+    def test_ingredient_renamed(self):
+        """ Test renaming an ingredient of the recipe changes the ETag """
+        ingredient = Ingredient.objects.create(
+            name='Flour', measure=Measure.get_default_unit())
+        RecipeIngredient.objects.create(**{
+            f'{RecipeIngredient.RECIPE_FIELD}': self.recipe,
+            f'{RecipeIngredient.INGREDIENT_FIELD}': ingredient,
+            f'{RecipeIngredient.QUANTITY_FIELD}': '1',
+            f'{RecipeIngredient.INDEX_FIELD}': 1,
+            f'{RecipeIngredient.MEASURE_FIELD}': Measure.get_default_unit(),
+        })
+
+        def rename():
+            ingredient.name = 'Spelt flour'
+            ingredient.save()
+
+        self.assert_modified(rename, 'Spelt flour')
+
+    def test_permission_snapshot(self):
+        """ Test the ETag uses the cached permission snapshot """
+        with TemporaryDirectory() as cache_dir, override_settings(CACHES={
+            'default': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': cache_dir,
+            }
+        }):
+            etag = self.client.get(self.url).headers['ETag']
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+            self.assertFalse([
+                query for query in queries.captured_queries
+                if Permission._meta.db_table in query['sql']
+            ])
+
+    def test_if_modified_since(self):
+        """ Test If-Modified-Since alone does not give not modified """
+        last_modified = http_date(
+            self.recipe.updated.replace(year=2100).timestamp())
+
+        # the viewer changes, but the recipe does not
+        self.login_again()
+        response = self.client.get(
+            self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertNotIn('Last-Modified', response.headers)
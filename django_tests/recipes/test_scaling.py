@@ -0,0 +1,204 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from recipes.constants import (
+    RECIPE_ID_ROUTE_NAME, RECIPE_ID_SCALE_ROUTE_NAME, SERVINGS_QUERY,
+    SYSTEM_QUERY, INGREDIENTS_CTX
+)
+from recipes.models import (
+    Category, Ingredient, Measure, Recipe, RecipeIngredient
+)
+from recipes.scaling import ScaleError, scale_recipe
+from recipesnstuff import RECIPES_APP_NAME
+from user.models import User
+from utils import reverse_q, namespaced_url
+
+
+class TestRecipeScaling(TestCase):
+    """
+    Test recipe scaling
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['currencies.json', 'measure.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'a@b.com', 'pass1234')
+        cls.recipe = Recipe.objects.create(**{
+            f'{Recipe.NAME_FIELD}': 'Cake',
+            f'{Recipe.CATEGORY_FIELD}': Category.objects.create(
+                name='Dessert'),
+            f'{Recipe.AUTHOR_FIELD}': cls.user,
+            f'{Recipe.SERVINGS_FIELD}': 4,
+        })
+        unit = Measure.get_default_unit()
+        for index, (name, quantity, measure) in enumerate([
+            ('sugar', '2', 'teaspoon'),
+            ('milk', '1/2', 'cup'),
+            ('flour', '8', 'ounce'),
+            ('eggs', '1-2', 'unit'),
+            ('salt', 'to taste', 'pinch'),
+            ('water', '250', 'millilitre'),
+        ], start=1):
+            RecipeIngredient.objects.create(**{
+                f'{RecipeIngredient.RECIPE_FIELD}': cls.recipe,
+                f'{RecipeIngredient.INGREDIENT_FIELD}':
+                    Ingredient.objects.create(name=name, measure=unit),
+                f'{RecipeIngredient.QUANTITY_FIELD}': quantity,
+                f'{RecipeIngredient.INDEX_FIELD}': index,
+                f'{RecipeIngredient.MEASURE_FIELD}': Measure.objects.get(
+                    **{Measure.NAME_FIELD: measure}),
+            })
+
+    def scaled(self, servings=None, system=None):
+        """ Get scaled ingredients as tuples of name, quantity, measure """
+        return [
+            (entry.ingredient, entry.quantity, entry.measure)
+            for entry in scale_recipe(
+                self.recipe.pk, servings=servings, system=system)
+        ]
+
+    def test_scale_servings(self):
+        """ Test scaling to a number of servings """
+        self.assertEqual(self.scaled(), [
+            ('sugar', '2', 'tsp.'),
+            ('milk', '1/2', 'C'),
+            ('flour', '8', 'oz.'),
+            ('eggs', '1-2', ''),
+            ('salt', 'to taste', 'pn.'),
+            ('water', '250', 'ml'),
+        ])
+        # units are promoted, e.g. tsp. to tbsp. and oz. to lb.
+        self.assertEqual(self.scaled(servings=12), [
+            ('sugar', '2', 'tbsp.'),
+            ('milk', '1 1/2', 'C'),
+            ('flour', '1 1/2', 'lb.'),
+            ('eggs', '3-6', ''),
+            ('salt', 'to taste', 'pn.'),
+            ('water', '750', 'ml'),
+        ])
+        self.assertEqual(self.scaled(servings=1)[:2], [
+            ('sugar', '1/2', 'tsp.'),
+            ('milk', '2', 'tbsp.'),
+        ])
+        self.assertEqual(self.scaled(servings=20)[-1], ('water', '1.25', 'l'))
+
+    def test_scale_system(self):
+        """ Test scaling with conversion to another system """
+        self.assertEqual(self.scaled(servings=8, system='si'), [
+            ('sugar', '19.72', 'ml'),
+            ('milk', '236.59', 'ml'),
+            ('flour', '453.59', 'g'),
+            ('eggs', '2-4', ''),
+            ('salt', 'to taste', 'pn.'),
+            ('water', '500', 'ml'),
+        ])
+        self.assertEqual(self.scaled(system='us')[-1],
+                         ('water', '1.06', 'C'))
+
+    def test_no_servings(self):
+        """ Test scaling a recipe without servings """
+        Recipe.objects.filter(pk=self.recipe.pk).update(servings=0)
+        with self.assertRaises(ScaleError):
+            scale_recipe(self.recipe.pk, servings=2)
+        self.assertEqual(self.scaled(system='si')[0],
+                         ('sugar', '9.86', 'ml'))
+
+    def test_cached(self):
+        """ Test scaled ingredients are cached by recipe revision """
+        self.scaled(servings=8)
+        with self.assertNumQueries(1):
+            self.scaled(servings=8)
+
+        ingredient = RecipeIngredient.objects.get(
+            **{f'{RecipeIngredient.INDEX_FIELD}': 1})
+        ingredient.quantity = '3'
+        ingredient.save()
+        self.assertEqual(self.scaled(servings=8)[0], ('sugar', '2', 'tbsp.'))
+
+    def test_stored_amounts(self):
+        """ Test the stored amounts are scaled, rather than the quantity """
+        cache.clear()
+        # amounts set without the quantity, or not set
+        RecipeIngredient.objects.filter(**{
+            f'{RecipeIngredient.INDEX_FIELD}': 1
+        }).update(**{RecipeIngredient.AMOUNT_FIELD: 3})
+        RecipeIngredient.objects.filter(**{
+            f'{RecipeIngredient.INDEX_FIELD}__gt': 1
+        }).update(**{
+            RecipeIngredient.AMOUNT_FIELD: None,
+            RecipeIngredient.AMOUNT_UPPER_FIELD: None
+        })
+        self.assertEqual(self.scaled(servings=8)[:4], [
+            ('sugar', '2', 'tbsp.'),
+            ('milk', '1', 'C'),
+            ('flour', '1', 'lb.'),
+            ('eggs', '2-4', ''),
+        ])
+
+    def test_endpoint(self):
+        """ Test scaling endpoint """
+        self.client.force_login(self.user)
+        url = reverse_q(
+            namespaced_url(RECIPES_APP_NAME, RECIPE_ID_SCALE_ROUTE_NAME),
+            args=[self.recipe.pk])
+
+        response = self.client.get(
+            url, {SERVINGS_QUERY: 8, SYSTEM_QUERY: 'si'})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        ingredients = response.json()[INGREDIENTS_CTX]
+        self.assertEqual(ingredients[2]['ingredient'], 'flour')
+        self.assertEqual(ingredients[2]['quantity'], '453.59')
+        self.assertEqual(ingredients[2]['measure'], 'g')
+
+        for query in [{SERVINGS_QUERY: 'x'}, {SERVINGS_QUERY: 0},
+                      {SYSTEM_QUERY: 'x'}]:
+            with self.subTest(query=query):
+                response = self.client.get(url, query)
+                self.assertEqual(
+                    response.status_code, HTTPStatus.BAD_REQUEST)
+
+        response = self.client.get(reverse_q(
+            namespaced_url(RECIPES_APP_NAME, RECIPE_ID_SCALE_ROUTE_NAME),
+            args=[self.recipe.pk + 1000]))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_detail_page(self):
+        """ Test scaled recipe detail page """
+        self.client.force_login(self.user)
+        url = reverse_q(
+            namespaced_url(RECIPES_APP_NAME, RECIPE_ID_ROUTE_NAME),
+            args=[self.recipe.pk])
+
+        response = self.client.get(url, {SERVINGS_QUERY: 12})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(response, '<span>1 1/2</span>')
+        self.assertContains(response, 'lb.')
+
+        response = self.client.get(url, {SERVINGS_QUERY: -1})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
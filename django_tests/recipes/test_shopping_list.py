@@ -0,0 +1,198 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from decimal import Decimal
+from http import HTTPStatus
+
+from django.test import TestCase
+
+from checkout.basket import Basket, BasketItem, basket_recipe_counts
+from order.models import OrderProduct, ProductType
+from recipes.constants import (
+    RECIPE_SHOPPING_LIST_ROUTE_NAME, IDS_QUERY
+)
+from recipes.conversion import measure_registry
+from recipes.models import (
+    Category, Ingredient, Measure, Recipe, RecipeIngredient
+)
+from recipes.shopping import aggregate_ingredients
+from recipesnstuff import RECIPES_APP_NAME
+from user.models import User
+from utils import reverse_q, namespaced_url
+
+
+class TestShoppingList(TestCase):
+    """
+    Test shopping list
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['currencies.json', 'measure.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'a@b.com', 'pass1234')
+        category = Category.objects.create(name='Dessert')
+        unit = Measure.get_default_unit()
+        ingredients = {
+            name: Ingredient.objects.create(name=name, measure=unit)
+            for name in ['sugar', 'milk', 'eggs', 'salt', 'flour']
+        }
+        cls.recipes = []
+        for name, recipe_ingredients in [
+            ('Cake', [
+                ('sugar', '2', 'teaspoon'),
+                ('milk', '1/2', 'cup'),
+                ('eggs', '2', 'unit'),
+                ('salt', 'to taste', 'pinch'),
+            ]),
+            ('Pancakes', [
+                ('sugar', '1', 'tablespoon'),
+                ('milk', '250', 'millilitre'),
+                ('eggs', '1-2', 'unit'),
+                ('flour', '8', 'ounce'),
+                ('salt', '', 'pinch'),
+            ]),
+        ]:
+            recipe = Recipe.objects.create(**{
+                f'{Recipe.NAME_FIELD}': name,
+                f'{Recipe.CATEGORY_FIELD}': category,
+                f'{Recipe.AUTHOR_FIELD}': cls.user,
+            })
+            cls.recipes.append(recipe)
+            for index, (ingredient, quantity, measure) in enumerate(
+                    recipe_ingredients, start=1):
+                RecipeIngredient.objects.create(**{
+                    f'{RecipeIngredient.RECIPE_FIELD}': recipe,
+                    f'{RecipeIngredient.INGREDIENT_FIELD}':
+                        ingredients[ingredient],
+                    f'{RecipeIngredient.QUANTITY_FIELD}': quantity,
+                    f'{RecipeIngredient.INDEX_FIELD}': index,
+                    f'{RecipeIngredient.MEASURE_FIELD}':
+                        Measure.objects.get(
+                            **{Measure.NAME_FIELD: measure}),
+                })
+
+    @property
+    def expected(self):
+        """ Expected shopping list for one cake and two pancakes """
+        return [
+            ('eggs', '4-6', '', []),
+            ('flour', '1', 'lb.', []),
+            ('milk', '2 5/8', 'C', []),
+            ('salt', '', '', ['to taste pn.']),
+            ('sugar', '2 2/3', 'tbsp.', []),
+        ]
+
+    def test_aggregate(self):
+        """ Test aggregating ingredients """
+        cake, pancakes = self.recipes
+        measure_registry()
+        with self.assertNumQueries(1):
+            items = aggregate_ingredients({cake.pk: 1, pancakes.pk: 2})
+        self.assertEqual([
+            (item.ingredient, item.quantity, item.measure, item.notes)
+            for item in items
+        ], self.expected)
+
+        self.assertEqual([
+            (item.ingredient, item.quantity, item.measure)
+            for item in aggregate_ingredients({pancakes.pk: 1})
+        ], [
+            ('eggs', '1-2', ''),
+            ('flour', '8', 'oz.'),
+            ('milk', '250', 'ml'),
+            ('salt', '', ''),
+            ('sugar', '1', 'tbsp.'),
+        ])
+
+    def test_stored_amounts(self):
+        """ Test the stored amounts are aggregated, rather than quantities """
+        cake, pancakes = self.recipes
+        # amounts set without the quantity, or not set
+        RecipeIngredient.objects.filter(**{
+            f'{RecipeIngredient.RECIPE_FIELD}': cake,
+            f'{RecipeIngredient.INDEX_FIELD}': 1
+        }).update(**{RecipeIngredient.AMOUNT_FIELD: 3})
+        RecipeIngredient.objects.filter(**{
+            f'{RecipeIngredient.RECIPE_FIELD}': pancakes,
+        }).update(**{
+            RecipeIngredient.AMOUNT_FIELD: None,
+            RecipeIngredient.AMOUNT_UPPER_FIELD: None
+        })
+        self.assertEqual([
+            (item.ingredient, item.quantity, item.measure)
+            for item in aggregate_ingredients({cake.pk: 1, pancakes.pk: 1})
+        ], [
+            ('eggs', '3-4', ''),
+            ('flour', '8', 'oz.'),
+            ('milk', '1.56', 'C'),
+            ('salt', '', ''),
+            ('sugar', '2', 'tbsp.'),
+        ])
+
+    def test_basket_recipe_counts(self):
+        """ Test counting ingredient boxes in a basket """
+        cake, pancakes = self.recipes
+        basket = Basket()
+        for recipe, count in [(cake, 1), (pancakes, 3)]:
+            product = OrderProduct.objects.create(**{
+                f'{OrderProduct.TYPE_FIELD}':
+                    ProductType.INGREDIENT_BOX.choice,
+                f'{OrderProduct.SKU_FIELD}': f'box-{recipe.pk}',
+                f'{OrderProduct.RECIPE_FIELD}': recipe,
+            })
+            basket.items.append(BasketItem(
+                currency=basket.currency, amount=Decimal(1), count=count,
+                description='', sku=product.sku, instructions='', url='',
+                image=None))
+        basket.items.append(BasketItem(
+            currency=basket.currency, amount=Decimal(1), count=1,
+            description='', sku='other', instructions='', url='',
+            image=None))
+
+        self.assertEqual(basket_recipe_counts(basket), {
+            cake.pk: 1, pancakes.pk: 3
+        })
+
+    def test_endpoint(self):
+        """ Test shopping list endpoint """
+        cake, pancakes = self.recipes
+        self.client.force_login(self.user)
+        url = reverse_q(
+            namespaced_url(RECIPES_APP_NAME, RECIPE_SHOPPING_LIST_ROUTE_NAME))
+
+        response = self.client.get(
+            url, {IDS_QUERY: f'{cake.pk},{pancakes.pk},{pancakes.pk}'})
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual([
+            (item['ingredient'], item['quantity'], item['measure'],
+             item['notes'])
+            for item in response.json()['items']
+        ], self.expected)
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertEqual(response.json()['items'], [])
+
+        response = self.client.get(url, {IDS_QUERY: 'a,b'})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
@@ -0,0 +1,160 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from http import HTTPStatus
+from io import StringIO
+from tempfile import TemporaryDirectory
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from recipes.constants import (
+    RECIPE_ID_ROUTE_NAME, SIMILAR_NUTRITION_CTX, NUTRITIONAL_INFO_CTX
+)
+from recipes.models import Category, Recipe
+from recipesnstuff import RECIPES_APP_NAME
+from user.models import User
+from utils import reverse_q, namespaced_url, bump_table_version
+
+
+# rebuild the nutrition matrix and index on every change
+@override_settings(NUTRITION_MATRIX_MIN_AGE=0, SIMILAR_RECIPES_LIMIT=2)
+class TestSimilarNutrition(TestCase):
+    """
+    Test similar nutrition recipes
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    fixtures = ['currencies.json', 'measure.json']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser(
+            'admin', 'a@b.com', 'pass1234')
+        category = Category.objects.create(name='Dessert')
+        cls.recipes = [
+            Recipe.objects.create(**{
+                f'{Recipe.NAME_FIELD}': name,
+                f'{Recipe.CATEGORY_FIELD}': category,
+                f'{Recipe.AUTHOR_FIELD}': cls.user,
+                f'{Recipe.CALORIES_FIELD}': calories,
+                f'{Recipe.FAT_CONTENT_FIELD}': fat,
+                f'{Recipe.PROTEIN_CONTENT_FIELD}': protein,
+            }) for name, calories, fat, protein in [
+                ('Salad', 150, 5, 4),
+                ('Soup', 170, 6, 5),
+                ('Cake', 900, 60, 8),
+                ('Brownie', 850, 55, 7),
+                ('Water', 0, 0, 0),
+            ]
+        ]
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        # test data changes are rolled back without a table version bump
+        bump_table_version(Recipe)
+        self.addCleanup(bump_table_version, Recipe)
+
+    def get_detail(self, recipe: Recipe):
+        """ Get the detail page of a recipe """
+        response = self.client.get(reverse_q(
+            namespaced_url(RECIPES_APP_NAME, RECIPE_ID_ROUTE_NAME),
+            args=[recipe.pk]))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return response
+
+    def test_similar_nutrition(self):
+        """ Test recipes with similar nutrition are displayed """
+        salad, soup, cake, brownie, _ = self.recipes
+
+        response = self.get_detail(salad)
+        self.assertEqual([
+            recipe.name for recipe in response.context[SIMILAR_NUTRITION_CTX]
+        ], [soup.name, brownie.name])
+        self.assertContains(response, 'Similar nutrition')
+
+        response = self.get_detail(cake)
+        self.assertEqual(
+            response.context[SIMILAR_NUTRITION_CTX][0].name, brownie.name)
+
+    def test_no_nutrition(self):
+        """ Test no similar recipes for recipe without nutrition """
+        response = self.get_detail(self.recipes[-1])
+        self.assertFalse(response.context[NUTRITIONAL_INFO_CTX])
+        self.assertEqual(response.context[SIMILAR_NUTRITION_CTX], [])
+        self.assertNotContains(response, 'Similar nutrition')
+
+    def test_update(self):
+        """ Test similar recipes follow changes to nutrition """
+        salad, soup, cake, brownie, _ = self.recipes
+
+        response = self.get_detail(cake)
+        self.assertEqual(
+            response.context[SIMILAR_NUTRITION_CTX][0].name, brownie.name)
+
+        soup.calories = 880
+        soup.fat_content = 58
+        soup.protein_content = 8
+        soup.save()
+        response = self.get_detail(cake)
+        self.assertEqual(
+            response.context[SIMILAR_NUTRITION_CTX][0].name, soup.name)
+
+    def test_index_file(self):
+        """ Test similar recipes from index built by management command """
+        salad, soup, cake, brownie, _ = self.recipes
+
+        with TemporaryDirectory() as path:
+            out = StringIO()
+            call_command('nutrition_index', output=path, benchmark=5,
+                         stdout=out)
+            self.assertIn('Indexed 4 of 5 recipes', out.getvalue())
+            self.assertIn('Queried 5 recipes', out.getvalue())
+
+            with override_settings(NUTRITION_INDEX_PATH=path):
+                # changes are only seen once the index is saved again
+                Recipe.objects.create(**{
+                    f'{Recipe.NAME_FIELD}': 'Fudge',
+                    f'{Recipe.CATEGORY_FIELD}': brownie.category,
+                    f'{Recipe.AUTHOR_FIELD}': self.user,
+                    f'{Recipe.CALORIES_FIELD}': brownie.calories,
+                    f'{Recipe.FAT_CONTENT_FIELD}': brownie.fat_content,
+                    f'{Recipe.PROTEIN_CONTENT_FIELD}':
+                        brownie.protein_content,
+                })
+                bump_table_version(Recipe)
+                response = self.get_detail(brownie)
+                self.assertEqual(
+                    response.context[SIMILAR_NUTRITION_CTX][0].name,
+                    cake.name)
+
+                call_command('nutrition_index', output=path,
+                             stdout=StringIO())
+                response = self.get_detail(brownie)
+                self.assertEqual(
+                    response.context[SIMILAR_NUTRITION_CTX][0].name,
+                    'Fudge')
+
+            # in-memory index
+            bump_table_version(Recipe)
+            response = self.get_detail(brownie)
+            self.assertEqual(
+                response.context[SIMILAR_NUTRITION_CTX][0].name, 'Fudge')
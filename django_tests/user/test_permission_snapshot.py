@@ -0,0 +1,172 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from tempfile import TemporaryDirectory
+
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from recipes.models import Recipe
+from recipesnstuff.constants import RECIPES_APP_NAME
+from user.constants import REGISTERED_GROUP
+from user.models import User
+from user.permissions import (
+    add_to_registered, set_group_permissions, ADD, REMOVE
+)
+from utils import Crud, permission_name, permission_check, permission_snapshot
+
+
+class TestPermissionSnapshot(TestCase):
+    """
+    Test user permission snapshots
+    https://docs.djangoproject.com/en/4.1/topics/testing/tools/
+    """
+    RECIPE_READ = permission_name(
+        Recipe, Crud.READ, app_label=RECIPES_APP_NAME)
+
+    @classmethod
+    def setUpClass(cls):
+        # snapshots are only cached across requests in a shared cache
+        cache_dir = TemporaryDirectory()
+        cls.addClassCleanup(cache_dir.cleanup)
+        cls.enterClassContext(override_settings(CACHES={
+            'default': {
+                'BACKEND':
+                    'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': cache_dir.name,
+            }
+        }))
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            'joe.cherry', 'ask.joe@fruits.com', 'more-than-8-not-like-user')
+        add_to_registered(cls.user)
+        cls.group = Group.objects.get(name=REGISTERED_GROUP)
+
+    def setUp(self):
+        # snapshots cached by other tests are not rolled back with the db
+        cache.clear()
+
+    def fresh_user(self) -> User:
+        """ Get the user as a new request would """
+        return User.objects.get(pk=self.user.pk)
+
+    def test_snapshot_cached(self):
+        """ Test the snapshot is cached across requests """
+        user = self.fresh_user()
+        perms = permission_snapshot(user)
+        self.assertIn(self.RECIPE_READ, perms)
+
+        # memoised for the request
+        with self.assertNumQueries(0):
+            self.assertIs(permission_snapshot(user), perms)
+            self.assertTrue(permission_check(
+                user, Recipe, Crud.READ, app_label=RECIPES_APP_NAME))
+
+        # cached for subsequent requests
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertEqual(permission_snapshot(user), perms)
+
+    @override_settings(CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    })
+    def test_process_local_cache(self):
+        """ Test the snapshot is not cached in a process-local cache """
+        user = self.fresh_user()
+        perms = permission_snapshot(user)
+        self.assertIn(self.RECIPE_READ, perms)
+
+        # memoised for the request
+        with self.assertNumQueries(0):
+            self.assertIs(permission_snapshot(user), perms)
+
+        # but not cached for subsequent requests
+        user = self.fresh_user()
+        with self.assertNumQueries(2):
+            self.assertEqual(permission_snapshot(user), perms)
+
+    def test_group_permissions_changed(self):
+        """ Test the snapshot is invalidated by group permission changes """
+        self.assertIn(self.RECIPE_READ,
+                      permission_snapshot(self.fresh_user()))
+
+        set_group_permissions(REGISTERED_GROUP, Recipe, Crud.READ,
+                              RECIPES_APP_NAME, REMOVE)
+        self.assertNotIn(self.RECIPE_READ,
+                         permission_snapshot(self.fresh_user()))
+
+        set_group_permissions(REGISTERED_GROUP, Recipe, Crud.READ,
+                              RECIPES_APP_NAME, ADD)
+        self.assertIn(self.RECIPE_READ,
+                      permission_snapshot(self.fresh_user()))
+
+        # changes via the permission side of the relation
+        permission = Permission.objects.get(
+            codename=permission_name(Recipe, Crud.READ),
+            content_type__app_label=RECIPES_APP_NAME)
+        permission.group_set.clear()
+        self.assertNotIn(self.RECIPE_READ,
+                         permission_snapshot(self.fresh_user()))
+
+    def test_group_membership_changed(self):
+        """ Test the snapshot is invalidated by group membership changes """
+        self.assertIn(self.RECIPE_READ,
+                      permission_snapshot(self.fresh_user()))
+
+        self.user.groups.remove(self.group)
+        self.assertEqual(permission_snapshot(self.fresh_user()), frozenset())
+
+        self.group.user_set.add(self.user)
+        self.assertIn(self.RECIPE_READ,
+                      permission_snapshot(self.fresh_user()))
+
+        self.group.user_set.clear()
+        self.assertEqual(permission_snapshot(self.fresh_user()), frozenset())
+
+    def test_user_permissions_changed(self):
+        """ Test the snapshot is invalidated by user permission changes """
+        self.user.groups.clear()
+        self.assertEqual(permission_snapshot(self.fresh_user()), frozenset())
+
+        permission = Permission.objects.get(
+            codename=permission_name(Recipe, Crud.READ),
+            content_type__app_label=RECIPES_APP_NAME)
+        self.user.user_permissions.add(permission)
+        self.assertEqual(permission_snapshot(self.fresh_user()),
+                         frozenset([self.RECIPE_READ]))
+
+        permission.user_set.clear()
+        self.assertEqual(permission_snapshot(self.fresh_user()), frozenset())
+
+    def test_inactive_user(self):
+        """ Test an inactive user has no permissions """
+        user = self.fresh_user()
+        user.is_active = False
+        self.assertEqual(permission_snapshot(user), frozenset())
+        self.assertFalse(permission_check(
+            user, Recipe, Crud.READ, app_label=RECIPES_APP_NAME))
@@ -23,10 +23,15 @@
 from django.http import HttpRequest
 
 from recipesnstuff.constants import MAINTENANCE_MENU_CTX
-from utils import resolve_req, add_navbar_attr, Crud
+from utils import resolve_req, add_navbar_attr, navbar_menu_map, Crud
 from .constants import GENERATE_ORDER_PROD_ROUTE_NAME
 from .views.utils import orderprod_permission_check
 
+# navbar menus activated by route names
+NAVBAR_MENUS = navbar_menu_map([
+    (MAINTENANCE_MENU_CTX, [GENERATE_ORDER_PROD_ROUTE_NAME]),
+])
+
 
 def orderprod_context(request: HttpRequest) -> dict:
     """
@@ -37,13 +42,12 @@ def orderprod_context(request: HttpRequest) -> dict:
     context = {}
     called_by = resolve_req(request)
     if called_by:
-        for ctx, check_func, is_dropdown_toggle in [
-            (MAINTENANCE_MENU_CTX, lambda name: name in [
-                GENERATE_ORDER_PROD_ROUTE_NAME
-            ], True),
+        active = NAVBAR_MENUS.get(called_by.url_name)
+        for ctx, is_dropdown_toggle in [
+            (MAINTENANCE_MENU_CTX, True),
         ]:
             add_navbar_attr(
-                context, ctx, is_active=check_func(called_by.url_name),
+                context, ctx, is_active=ctx == active,
                 has_permission=orderprod_permission_check(
                     request, Crud.READ, raise_ex=False),
                 is_dropdown_toggle=is_dropdown_toggle
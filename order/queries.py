@@ -19,7 +19,7 @@
 #  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
-from typing import Union, Tuple
+from typing import Union, Tuple, Iterable, Dict
 
 from django.db.models import QuerySet
 
@@ -57,6 +57,19 @@ def get_ingredient_box_product(recipe: Union[Recipe, int]) -> OrderProduct:
     })
 
 
+def get_ingredient_box_recipes(skus: Iterable[str]) -> Dict[str, int]:
+    """
+    Get the recipes of the ingredient box order products with `skus`
+    :param skus: skus of order products
+    :return: recipe ids by sku, only for ingredient box order products
+    """
+    return dict(OrderProduct.objects.filter(**{
+        f'{OrderProduct.TYPE_FIELD}': ProductType.INGREDIENT_BOX.choice,
+        f'{OrderProduct.SKU_FIELD}__in': list(skus),
+    }).values_list(
+        OrderProduct.SKU_FIELD, f'{OrderProduct.RECIPE_FIELD}_id'))
+
+
 def get_delivery_product(
         country: str, del_type: ProductType = None) -> QuerySet:
     """
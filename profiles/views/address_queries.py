@@ -20,10 +20,8 @@
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
 #
-from datetime import datetime
 from enum import Enum, auto
 from typing import Any
-from zoneinfo import ZoneInfo
 
 from django.db.models import QuerySet
 
@@ -31,22 +29,12 @@ from profiles.enums import AddressType
 from profiles.models import Address
 from user.models import User
 from utils import (
-    SEARCH_QUERY, DATE_QUERIES,
-    regex_matchers, regex_date_matchers, QuerySetParams,
-    TERM_GROUP, KEY_TERM_GROUP, DATE_QUERY_GROUP, DATE_KEY_TERM_GROUP,
-    DATE_QUERY_YR_GROUP, DATE_QUERY_MTH_GROUP,
-    DATE_QUERY_DAY_GROUP, USER_QUERY
+    SEARCH_QUERY, QuerySetParams, USER_QUERY, SearchTokenizer, lookup_handler
 )
 
 # context-related
 DEFAULT_ADDRESS_QUERY: str = 'dflt-addr'    # display default address modal
 
-NON_DATE_QUERIES = [
-    USER_QUERY
-]
-REGEX_MATCHERS = regex_matchers(NON_DATE_QUERIES)
-REGEX_MATCHERS.update(regex_date_matchers())
-
 FIELD_LOOKUPS = {
     # query param: filter lookup
     SEARCH_QUERY: '',
@@ -69,16 +57,10 @@ NON_LOOKUP_ARGS = [
     DEFAULT_ADDRESS_QUERY,
 ]
 
-SEARCH_REGEX = [
-    # regex,            query param, regex match group, key & regex match grp
-    (REGEX_MATCHERS[q], q,           TERM_GROUP,        KEY_TERM_GROUP)
-    for q in NON_DATE_QUERIES
-]
-SEARCH_REGEX.extend([
-    # regex,            query param, regex match group, key & regex match grp
-    (REGEX_MATCHERS[q], q,           DATE_QUERY_GROUP,  DATE_KEY_TERM_GROUP)
-    for q in DATE_QUERIES
-])
+SEARCH_TOKENIZER = SearchTokenizer({
+    # query param: term handler
+    USER_QUERY: lookup_handler(FIELD_LOOKUPS),
+})
 
 
 class QueryParam(Enum):
@@ -129,57 +111,11 @@ def get_search_term(
     if value is None:
         return query_set_params
 
-    for regex, query, group, key_val_group in SEARCH_REGEX:
-        match = regex.match(value)
-        if match:
-            success = True
-            if query in DATE_QUERIES:
-                success = get_date_query(query_set_params, query, *[
-                    match.group(idx) for idx in [
-                        DATE_QUERY_YR_GROUP, DATE_QUERY_MTH_GROUP,
-                        DATE_QUERY_DAY_GROUP
-                    ]
-                ])
-            elif query not in NON_LOOKUP_ARGS:
-                query_set_params.add_and_lookup(
-                    query, FIELD_LOOKUPS[query], match.group(group))
-            else:
-                # complex query term handled elsewhere
-                success = False
-
-            save_term_func = query_set_params.add_search_term if success \
-                else query_set_params.add_invalid_term
-            save_term_func(match.group(key_val_group))
+    SEARCH_TOKENIZER.apply(value, query_set_params)
 
     return query_set_params
 
 
-def get_date_query(query_set_params: QuerySetParams,
-                   query: str, year: str, month: str, day: str) -> bool:
-    """
-    Get a date query
-    :param query_set_params: query params to update
-    :param query: query key
-    :param year: year
-    :param month: month
-    :param day: day
-    :return: True if successfully added
-    """
-    success = True
-    try:
-        date = datetime(
-            int(year), int(month), int(day), tzinfo=ZoneInfo("UTC")
-        )
-        query_set_params.add_and_lookup(
-            query, FIELD_LOOKUPS[query], date)
-    except ValueError:
-        # ignore invalid date
-        # TODO add errors to QuerySetParams
-        # so they can be returned to user
-        success = False
-    return success
-
-
 def addresses_query(user: User = None,
                     address_type: AddressType = AddressType.ALL,
                     action: QueryParam = QueryParam.FILTER) -> QuerySet:
@@ -31,3 +31,7 @@ class RecipesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = THIS_APP
     verbose_name = _("Recipe Management")
+
+    def ready(self):
+        # Implicitly connect signal handlers decorated with @receiver.
+        from . import signals
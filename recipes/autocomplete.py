@@ -0,0 +1,143 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from bisect import bisect_left
+from itertools import islice, takewhile
+from typing import List, Tuple, Type, TypeVar, Union
+
+from django.conf import settings
+from django.db.models import Model
+
+from base.entity_conv import unescape_entities
+from utils import TableVersionedValue, ModelMixin
+
+from .models import Ingredient, Keyword, Category
+
+# workaround for self type hints from https://peps.python.org/pep-0673/
+TypeNameIndex = TypeVar("TypeNameIndex", bound="NameIndex")
+
+INDEX_CHUNK_SIZE = 10000
+
+
+class NameIndex:
+    """
+    In-memory index of the names of a model's entities, sorted by
+    case-folded name, used for prefix searches.
+    Note: due to mixed html entity encoding on names from the kaggle
+    dataset, names may be unescaped.
+    """
+    keys: List[str]
+    """ Case-folded names in sorted order """
+    names: List[str]
+    """ Names, in the same order as `keys` """
+    ids: List[int]
+    """ Entity ids, in the same order as `keys` """
+
+    def __init__(self, entries: List[Tuple[str, int]]):
+        """
+        Initialise object
+        :param entries: list of tuples of name and id
+        """
+        entries = sorted(
+            (name.casefold(), name, pk) for name, pk in entries)
+        self.keys = [key for key, _, _ in entries]
+        self.names = [name for _, name, _ in entries]
+        self.ids = [pk for _, _, pk in entries]
+
+    @classmethod
+    def build(cls, model: Type[Union[Model, ModelMixin]],
+              name_field: str, unescape: bool = True) -> TypeNameIndex:
+        """
+        Build the index from the database
+        :param model: model to index
+        :param name_field: name of the name field
+        :param unescape: unescape html entities in names; default True
+        :return: new index
+        """
+        return cls([
+            (unescape_entities(name) if unescape else name, pk)
+            for name, pk in model.objects.values_list(
+                name_field, model.id_field()
+            ).iterator(chunk_size=INDEX_CHUNK_SIZE)
+        ])
+
+    @property
+    def size(self) -> int:
+        """ Number of names in the index """
+        return len(self.keys)
+
+    def prefix(self, prefix: str, limit: int) -> List[Tuple[int, str]]:
+        """
+        Find the names beginning with the specified prefix, ignoring case
+        :param prefix: prefix to search for
+        :param limit: max number of results
+        :return: list of tuples of id and name, in name order
+        """
+        prefix = prefix.casefold()
+        start = bisect_left(self.keys, prefix)
+        return [
+            (self.ids[index], self.names[index])
+            for index in islice(
+                takewhile(
+                    lambda idx: self.keys[idx].startswith(prefix),
+                    range(start, self.size)
+                ), limit)
+        ]
+
+
+# entity name in autocomplete request: (model, name field, unescape names)
+# Note: category names are submitted in the recipe form, and looked up by the
+# name as stored, see CategoryCharField
+AUTOCOMPLETE_ENTITIES = {
+    'ingredients': (Ingredient, Ingredient.NAME_FIELD, True),
+    'keywords': (Keyword, Keyword.NAME_FIELD, True),
+    'categories': (Category, Category.NAME_FIELD, False),
+}
+
+_indices = {
+    # rebuilt following any write to the model's table
+    entity: TableVersionedValue(
+        lambda model=model, field=field, unescape=unescape:
+            NameIndex.build(model, field, unescape=unescape),
+        [model],
+        min_age=lambda: settings.AUTOCOMPLETE_INDEX_MIN_AGE,
+        background=lambda: settings.BACKGROUND_INDEX_REBUILD)
+    for entity, (model, field, unescape) in AUTOCOMPLETE_ENTITIES.items()
+}
+
+
+def autocomplete_names(
+        entity: str, prefix: str, limit: int) -> List[Tuple[int, str]]:
+    """
+    Find the names of entities beginning with the specified prefix
+    :param entity: entity name, one of AUTOCOMPLETE_ENTITIES
+    :param prefix: prefix to search for
+    :param limit: max number of results
+    :return: list of tuples of id and name, in name order
+    """
+    return _indices[entity].get().prefix(prefix, limit)
+
+
+def warm_autocomplete_indices():
+    """ Build the autocomplete indices in the background, e.g. at startup """
+    for index in _indices.values():
+        index.warm()
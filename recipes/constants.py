@@ -47,6 +47,7 @@ PREP_TIME_FIELD = 'prep_time'
 COOK_TIME_FIELD = 'cook_time'
 TOTAL_TIME_FIELD = 'total_time'
 DATE_PUBLISHED_FIELD = 'date_published'
+UPDATED_FIELD = 'updated'
 DESCRIPTION_FIELD = 'description'
 PICTURE_FIELD = 'picture'
 CATEGORY_FIELD = 'category'
@@ -69,8 +70,13 @@ PROTEIN_CONTENT_FIELD = 'protein_content'
 
 INGREDIENT_FIELD = 'ingredient'
 QUANTITY_FIELD = 'quantity'
+AMOUNT_FIELD = 'amount'
+AMOUNT_UPPER_FIELD = 'amount_upper'
 INDEX_FIELD = 'index'
 
+SIMILAR_FIELD = 'similar'
+SCORE_FIELD = 'score'
+
 # Recipe routes related
 PK_PARAM_NAME = "pk"
 INGREDIENT_PK_PARAM_NAME = "ingredient_pk"
@@ -81,6 +87,7 @@ RECIPE_NEW_URL = url_path(RECIPES_URL, "new")
 RECIPE_ID_URL = url_path(RECIPES_URL, f"<int:{PK_PARAM_NAME}>")
 RECIPE_ID_UPDATE_URL = url_path(RECIPE_ID_URL, "update")
 RECIPE_ID_BUY_BOX_URL = url_path(RECIPE_ID_URL, "buy_box")
+RECIPE_ID_SCALE_URL = url_path(RECIPE_ID_URL, "scale")
 RECIPE_ID_INGREDIENT_NEW_URL = url_path(RECIPE_ID_URL, "ingredient", "new")
 RECIPE_ID_INSTRUCTION_NEW_URL = url_path(RECIPE_ID_URL, "instruction", "new")
 
@@ -93,6 +100,12 @@ RECIPE_INSTRUCTION_ID_URL = \
 
 LETTER_PARAM_NAME = "letter"
 RECIPE_CATEGORIES_URL = url_path(RECIPES_URL, "categories")
+RECIPE_SHOPPING_LIST_URL = url_path(RECIPES_URL, "shopping_list")
+RECIPE_MEAL_PLAN_URL = url_path(RECIPES_URL, "meal_plan")
+
+ENTITY_PARAM_NAME = "entity"
+RECIPE_AUTOCOMPLETE_URL = url_path(
+    RECIPES_URL, "autocomplete", f"<str:{ENTITY_PARAM_NAME}>")
 
 # convention is recipes route names begin with 'recipe'
 RECIPES_ROUTE_NAME = "recipes"
@@ -102,6 +115,7 @@ RECIPE_NEW_ROUTE_NAME = "recipe_new"
 RECIPE_ID_ROUTE_NAME = "recipe_id"
 RECIPE_ID_UPDATE_ROUTE_NAME = "recipe_id_update"
 RECIPE_ID_BUY_BOX_ROUTE_NAME = "recipe_id_buy_box"
+RECIPE_ID_SCALE_ROUTE_NAME = "recipe_id_scale"
 RECIPE_ID_INGREDIENT_NEW_ROUTE_NAME = "recipe_id_ingredient_new"
 RECIPE_ID_INSTRUCTION_NEW_ROUTE_NAME = "recipe_id_instruction_new"
 
@@ -111,6 +125,10 @@ RECIPE_INSTRUCTIONS_ROUTE_NAME = "recipe_instructions"
 RECIPE_INSTRUCTION_ID_ROUTE_NAME = "recipe_instruction_id"
 
 CATEGORIES_ROUTE_NAME = "recipe_categories"
+RECIPE_SHOPPING_LIST_ROUTE_NAME = "recipe_shopping_list"
+RECIPE_MEAL_PLAN_ROUTE_NAME = "recipe_meal_plan"
+
+RECIPE_AUTOCOMPLETE_ROUTE_NAME = "recipe_autocomplete"
 
 # query related
 NEXT_QUERY = 'next'
@@ -126,13 +144,11 @@ RECIPE_LIST_CTX = 'recipe_list'
 RECIPE_DTO_CTX = 'recipe_dto'
 INGREDIENTS_CTX = 'ingredients'
 NEW_INGREDIENT_FORM_CTX = 'new_ingred_form'
-INGREDIENT_LIST_CTX = 'ingredient_list'
-INGREDIENT_ID_MAP_CTX = 'ingredient_id_map'
 INSTRUCTIONS_CTX = 'instructions'
 NEW_INSTRUCTION_FORM_CTX = 'new_instruct_form'
 NEW_URL_CTX = 'new_url'
 REFRESH_URL_CTX = 'refresh_url'
-KEYWORDS_CTX = 'keywords'
+KEYWORDS_URL_CTX = 'keywords_url'
 TIME_CTX = 'time'
 CATEGORY_LIST_CTX = 'category_list'
 LETTERS_CTX = 'letters'
@@ -143,6 +159,15 @@ RECIPE_COUNT_CTX = 'recipe_count'
 CAN_PURCHASE_CTX = 'can_purchase'
 IS_OWN_CTX = 'is_own'
 NUTRITIONAL_INFO_CTX = 'nutritional_info'
+FACETS_CTX = 'facets'
+SIMILAR_RECIPES_CTX = 'similar_recipes'
+SIMILAR_NUTRITION_CTX = 'similar_nutrition'
+RECIPE_CARDS_CTX = 'recipe_cards'
+SCALE_SERVINGS_CTX = 'scale_servings'
+SCALE_SYSTEM_CTX = 'scale_system'
+SCALE_SYSTEMS_CTX = 'scale_systems'
+MAX_SERVINGS_CTX = 'max_servings'
+ERROR_CTX = 'error'
 
 COUNT_OPTIONS_CTX = 'count_options'
 SELECTED_COUNT_CTX = 'selected_count'
@@ -162,3 +187,27 @@ RECIPE_QUERY = 'recipe'
 AUTHOR_QUERY = 'author'
 KEYWORD_QUERY = 'key'              # keyword
 INGREDIENT_QUERY = 'ingredient'
+PANTRY_QUERY = 'pantry'            # available ingredients
+PREFIX_QUERY = 'prefix'            # autocomplete name prefix
+LIMIT_QUERY = 'limit'              # autocomplete max results
+SERVINGS_QUERY = 'servings'        # recipe scaling servings
+SYSTEM_QUERY = 'system'            # recipe scaling measurement system
+IDS_QUERY = 'ids'                  # shopping list recipe ids
+BASKET_QUERY = 'basket'            # shopping list include basket boxes
+DAYS_QUERY = 'days'                # meal plan days
+MEALS_QUERY = 'meals'              # meal plan meals per day
+MIN_CALORIES_QUERY = 'min_cal'     # meal plan min daily calories
+MAX_CALORIES_QUERY = 'max_cal'     # meal plan max daily calories
+EXCLUDE_QUERY = 'exclude'          # meal plan categories to exclude
+SEED_QUERY = 'seed'                # meal plan random seed
+# nutrition range queries, e.g. 'cal<500'
+CALORIES_QUERY = 'cal'
+FAT_QUERY = 'fat'
+SATURATED_FAT_QUERY = 'satfat'
+CHOLESTEROL_QUERY = 'chol'
+SODIUM_QUERY = 'sodium'
+CARBOHYDRATE_QUERY = 'carbs'
+FIBRE_QUERY = 'fibre'
+SUGAR_QUERY = 'sugar'
+PROTEIN_QUERY = 'protein'
+NUTRITION_QUERY = 'nutrition'      # combined nutrition ranges
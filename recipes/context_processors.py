@@ -25,14 +25,23 @@ from django.http import HttpRequest
 from recipesnstuff.constants import (
     RECIPES_MENU_CTX, CATEGORIES_MENU_CTX
 )
-from utils import resolve_req, add_navbar_attr, Crud
+from recipesnstuff import RECIPES_APP_NAME
+from utils import (
+    resolve_req, add_navbar_attr, navbar_menu_map, Crud, reverse_q,
+    namespaced_url
+)
 from .constants import (
-    RECIPES_ROUTE_NAME, RECIPE_ID_ROUTE_NAME, KEYWORDS_CTX,
-    CATEGORIES_ROUTE_NAME,
+    RECIPES_ROUTE_NAME, RECIPE_ID_ROUTE_NAME, KEYWORDS_URL_CTX,
+    CATEGORIES_ROUTE_NAME, RECIPE_AUTOCOMPLETE_ROUTE_NAME
 )
-from .models import Keyword
 from .views.utils import recipe_permission_check
 
+# navbar menus activated by route names
+NAVBAR_MENUS = navbar_menu_map([
+    (RECIPES_MENU_CTX, [RECIPES_ROUTE_NAME, RECIPE_ID_ROUTE_NAME]),
+    (CATEGORIES_MENU_CTX, [CATEGORIES_ROUTE_NAME]),
+])
+
 
 def recipe_context(request: HttpRequest) -> dict:
     """
@@ -43,22 +52,20 @@ def recipe_context(request: HttpRequest) -> dict:
     context = {}
     called_by = resolve_req(request)
     if called_by:
-        for ctx, check_func, is_dropdown_toggle in [
-            (RECIPES_MENU_CTX, lambda name: name in [
-                RECIPES_ROUTE_NAME, RECIPE_ID_ROUTE_NAME
-            ], True),
-            (CATEGORIES_MENU_CTX, lambda name: name in [
-                CATEGORIES_ROUTE_NAME
-            ], True),
+        active = NAVBAR_MENUS.get(called_by.url_name)
+        for ctx, is_dropdown_toggle in [
+            (RECIPES_MENU_CTX, True),
+            (CATEGORIES_MENU_CTX, True),
         ]:
             add_navbar_attr(
-                context, ctx, is_active=check_func(called_by.url_name),
+                context, ctx, is_active=ctx == active,
                 has_permission=recipe_permission_check(
                     request, Crud.READ, raise_ex=False),
                 is_dropdown_toggle=is_dropdown_toggle
             )
 
-    context[KEYWORDS_CTX] = [
-        word.name for word in Keyword.objects.all()
-    ]
+    # keywords are requested from the autocomplete endpoint as required
+    context[KEYWORDS_URL_CTX] = reverse_q(
+        namespaced_url(RECIPES_APP_NAME, RECIPE_AUTOCOMPLETE_ROUTE_NAME),
+        args=['keywords'])
     return context
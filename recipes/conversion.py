@@ -19,18 +19,25 @@
 #  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
-import decimal
 from contextvars import Context
 from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum
-from typing import Optional, Union, TypeVar
+from functools import cache
+from typing import (
+    Optional, Union, TypeVar, Dict, List, Tuple, Iterable
+)
+
+from utils import TableVersionedValue
 
 from .models import Measure
 
 
 # workaround for self type hints from https://peps.python.org/pep-0673/
 TypeQuantity = TypeVar("TypeQuantity", bound="Quantity")
+TypeMeasures = TypeVar("TypeMeasures", bound="Measures")
+TypeMeasureRegistry = TypeVar(
+    "TypeMeasureRegistry", bound="MeasureRegistry")
 
 
 class Measures(Enum):
@@ -74,6 +81,24 @@ class Measures(Enum):
     UNIT = ("unit", "")
     CAN = ("can", "can")
 
+    @property
+    def index(self) -> int:
+        """ Index of this measure in the conversion matrix """
+        return _MEASURE_INDICES[self]
+
+    @staticmethod
+    def from_name(name: str) -> Optional[TypeMeasures]:
+        """
+        Get the measure with the specified name
+        :param name: name of measure
+        :return: measure or None if not found
+        """
+        return _MEASURE_NAMES.get(name)
+
+
+_MEASURE_INDICES = {measure: idx for idx, measure in enumerate(Measures)}
+_MEASURE_NAMES = {measure.value[0]: measure for measure in Measures}
+
 
 @dataclass
 class Quantity:
@@ -151,6 +176,7 @@ class Quantity:
             Quantity.exp(places), rounding=rounding, context=context))
 
     @staticmethod
+    @cache
     def exp(places: int = STD_PLACES) -> Decimal:
         """
         Return an exponent
@@ -164,6 +190,108 @@ class Quantity:
 # https://docs.python.org/3/library/decimal.html
 
 
+# conversion factors from one measure to another;
+# tuple of (multiplier, divisor) as the amount is multiplied before dividing
+Factors = Tuple[Decimal, Decimal]
+
+
+class MeasureRegistry:
+    """
+    In-memory registry of the measures, with a precomputed matrix of the
+    conversion factors between them
+    """
+    measures: Dict[Measures, Measure]
+    """ Measures by enum member; only members in the database """
+    by_id: Dict[int, Measures]
+    """ Enum members by measure id """
+    matrix: List[List[Optional[Factors]]]
+    """
+    Conversion factors indexed by from and to `Measures.index`, or None if
+    conversion is not possible
+    """
+
+    def __init__(self, measures: Iterable[Measure]):
+        """
+        Initialise object
+        :param measures: all measures
+        """
+        self.measures = {}
+        self.by_id = {}
+        for measure in measures:
+            member = Measures.from_name(measure.name)
+            if member is not None:
+                self.measures[member] = measure
+                self.by_id[measure.id] = member
+
+        self.matrix = [[None] * len(Measures) for _ in Measures]
+        for from_t, from_m in self.measures.items():
+            for to_t, to_m in self.measures.items():
+                if from_m.type == to_m.type:
+                    # same system; (from * from.base_system) / to.base_system
+                    # different system;
+                    # (from * from.base_other_system) / to.base_system
+                    self.matrix[from_t.index][to_t.index] = (
+                        from_m.other_system(to_m), to_m.base_system
+                    )
+
+    @staticmethod
+    def load() -> TypeMeasureRegistry:
+        """
+        Load the registry from the database
+        :return: registry
+        """
+        return MeasureRegistry(Measure.objects.all())
+
+    def factors(self, from_t: Measures,
+                to_t: Measures) -> Optional[Factors]:
+        """
+        Get the factors to convert between measures
+        :param from_t: measure to convert from
+        :param to_t: measure to convert to
+        :return: tuple of multiplier and divisor, or None if conversion is
+                not possible
+        """
+        return self.matrix[from_t.index][to_t.index]
+
+
+# rebuilt when the measure table is written to
+_registry = TableVersionedValue(MeasureRegistry.load, [Measure])
+
+
+def measure_registry() -> MeasureRegistry:
+    """
+    Get the measure registry
+    :return: registry
+    """
+    return _registry.get()
+
+
+def _convert(
+    registry: MeasureRegistry, from_q: Union[int, float, Decimal],
+    from_t: Measures, to_t: Measures, quantised: bool, places: int,
+    rounding: str | None, context: Context | None
+) -> Optional[Decimal]:
+    """
+    Convert a quantity using the specified registry
+    See convert() for parameter details
+    """
+    conversion = None
+    factors = registry.factors(from_t, to_t)
+    if factors is not None:
+        multiplier, divisor = factors
+        conversion = (Decimal(from_q) * multiplier) / divisor
+
+        if quantised:
+            conversion = conversion.quantize(
+                Quantity.exp(places), rounding=rounding, context=context)
+
+            if places > Quantity.STD_PLACES:
+                # maths requires too much precision, rounding solves it
+                conversion = Quantity.standardise(conversion)
+
+    return conversion
+
+
 def convert(
     from_q: Union[int, float, Decimal], from_t: Measures,
     to_t: Measures, quantised: bool = False,
@@ -181,40 +309,42 @@ def convert(
     :param context: context for arithmetic; default None
     :return: converted quantity
     """
-    conversion = None
-    from_m = get_measure_by_name(from_t.value[0])
-    to_m = get_measure_by_name(to_t.value[0])
-    if from_m and to_m and from_m.type == to_m.type:
-        to_places = Quantity.exp(places)
-
-        if from_m.system == to_m.system:
-            # same system; (from * from.base_system) / to.base_system
-            conversion = (Decimal(from_q) * from_m.base_system) \
-                         / to_m.base_system
-        else:
-            # different system;
-            # (from * from.base_other_system) / to.base_system
-            conversion = (Decimal(from_q) * from_m.other_system(to_m)) \
-                         / to_m.base_system
-
-        if quantised:
-            conversion = conversion.quantize(
-                to_places, rounding=rounding, context=context)
+    return _convert(measure_registry(), from_q, from_t, to_t,
+                    quantised, places, rounding, context)
 
-            if places > Quantity.STD_PLACES:
-                # maths requires too much precision, rounding solves it
-                conversion = Quantity.standardise(conversion)
 
-    return conversion
+def convert_many(
+    conversions: Iterable[Tuple[Union[int, float, Decimal], Measures,
+                                Measures]],
+    quantised: bool = False, places: int = Quantity.STD_PLACES,
+    rounding: str | None = None, context: Context | None = None
+) -> List[Optional[Decimal]]:
+    """
+    Convert a batch of quantities
+    :param conversions: tuples of amount to convert, measure to convert from
+                and measure to convert to
+    :param quantised: quantised amount flag; default False
+    :param places: number of decimal places; default 3
+    :param rounding: rounding mode: default None
+    :param context: context for arithmetic; default None
+    :return: list of converted quantities, in the same order as
+            `conversions`
+    """
+    registry = measure_registry()
+    return [
+        _convert(registry, from_q, from_t, to_t,
+                 quantised, places, rounding, context)
+        for from_q, from_t, to_t in conversions
+    ]
 
 
 def get_measure_by_name(name: str) -> Optional[Measure]:
     """
     Get a measure
+    Note: the measure is shared, so must not be modified
     :param name: name of measure to get
     :return: measure or None
     """
-    query = Measure.objects.filter(**{
-        Measure.NAME_FIELD: name
-    })
-    return query.get() if query.count() == 1 else None
+    member = Measures.from_name(name)
+    return measure_registry().measures.get(member) \
+        if member is not None else None
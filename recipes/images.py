@@ -20,7 +20,7 @@
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
 
-from typing import List
+from typing import List, Optional
 
 from base.dto import ImagePool
 from recipes.templatetags.stock_image import stock_image
@@ -31,10 +31,18 @@ def recipe_main_image(images: List) -> ImagePool:
     The url for the main image
     :return: url str or None
     """
-    # first image in list and a backup stock image
-    online_img = len(images) > 0
+    # first image in list
+    return main_image_pool(images[0].url if len(images) > 0 else None)
+
+
+def main_image_pool(url: Optional[str]) -> ImagePool:
+    """
+    The image pool for a main image
+    :param url: url of main image or None if no image
+    :return: image pool with the main image and a backup stock image
+    """
     return ImagePool(
-        url=images[0].url if online_img else None, is_static=not online_img
+        url=url, is_static=url is None
     ).add_image(url=stock_image(), is_static=True)
 
 
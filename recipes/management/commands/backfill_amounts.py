@@ -0,0 +1,82 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recipes.models import RecipeIngredient
+from utils import bump_table_version
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+class Command(BaseCommand):
+    """
+    Set the numeric amounts of recipe ingredients from their quantities,
+    for rows saved without them, e.g. by a bulk data load
+    """
+    help = "Set the numeric amounts of recipe ingredients from their " \
+           "quantities"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help=f'Number of recipe ingredients per chunk; '
+                 f'default {DEFAULT_CHUNK_SIZE}')
+
+    def handle(self, *args, **options):
+        chunk_size = max(options['chunk_size'], 1)
+        id_field = RecipeIngredient.id_field()
+        fields = [
+            RecipeIngredient.AMOUNT_FIELD, RecipeIngredient.AMOUNT_UPPER_FIELD
+        ]
+
+        count = 0
+        updated = 0
+        last_id = 0
+        while True:
+            chunk = list(
+                RecipeIngredient.objects.filter(**{
+                    f'{id_field}__gt': last_id
+                }).order_by(id_field).only(
+                    id_field, RecipeIngredient.QUANTITY_FIELD, *fields
+                )[:chunk_size]
+            )
+            if not chunk:
+                break
+
+            changed = [entity for entity in chunk if entity.set_amount()]
+            if changed:
+                with transaction.atomic():
+                    RecipeIngredient.objects.bulk_update(
+                        changed, fields, batch_size=chunk_size)
+            count += len(chunk)
+            updated += len(changed)
+            last_id = chunk[-1].pk
+            self.stdout.write(f'Checked {count} recipe ingredients')
+
+        if updated:
+            bump_table_version(RecipeIngredient)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Updated {updated} of {count} recipe '
+                               f'ingredients'))
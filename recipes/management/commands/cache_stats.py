@@ -0,0 +1,56 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from django.core.management.base import BaseCommand, CommandError
+
+# import modules defining cache stats so they are registered
+from recipes.views import card_cache  # noqa: F401
+from utils import CacheStats, is_shared_cache
+
+
+class Command(BaseCommand):
+    """
+    Report the hit ratios of the application caches.
+    The counters are held in the default cache, so this command requires a
+    cache shared with the web processes, see settings.CACHES.
+    """
+    help = "Report the hit ratios of the application caches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Reset the counters after reporting')
+
+    def handle(self, *args, **options):
+        if not is_shared_cache():
+            raise CommandError(
+                'The default cache is not shared between processes, so the '
+                'counters of the web processes are not available. '
+                'Set CACHE_URL to a shared cache, e.g. redis or dbcache.')
+
+        for stats in CacheStats.all():
+            hits, misses, ratio = stats.get()
+            self.stdout.write(
+                f'{stats.name}: hits {hits} misses {misses} '
+                f'ratio {ratio:.3f}')
+            if options['reset']:
+                stats.reset()
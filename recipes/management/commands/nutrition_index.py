@@ -0,0 +1,106 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from time import perf_counter
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.nutrition import NutritionMatrix
+from recipes.nutrition_neighbours import NutritionIndex, DEFAULT_K
+
+DEFAULT_BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    """
+    Build the nutrition index used to find recipes with similar nutrition
+    profiles, and save it to a directory from which it is memory-mapped
+    """
+    help = "Build the index of recipe nutrition profiles, and optionally " \
+           "benchmark nearest-neighbour queries"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', type=str, default=settings.NUTRITION_INDEX_PATH,
+            help='Directory to save the index to; '
+                 'default NUTRITION_INDEX_PATH setting')
+        parser.add_argument(
+            '--benchmark', type=int, default=0,
+            help='Number of random recipes to query after building; '
+                 'default 0')
+        parser.add_argument(
+            '--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+            help=f'Number of recipes per benchmark query; '
+                 f'default {DEFAULT_BATCH_SIZE}')
+        parser.add_argument(
+            '-k', type=int, default=DEFAULT_K,
+            help=f'Number of neighbours per recipe in benchmark queries; '
+                 f'default {DEFAULT_K}')
+
+    def handle(self, *args, **options):
+        if not options['output']:
+            raise CommandError(
+                'No output directory, specify --output or set '
+                'NUTRITION_INDEX_PATH')
+
+        start = perf_counter()
+        matrix = NutritionMatrix.build()
+        read = perf_counter()
+        index = NutritionIndex.from_matrix(matrix)
+        built = perf_counter()
+        index.save(options['output'])
+        saved = perf_counter()
+        self.stdout.write(
+            f'Indexed {index.size} of {len(matrix.recipe_ids)} recipes: '
+            f'read {read - start:.3f}s, build {built - read:.3f}s, '
+            f'save {saved - built:.3f}s')
+
+        if options['benchmark'] > 0 and index.size:
+            self.benchmark(NutritionIndex.load(options['output']),
+                           options['benchmark'], options['batch_size'],
+                           options['k'])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Saved nutrition index to "
+                               f"{options['output']}"))
+
+    def benchmark(self, index: NutritionIndex, count: int,
+                  batch_size: int, k: int):
+        """
+        Benchmark queries of the memory-mapped index
+        :param index: index to query
+        :param count: number of recipes to query
+        :param batch_size: number of recipes per query
+        :param k: number of neighbours per recipe
+        """
+        recipe_ids = np.random.default_rng().choice(
+            index.recipe_ids, size=count)
+        batch_size = max(batch_size, 1)
+        start = perf_counter()
+        for idx in range(0, count, batch_size):
+            index.neighbours(recipe_ids[idx:idx + batch_size], k=k)
+        elapsed = perf_counter() - start
+        self.stdout.write(
+            f'Queried {count} recipes in batches of {batch_size}: '
+            f'{elapsed:.3f}s, {elapsed * 1000 / count:.3f}ms per recipe')
@@ -0,0 +1,109 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+import os
+
+from django.core.management.base import BaseCommand
+from django.db import transaction, connection
+
+from recipes.models import SimilarRecipe
+from recipes.similarity import (
+    RecipeTokens, find_similar, DEFAULT_TOP_K, DEFAULT_MIN_SCORE,
+    DEFAULT_NUM_PERM, DEFAULT_BANDS, DEFAULT_MAX_BUCKET, DEFAULT_CHUNK_SIZE
+)
+from utils import bump_table_version
+
+SAVE_BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    """
+    Compute the most similar recipes of each recipe, from the recipes'
+    keywords and ingredients, and replace the contents of the similar
+    recipes table with them
+    """
+    help = "Compute the similar recipes of each recipe, from the recipes' " \
+           "keywords and ingredients"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k', type=int, default=DEFAULT_TOP_K,
+            help=f'Max number of similar recipes per recipe; '
+                 f'default {DEFAULT_TOP_K}')
+        parser.add_argument(
+            '--min-score', type=float, default=DEFAULT_MIN_SCORE,
+            help=f'Min estimated similarity (0-1); '
+                 f'default {DEFAULT_MIN_SCORE}')
+        parser.add_argument(
+            '--num-perm', type=int, default=DEFAULT_NUM_PERM,
+            help=f'MinHash signature length; default {DEFAULT_NUM_PERM}')
+        parser.add_argument(
+            '--bands', type=int, default=DEFAULT_BANDS,
+            help=f'Number of LSH bands, must be a factor of the signature '
+                 f'length; default {DEFAULT_BANDS}')
+        parser.add_argument(
+            '--max-bucket', type=int, default=DEFAULT_MAX_BUCKET,
+            help=f'Max LSH bucket size to take candidates from; '
+                 f'default {DEFAULT_MAX_BUCKET}')
+        parser.add_argument(
+            '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+            help=f'Number of recipes per chunk of work; '
+                 f'default {DEFAULT_CHUNK_SIZE}')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Number of worker processes; default number of CPUs')
+
+    def handle(self, *args, **options):
+        tokens = RecipeTokens.load()
+        self.stdout.write(f'Loaded {tokens.size} recipes')
+
+        neighbours = find_similar(
+            tokens, top_k=options['top_k'], min_score=options['min_score'],
+            num_perm=options['num_perm'], bands=options['bands'],
+            max_bucket=options['max_bucket'],
+            chunk_size=options['chunk_size'], workers=options['workers'])
+
+        count = 0
+        with transaction.atomic():
+            # raw delete, as a queryset delete fetches every row to send
+            # delete signals
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'DELETE FROM {SimilarRecipe._meta.db_table}')
+            batch = []
+            for recipe_id, similar_id, score in neighbours:
+                batch.append(SimilarRecipe(**{
+                    f'{SimilarRecipe.RECIPE_FIELD}_id': recipe_id,
+                    f'{SimilarRecipe.SIMILAR_FIELD}_id': similar_id,
+                    f'{SimilarRecipe.SCORE_FIELD}': score,
+                }))
+                if len(batch) == SAVE_BATCH_SIZE:
+                    SimilarRecipe.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch.clear()
+            if batch:
+                SimilarRecipe.objects.bulk_create(batch)
+                count += len(batch)
+        bump_table_version(SimilarRecipe)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Saved {count} similar recipes'))
@@ -0,0 +1,240 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .models import Recipe
+from .nutrition import NutritionMatrix, nutrition_matrix
+
+# nutrients whose daily value is an upper limit rather than a target
+LIMIT_FIELDS = [
+    Recipe.SATURATED_FAT_CONTENT_FIELD, Recipe.CHOLESTEROL_CONTENT_FIELD,
+    Recipe.SODIUM_CONTENT_FIELD, Recipe.SUGAR_CONTENT_FIELD
+]
+# relative importance of nutrients when selecting recipes; default 1
+FIELD_WEIGHTS = {
+    Recipe.CALORIES_FIELD: 2.0,
+}
+
+
+@dataclass
+class MealPlanDay:
+    """ Recipes for a day of a meal plan """
+    recipe_ids: List[int]
+    """ Ids of recipes, one per meal """
+    totals: Dict[str, float]
+    """ Total of nutritional values by field """
+
+
+class MealPlanner:
+    """
+    Meal plan generator, which greedily selects the recipes for each meal
+    that keep the day's nutritional totals closest to the daily targets.
+    The candidates for each meal are scored in a single vectorised pass over
+    the nutrition matrix.
+    Note: the nutritional values of recipes are per serving
+    """
+    matrix: NutritionMatrix
+    """ Nutrition matrix of recipes """
+    targets: np.ndarray
+    """ Daily targets, one per matrix field """
+    target_dict: Dict[str, float]
+    """ Daily targets by field """
+
+    def __init__(self, matrix: NutritionMatrix, targets: Dict[str, float]):
+        """
+        Initialise object
+        :param matrix: nutrition matrix of recipes
+        :param targets: daily targets by field
+        """
+        self.matrix = matrix
+        self.target_dict = dict(targets)
+        self.targets = np.array(
+            [targets[field] for field in matrix.fields], dtype=np.float64)
+        # values as fractions of daily targets
+        fractions = matrix.values / self.targets
+        weights = np.array([
+            FIELD_WEIGHTS.get(field, 1.0) for field in matrix.fields
+        ])
+        limits = np.array([
+            field in LIMIT_FIELDS for field in matrix.fields
+        ])
+        # scores are the weighted sum of squared differences from the
+        # targets, which are split into target and limit columns, so the
+        # target terms can be expanded to a matrix-vector product
+        self._target_cols = ~limits
+        self._target_fractions = fractions[:, ~limits].copy()
+        self._target_weights = weights[~limits]
+        self._target_squares = (
+            self._target_fractions ** 2 * self._target_weights).sum(axis=1)
+        self._limit_cols = limits
+        # limit terms are evaluated column by column, contiguous columns
+        # avoid two-dimensional temporaries
+        self._limit_fractions = [
+            np.ascontiguousarray(fractions[:, col])
+            for col in np.flatnonzero(limits)
+        ]
+        self._limit_weights = weights[limits]
+        self._fractions = fractions
+        self._calories = matrix.values[
+            :, matrix.fields.index(Recipe.CALORIES_FIELD)]
+
+    def scores(self, remaining: np.ndarray) -> np.ndarray:
+        """
+        Score all recipes as the next meal, lower is better
+        :param remaining: remainder of the targets for the meal, as
+                fractions of the daily targets
+        :return: scores
+        """
+        # exceeding a target is as bad as falling short of it; i.e.
+        # sum(w * (r - f)^2) = sum(w * r^2) - 2 * f.(w * r) + sum(w * f^2)
+        weighted = self._target_weights * remaining[self._target_cols]
+        scores = self._target_squares - 2 * (
+            self._target_fractions @ weighted)
+        scores += (weighted * remaining[self._target_cols]).sum()
+        # only exceeding a limit counts
+        excess = np.empty_like(scores)
+        for fractions, limit, weight in zip(
+                self._limit_fractions, remaining[self._limit_cols],
+                self._limit_weights):
+            np.subtract(fractions, limit, out=excess)
+            np.maximum(excess, 0, out=excess)
+            np.square(excess, out=excess)
+            excess *= weight
+            scores += excess
+        return scores
+
+    def candidates(self, categories: Iterable[int] = None,
+                   exclude_categories: Iterable[int] = None) -> np.ndarray:
+        """
+        Get the recipes which may be included in a plan
+        :param categories: ids of categories to include; default all
+        :param exclude_categories: ids of categories to exclude; default none
+        :return: mask of matrix rows
+        """
+        # recipes without nutritional info are unusable
+        mask = self._calories > 0
+        if categories:
+            mask &= np.isin(self.matrix.category_ids, list(categories))
+        if exclude_categories:
+            mask &= ~np.isin(
+                self.matrix.category_ids, list(exclude_categories))
+        return mask
+
+    def plan(self, days: int = 7, meals: int = 3,
+             min_calories: float = None, max_calories: float = None,
+             categories: Iterable[int] = None,
+             exclude_categories: Iterable[int] = None,
+             variety: int = 1,
+             seed: int = None) -> Optional[List[MealPlanDay]]:
+        """
+        Generate a meal plan. Recipes are not repeated in a plan.
+        :param days: number of days; default 7
+        :param meals: number of meals per day; default 3
+        :param min_calories: min daily calories; default no min
+        :param max_calories: max daily calories; default no max
+        :param categories: ids of categories to include; default all
+        :param exclude_categories: ids of categories to exclude; default none
+        :param variety: number of best recipes to randomly choose from for
+                each meal; default 1 i.e. always the best
+        :param seed: random seed; default None
+        :return: list of days, or None if the constraints can not be met
+        """
+        rng = np.random.default_rng(seed)
+        available = self.candidates(
+            categories=categories, exclude_categories=exclude_categories)
+
+        plan = []
+        for _ in range(days):
+            totals = np.zeros(len(self.matrix.fields))
+            calories = 0.0
+            day = []
+            for meal in range(1, meals + 1):
+                # aim for an equal share of the targets at each meal
+                scores = self.scores(meal / meals - totals)
+
+                valid = available.copy()
+                day_calories = calories + self._calories
+                if max_calories is not None:
+                    valid &= day_calories <= max_calories
+                if min_calories is not None and meal == meals:
+                    valid &= day_calories >= min_calories
+                scores[~valid] = np.inf
+
+                index = self._select(scores, variety, rng)
+                if index is None:
+                    return None
+
+                available[index] = False
+                totals += self._fractions[index]
+                calories += self._calories[index]
+                day.append(int(self.matrix.recipe_ids[index]))
+
+            plan.append(MealPlanDay(
+                recipe_ids=day,
+                totals=dict(zip(
+                    self.matrix.fields,
+                    (totals * self.targets).round(1).tolist()))
+            ))
+        return plan
+
+    @staticmethod
+    def _select(scores: np.ndarray, variety: int,
+                rng: np.random.Generator) -> Optional[int]:
+        """
+        Select a recipe
+        :param scores: scores of recipes, lower is better
+        :param variety: number of best recipes to randomly choose from
+        :param rng: random generator
+        :return: matrix row of recipe, or None if no valid recipe
+        """
+        if variety > 1 and len(scores) > variety:
+            best = np.argpartition(scores, variety)[:variety]
+            best = best[np.isfinite(scores[best])]
+            index = int(rng.choice(best)) if len(best) else None
+        else:
+            index = int(np.argmin(scores)) if len(scores) else None
+            if index is not None and not np.isfinite(scores[index]):
+                index = None
+        return index
+
+
+_planner: Optional[MealPlanner] = None
+
+
+def meal_planner(targets: Dict[str, float]) -> MealPlanner:
+    """
+    Get a meal planner for the current nutrition matrix
+    :param targets: daily targets by field
+    :return: planner
+    """
+    global _planner
+    matrix = nutrition_matrix()
+    planner = _planner
+    if planner is None or planner.matrix is not matrix or \
+            planner.target_dict != targets:
+        planner = MealPlanner(matrix, targets)
+        _planner = planner
+    return planner
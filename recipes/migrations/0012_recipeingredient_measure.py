@@ -3,8 +3,8 @@
 from django.db import migrations, models
 import django.db.models.deletion
 
-from recipes.constants import THIS_APP
-from recipes.models import Measure, RecipeIngredient, Ingredient
+from recipes.constants import THIS_APP, INGREDIENT_FIELD
+from recipes.models import Measure, RecipeIngredient
 from utils.database import table_exists
 
 
@@ -16,11 +16,13 @@ def set_recipe_ingredient_measures(apps, schema_editor):
         editor generating statements to change database schema
     """
     # https://docs.djangoproject.com/en/4.1/topics/migrations/#data-migrations
-    for recipe_ingredient in RecipeIngredient.objects.all():
-        ingredient = Ingredient.objects.get(**{
-            f'{Ingredient.id_field()}': recipe_ingredient.ingredient.id
-        })
-        recipe_ingredient.measure = ingredient.measure
+    # use the historical model, as the current model may have fields which
+    # don't exist yet
+    recipe_ingredient_model = apps.get_model(
+        THIS_APP, RecipeIngredient.model_name())
+    for recipe_ingredient in recipe_ingredient_model.objects.select_related(
+            INGREDIENT_FIELD).all():
+        recipe_ingredient.measure_id = recipe_ingredient.ingredient.measure_id
         recipe_ingredient.save()
 
 
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.2 on 2026-10-19 04:46
+
+import datetime
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+def set_recipe_total_time(apps, schema_editor):
+    """
+    Populate Recipe total_time field from the prep and cook time fields
+    :param apps: apps registry
+    :param schema_editor:
+        editor generating statements to change database schema
+    """
+    recipe = apps.get_model('recipes', 'Recipe')
+    recipe.objects.update(
+        total_time=models.F('prep_time') + models.F('cook_time'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0015_recipe_nutrition_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='total_time',
+            field=models.DurationField(
+                default=datetime.timedelta(0), editable=False,
+                verbose_name='total time'),
+        ),
+        migrations.RunPython(set_recipe_total_time,
+                             reverse_code=migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(
+                django.db.models.functions.text.Lower('name'),
+                name='recipe_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['prep_time'], name='recipe_prep_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['cook_time'], name='recipe_cook_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(fields=['total_time'], name='recipe_total_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(
+                fields=['date_published'], name='recipe_published_idx'),
+        ),
+    ]
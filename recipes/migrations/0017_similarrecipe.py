@@ -0,0 +1,38 @@
+# Generated by Django 4.2.2 on 2026-10-19 04:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+import utils.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0016_recipe_total_time_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarRecipe',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True, primary_key=True, serialize=False,
+                    verbose_name='ID')),
+                ('score', models.FloatField(
+                    default=0, verbose_name='similarity score')),
+                ('recipe', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    to='recipes.recipe')),
+                ('similar', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='+', to='recipes.recipe')),
+            ],
+            options={
+                'indexes': [
+                    models.Index(fields=['recipe', '-score'],
+                                 name='similar_recipe_score_idx')
+                ],
+            },
+            bases=(utils.models.ModelMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.2 on 2026-10-19 05:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0018_recipe_updated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipeingredient',
+            name='amount',
+            field=models.DecimalField(
+                blank=True, decimal_places=4, max_digits=12, null=True,
+                verbose_name='amount'),
+        ),
+        migrations.AddField(
+            model_name='recipeingredient',
+            name='amount_upper',
+            field=models.DecimalField(
+                blank=True, decimal_places=4, max_digits=12, null=True,
+                verbose_name='amount upper bound'),
+        ),
+    ]
@@ -20,7 +20,7 @@
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
 from dataclasses import dataclass
-from typing import TypeVar
+from typing import TypeVar, Optional, Tuple
 from decimal import Decimal
 from datetime import timedelta, datetime, MINYEAR, timezone
 import html
@@ -28,27 +28,32 @@ import html
 from cloudinary.models import CloudinaryField
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.utils import timezone as django_timezone
 from django.utils.translation import gettext_lazy as _
 from django.db.models import Field, Lookup
+from django.db.models.functions import Lower
 
 from base.dto import ImagePool
 from recipesnstuff import IMAGES_FOLDER, DEVELOPMENT
 from user.models import User
-from utils import ModelMixin
+from utils import ModelMixin, bump_table_version
 
 from .constants import (
     NAME_FIELD, TYPE_FIELD, SYSTEM_FIELD, IS_DEFAULT_FIELD, ABBREV_FIELD,
     BASE_US_FIELD, BASE_METRIC_FIELD, MEASURE_FIELD, FOOD_ID_FIELD, TEXT_FIELD,
     URL_FIELD, RECIPE_FIELD, PREP_TIME_FIELD, COOK_TIME_FIELD,
-    TOTAL_TIME_FIELD, DATE_PUBLISHED_FIELD, DESCRIPTION_FIELD, CATEGORY_FIELD,
+    TOTAL_TIME_FIELD, DATE_PUBLISHED_FIELD, UPDATED_FIELD, DESCRIPTION_FIELD,
+    CATEGORY_FIELD,
     KEYWORDS_FIELD, AUTHOR_FIELD, SERVINGS_FIELD, RECIPE_YIELD_FIELD,
     INGREDIENTS_FIELD, INSTRUCTIONS_FIELD, IMAGES_FIELD, CALORIES_FIELD,
     FAT_CONTENT_FIELD, SATURATED_FAT_CONTENT_FIELD, CHOLESTEROL_CONTENT_FIELD,
     SODIUM_CONTENT_FIELD, CARBOHYDRATE_CONTENT_FIELD, FIBRE_CONTENT_FIELD,
     SUGAR_CONTENT_FIELD, PROTEIN_CONTENT_FIELD, INGREDIENT_FIELD,
-    QUANTITY_FIELD, INDEX_FIELD, PICTURE_FIELD
+    QUANTITY_FIELD, INDEX_FIELD, PICTURE_FIELD, SIMILAR_FIELD, SCORE_FIELD,
+    AMOUNT_FIELD, AMOUNT_UPPER_FIELD
 )
 from recipes.images import recipe_main_image
+from recipes.quantities import parse_quantity
 
 # workaround for self type hints from https://peps.python.org/pep-0673/
 TypeMeasure = TypeVar("TypeMeasure", bound="Measure")
@@ -335,8 +340,9 @@ class Recipe(ModelMixin, models.Model):
     FOOD_ID_FIELD = FOOD_ID_FIELD
     PREP_TIME_FIELD = PREP_TIME_FIELD
     COOK_TIME_FIELD = COOK_TIME_FIELD
-    TOTAL_TIME_FIELD = TOTAL_TIME_FIELD     # sum of prep & cook annotation
+    TOTAL_TIME_FIELD = TOTAL_TIME_FIELD     # sum of prep & cook time
     DATE_PUBLISHED_FIELD = DATE_PUBLISHED_FIELD
+    UPDATED_FIELD = UPDATED_FIELD           # revision stamp
     DESCRIPTION_FIELD = DESCRIPTION_FIELD
     PICTURE_FIELD = PICTURE_FIELD
     CATEGORY_FIELD = CATEGORY_FIELD
@@ -374,10 +380,18 @@ class Recipe(ModelMixin, models.Model):
     cook_time = models.DurationField(
         _('cooking time'), default=timedelta())
 
+    # maintained by save() so total time ordering can use an index
+    total_time = models.DurationField(
+        _('total time'), default=timedelta(), editable=False)
+
     date_published = models.DateTimeField(
         _('date published'),
         default=datetime(MINYEAR, 1, 1, tzinfo=timezone.utc))
 
+    # revision stamp, set by save() and by signals when related ingredients,
+    # images, keywords or instructions change, see recipes/signals.py
+    updated = models.DateTimeField(_('updated'), auto_now=True)
+
     description = models.CharField(
         _('description'), max_length=RECIPE_ATTRIB_DESC_MAX_LEN)
 
@@ -422,6 +436,61 @@ class Recipe(ModelMixin, models.Model):
     @dataclass
     class Meta:
         """ Model metadata """
+        indexes = [
+            # nutrition range searches, e.g. 'cal<500'
+            models.Index(fields=[field], name=f'recipe_{name}_idx')
+            for field, name in [
+                (CALORIES_FIELD, 'calories'),
+                (FAT_CONTENT_FIELD, 'fat'),
+                (SATURATED_FAT_CONTENT_FIELD, 'satfat'),
+                (CHOLESTEROL_CONTENT_FIELD, 'chol'),
+                (SODIUM_CONTENT_FIELD, 'sodium'),
+                (CARBOHYDRATE_CONTENT_FIELD, 'carbs'),
+                (FIBRE_CONTENT_FIELD, 'fibre'),
+                (SUGAR_CONTENT_FIELD, 'sugar'),
+                (PROTEIN_CONTENT_FIELD, 'protein'),
+            ]
+        ] + [
+            # sort orders, see RecipeSortOrder; text orderings are
+            # case-insensitive, see ContentListMixin.get_ordering()
+            models.Index(Lower(NAME_FIELD), name='recipe_name_lower_idx'),
+        ] + [
+            models.Index(fields=[field], name=f'recipe_{name}_idx')
+            for field, name in [
+                (PREP_TIME_FIELD, 'prep'),
+                (COOK_TIME_FIELD, 'cook'),
+                (TOTAL_TIME_FIELD, 'total'),
+                (DATE_PUBLISHED_FIELD, 'published'),
+            ]
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Save this recipe, updating the total time and revision stamp
+        :param args: positional arguments for `Model.save()`
+        :param kwargs: keyword arguments for `Model.save()`
+        """
+        self.total_time = self.prep_time + self.cook_time
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = {*update_fields, UPDATED_FIELD}
+            if {PREP_TIME_FIELD, COOK_TIME_FIELD} & update_fields:
+                update_fields.add(TOTAL_TIME_FIELD)
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def touch(**lookups):
+        """
+        Update the revision stamp of the recipes matching the specified
+        lookups, without saving the recipes. As no save signal is sent, the
+        recipe table version is bumped here.
+        :param lookups: recipe lookups, e.g. `pk__in=[1, 2]`
+        """
+        if Recipe.objects.filter(**lookups).update(**{
+            UPDATED_FIELD: django_timezone.now()
+        }):
+            bump_table_version(Recipe)
 
     @classmethod
     def date_fields(cls) -> list[str]:
@@ -472,8 +541,12 @@ class RecipeIngredient(ModelMixin, models.Model):
     QUANTITY_FIELD = QUANTITY_FIELD
     INDEX_FIELD = INDEX_FIELD
     MEASURE_FIELD = MEASURE_FIELD
+    AMOUNT_FIELD = AMOUNT_FIELD
+    AMOUNT_UPPER_FIELD = AMOUNT_UPPER_FIELD
 
     RECIPE_INGREDIENT_ATTRIB_QUANTITY_MAX_LEN: int = 30
+    RECIPE_INGREDIENT_ATTRIB_AMOUNT_MAX_DIGITS: int = 12
+    RECIPE_INGREDIENT_ATTRIB_AMOUNT_DECIMAL_PLACES: int = 4
     RECIPE_INGREDIENT_ATTRIB_INDEX_MIN: int = 1
     RECIPE_INGREDIENT_ATTRIB_INDEX_MAX: int = 32767
 
@@ -494,6 +567,16 @@ class RecipeIngredient(ModelMixin, models.Model):
             "Designates the measure for the ingredient."
         )
     )
+    # numeric quantity parsed from `quantity`, null if not numeric
+    amount = models.DecimalField(
+        _('amount'), null=True, blank=True,
+        max_digits=RECIPE_INGREDIENT_ATTRIB_AMOUNT_MAX_DIGITS,
+        decimal_places=RECIPE_INGREDIENT_ATTRIB_AMOUNT_DECIMAL_PLACES)
+    # upper bound of a range quantity, e.g. '1-2', null if not a range
+    amount_upper = models.DecimalField(
+        _('amount upper bound'), null=True, blank=True,
+        max_digits=RECIPE_INGREDIENT_ATTRIB_AMOUNT_MAX_DIGITS,
+        decimal_places=RECIPE_INGREDIENT_ATTRIB_AMOUNT_DECIMAL_PLACES)
 
     @dataclass
     class Meta:
@@ -502,6 +585,57 @@ class RecipeIngredient(ModelMixin, models.Model):
     def __str__(self):
         return f'{self.index} {self.ingredient.name} - {self.recipe.name}'
 
+    def save(self, *args, **kwargs):
+        """
+        Save this recipe ingredient, updating the amount from the quantity
+        :param args: positional arguments for `Model.save()`
+        :param kwargs: keyword arguments for `Model.save()`
+        """
+        self.set_amount()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and QUANTITY_FIELD in update_fields:
+            kwargs['update_fields'] = {
+                *update_fields, AMOUNT_FIELD, AMOUNT_UPPER_FIELD
+            }
+        super().save(*args, **kwargs)
+
+    def set_amount(self) -> bool:
+        """
+        Set the amount and upper bound from the quantity
+        :return: True if changed
+        """
+        amount, upper = RecipeIngredient.parse_amount(self.quantity)
+        changed = amount != self.amount or upper != self.amount_upper
+        self.amount, self.amount_upper = amount, upper
+        return changed
+
+    @staticmethod
+    def parse_amount(
+            quantity: str) -> Tuple[Optional[Decimal], Optional[Decimal]]:
+        """
+        Parse the amount and upper bound of a quantity
+        :param quantity: quantity to parse
+        :return: tuple of amount and upper bound, amount is None if the
+                quantity is not numeric and upper bound is None if the
+                quantity is not a range
+        """
+        parsed = parse_quantity(quantity)
+        if parsed is None:
+            return None, None
+        places = Decimal(1).scaleb(
+            -RecipeIngredient.RECIPE_INGREDIENT_ATTRIB_AMOUNT_DECIMAL_PLACES)
+        limit = Decimal(10) ** (
+            RecipeIngredient.RECIPE_INGREDIENT_ATTRIB_AMOUNT_MAX_DIGITS -
+            RecipeIngredient.RECIPE_INGREDIENT_ATTRIB_AMOUNT_DECIMAL_PLACES)
+        amounts = [
+            None if value is None else value.quantize(places)
+            for value in parsed
+        ]
+        if any(value is not None and value >= limit for value in amounts):
+            # too large to store, so not a sensible quantity
+            return None, None
+        return amounts[0], amounts[1]
+
 
 class Image(ModelMixin, models.Model):
     """
@@ -527,6 +661,36 @@ class Image(ModelMixin, models.Model):
         return f'{self.text}'
 
 
+class SimilarRecipe(ModelMixin, models.Model):
+    """
+    Similar recipe model, the most similar recipes of each recipe
+    precomputed by the 'similar_recipes' management command
+    """
+    # field names
+    RECIPE_FIELD = RECIPE_FIELD
+    SIMILAR_FIELD = SIMILAR_FIELD
+    SCORE_FIELD = SCORE_FIELD
+
+    recipe = models.ForeignKey(Recipe, on_delete=models.CASCADE)
+
+    similar = models.ForeignKey(
+        Recipe, on_delete=models.CASCADE, related_name='+')
+
+    score = models.FloatField(_('similarity score'), default=0)
+
+    @dataclass
+    class Meta:
+        """ Model metadata """
+        indexes = [
+            # most similar recipes of a recipe
+            models.Index(fields=[RECIPE_FIELD, f'-{SCORE_FIELD}'],
+                         name='similar_recipe_score_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.recipe_id} {self.similar_id} {self.score}'
+
+
 @Field.register_lookup
 class INotSimilarTo(Lookup):
     """
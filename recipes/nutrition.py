@@ -0,0 +1,195 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from datetime import datetime, timedelta
+from itertools import chain
+from typing import List, Optional, Tuple, TypeVar
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone as django_timezone
+
+from utils import RANGE_OPERATORS, TableVersionedValue
+
+from .models import Recipe
+
+# workaround for self type hints from https://peps.python.org/pep-0673/
+TypeNutritionMatrix = TypeVar("TypeNutritionMatrix", bound="NutritionMatrix")
+
+# writes to these tables make the matrix stale
+MATRIX_TABLES = [Recipe]
+MATRIX_CHUNK_SIZE = 10000
+# allowance for recipes saved in transactions which were in progress when
+# the matrix was last refreshed
+REFRESH_MARGIN = timedelta(minutes=1)
+
+# range of a nutrition field; tuple of field, operator and value
+NutritionRange = Tuple[str, str, float]
+
+
+class NutritionMatrix:
+    """
+    In-memory matrix of the nutritional values of all recipes, one row per
+    recipe and one column per nutritional field, used to evaluate range
+    filters on multiple fields in a single vectorised pass.
+    """
+    recipe_ids: np.ndarray
+    """ Ids of recipes, one per row, in ascending order """
+    values: np.ndarray
+    """ Nutritional values, one column per field """
+    fields: List[str]
+    """ Names of the fields of the columns """
+    category_ids: np.ndarray
+    """ Ids of the categories of the recipes, one per row """
+    timestamp: Optional[datetime]
+    """ Time the matrix was read from the database """
+
+    def __init__(self, recipe_ids: np.ndarray, values: np.ndarray,
+                 fields: List[str], category_ids: np.ndarray = None,
+                 timestamp: datetime = None):
+        self.recipe_ids = recipe_ids
+        self.values = values
+        self.fields = fields
+        self.category_ids = category_ids if category_ids is not None else \
+            np.zeros(len(recipe_ids), dtype=np.int64)
+        self.timestamp = timestamp
+
+    @classmethod
+    def _read(cls, **lookups) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Read recipes from the database
+        :param lookups: lookups to filter recipes
+        :return: tuple of recipe ids, nutritional values and category ids
+        """
+        fields = Recipe.nutritional_fields()
+        rows = np.fromiter(
+            chain.from_iterable(
+                Recipe.objects.filter(**lookups).order_by(
+                    Recipe.id_field()
+                ).values_list(
+                    Recipe.id_field(), f'{Recipe.CATEGORY_FIELD}_id',
+                    *fields
+                ).iterator(chunk_size=MATRIX_CHUNK_SIZE)
+            ), dtype=np.float64
+        ).reshape(-1, len(fields) + 2)
+
+        # float64 as the database values are double precision, so
+        # comparisons give the same results as the database
+        return rows[:, 0].astype(np.int64), rows[:, 2:].copy(), \
+            rows[:, 1].astype(np.int64)
+
+    @classmethod
+    def build(cls) -> TypeNutritionMatrix:
+        """
+        Build the matrix from the database
+        :return: new matrix
+        """
+        timestamp = django_timezone.now()
+        recipe_ids, values, category_ids = cls._read()
+        return cls(recipe_ids, values, Recipe.nutritional_fields(),
+                   category_ids=category_ids, timestamp=timestamp)
+
+    def refresh(self) -> TypeNutritionMatrix:
+        """
+        Refresh the matrix from the database. Only the recipes updated since
+        the matrix was read are read, see Recipe.updated, and deleted recipes
+        are removed.
+        :return: refreshed matrix
+        """
+        if self.timestamp is None:
+            return self.build()
+
+        timestamp = django_timezone.now()
+        current_ids = np.fromiter(
+            Recipe.objects.order_by(Recipe.id_field()).values_list(
+                Recipe.id_field(), flat=True
+            ).iterator(chunk_size=MATRIX_CHUNK_SIZE), dtype=np.int64)
+        recipe_ids, values, category_ids = self._read(**{
+            f'{Recipe.UPDATED_FIELD}__gte': self.timestamp - REFRESH_MARGIN
+        })
+
+        # keep rows of recipes which still exist and were not updated
+        keep = np.isin(self.recipe_ids, current_ids) & \
+            ~np.isin(self.recipe_ids, recipe_ids)
+        recipe_ids = np.concatenate([self.recipe_ids[keep], recipe_ids])
+        order = np.argsort(recipe_ids, kind='stable')
+        return NutritionMatrix(
+            recipe_ids[order],
+            np.concatenate([self.values[keep], values])[order],
+            self.fields,
+            category_ids=np.concatenate(
+                [self.category_ids[keep], category_ids])[order],
+            timestamp=timestamp)
+
+    @property
+    def size(self) -> int:
+        """ Number of recipes in the matrix """
+        return len(self.recipe_ids)
+
+    def filter(self, ranges: List[NutritionRange]) -> List[int]:
+        """
+        Get the recipes satisfying all the specified ranges
+        :param ranges: list of ranges
+        :return: list of ids of recipes in ascending order
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for field, op, value in ranges:
+            mask &= RANGE_OPERATORS[op][1](
+                self.values[:, self.fields.index(field)], value)
+        return self.recipe_ids[mask].tolist()
+
+
+_matrix = TableVersionedValue(
+    NutritionMatrix.build, MATRIX_TABLES,
+    min_age=lambda: settings.NUTRITION_MATRIX_MIN_AGE,
+    updater=NutritionMatrix.refresh,
+    background=lambda: settings.BACKGROUND_INDEX_REBUILD)
+
+
+def nutrition_matrix() -> NutritionMatrix:
+    """
+    Get the nutrition matrix, refreshing it if required
+    :return: matrix
+    """
+    return _matrix.get()
+
+
+def warm_nutrition_matrix():
+    """ Build the nutrition matrix in the background, e.g. at startup """
+    _matrix.warm()
+
+
+def filter_recipes_by_nutrition(
+        ranges: List[NutritionRange]) -> Optional[List[int]]:
+    """
+    Get the recipes satisfying all the specified ranges, if the nutrition
+    matrix is current. The matrix is rebuilt if the recipe table has been
+    written to since it was built, and it is older than
+    settings.NUTRITION_MATRIX_MIN_AGE seconds. If
+    settings.BACKGROUND_INDEX_REBUILD is set, the matrix is rebuilt in the
+    background and None is returned in the meantime.
+    :param ranges: list of ranges
+    :return: list of recipe ids in ascending order, or None if the matrix
+            is not current
+    """
+    matrix = _matrix.get(current_only=True)
+    return matrix.filter(ranges) if matrix is not None else None
@@ -0,0 +1,249 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+import os
+from typing import Dict, Iterable, List, Tuple, TypeVar
+
+import numpy as np
+from django.conf import settings
+
+from utils import TableVersionedValue, bump_table_version
+
+from .models import Recipe
+from .nutrition import MATRIX_TABLES, NutritionMatrix, nutrition_matrix
+
+# workaround for self type hints from https://peps.python.org/pep-0673/
+TypeNutritionIndex = TypeVar("TypeNutritionIndex", bound="NutritionIndex")
+
+DEFAULT_K = 6
+# max number of distances computed at a time, bounds the memory used by a
+# batch of queries
+DISTANCE_CHUNK_SIZE = 4_000_000
+
+# index file names
+IDS_FILE = 'recipe_ids.npy'
+VECTORS_FILE = 'vectors.npy'
+STATS_FILE = 'stats.npy'
+# version name of the saved index, bumped when the index is saved
+SAVED_INDEX_VERSION = 'nutrition_index'
+
+# (similar recipe id, distance)
+NutritionNeighbour = Tuple[int, float]
+
+
+class NutritionIndex:
+    """
+    Index of standardised nutrition vectors for k-nearest-neighbour lookups
+    of recipes with similar nutrition profiles. Values are log-scaled, as
+    nutritional values are heavily skewed, and standardised so each field
+    contributes equally to the distance between recipes.
+    """
+    recipe_ids: np.ndarray
+    """ Ids of recipes, one per row, in ascending order """
+    vectors: np.ndarray
+    """ Standardised float32 nutrition vectors, one per row """
+    mean: np.ndarray
+    """ Mean of each log-scaled field """
+    std: np.ndarray
+    """ Standard deviation of each log-scaled field """
+
+    def __init__(self, recipe_ids: np.ndarray, vectors: np.ndarray,
+                 mean: np.ndarray, std: np.ndarray):
+        self.recipe_ids = recipe_ids
+        self.vectors = vectors
+        self.mean = mean
+        self.std = std
+        # squared norms for the expansion of the squared distances
+        self._norms = np.einsum(
+            'ij,ij->i', vectors, vectors, dtype=np.float32)
+
+    @classmethod
+    def from_matrix(cls, matrix: NutritionMatrix) -> TypeNutritionIndex:
+        """
+        Build the index from a nutrition matrix
+        :param matrix: matrix to build from
+        :return: new index
+        """
+        # recipes without nutritional info have no profile
+        valid = matrix.values[
+            :, matrix.fields.index(Recipe.CALORIES_FIELD)] > 0
+        scaled = np.log1p(np.maximum(matrix.values[valid], 0))
+        mean = scaled.mean(axis=0) if len(scaled) else \
+            np.zeros(len(matrix.fields))
+        std = scaled.std(axis=0) if len(scaled) else \
+            np.ones(len(matrix.fields))
+        # constant fields don't distinguish recipes
+        std[std == 0] = 1
+        vectors = ((scaled - mean) / std).astype(np.float32)
+        return cls(matrix.recipe_ids[valid].copy(), vectors, mean, std)
+
+    @property
+    def size(self) -> int:
+        """ Number of recipes in the index """
+        return len(self.recipe_ids)
+
+    def save(self, path: str):
+        """
+        Save the index to a directory
+        :param path: path of directory
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, IDS_FILE), self.recipe_ids)
+        np.save(os.path.join(path, VECTORS_FILE), self.vectors)
+        np.save(os.path.join(path, STATS_FILE),
+                np.stack([self.mean, self.std]))
+        # processes sharing the cache reload the saved index
+        bump_table_version(SAVED_INDEX_VERSION)
+
+    @classmethod
+    def load(cls, path: str) -> TypeNutritionIndex:
+        """
+        Load an index saved to a directory; the vectors are memory-mapped
+        :param path: path of directory
+        :return: index
+        """
+        mean, std = np.load(os.path.join(path, STATS_FILE))
+        return cls(np.load(os.path.join(path, IDS_FILE)),
+                   np.load(os.path.join(path, VECTORS_FILE), mmap_mode='r'),
+                   mean, std)
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        """
+        Check if an index has been saved to a directory
+        :param path: path of directory
+        :return: True if saved
+        """
+        return all(
+            os.path.isfile(os.path.join(path, name))
+            for name in [IDS_FILE, VECTORS_FILE, STATS_FILE])
+
+    def neighbours(self, recipe_ids: Iterable[int], k: int = DEFAULT_K
+                   ) -> Dict[int, List[NutritionNeighbour]]:
+        """
+        Get the recipes with the most similar nutrition profiles of a batch
+        of recipes. The distances of the batch are computed together, in
+        chunks of recipes.
+        :param recipe_ids: ids of recipes to get neighbours of
+        :param k: number of neighbours per recipe; default DEFAULT_K
+        :return: lists of similar recipe ids and distances, nearest first,
+                by recipe id; recipes not in the index are omitted
+        """
+        recipe_ids = np.asarray(list(recipe_ids), dtype=np.int64)
+        rows = np.searchsorted(self.recipe_ids, recipe_ids)
+        rows = np.minimum(rows, max(self.size - 1, 0))
+        found = self.recipe_ids[rows] == recipe_ids \
+            if self.size else np.zeros(len(recipe_ids), dtype=bool)
+        recipe_ids, rows = recipe_ids[found], rows[found]
+        if not len(rows) or self.size < 2:
+            return {}
+
+        queries = np.asarray(self.vectors[rows])
+        query_norms = self._norms[rows]
+        k = min(k, self.size - 1)
+        chunk = max(DISTANCE_CHUNK_SIZE // len(rows), k + 1)
+
+        # best k + 1 candidates from each chunk, as the recipe itself is
+        # one of the nearest
+        best_rows = []
+        best_dists = []
+        for start in range(0, self.size, chunk):
+            vectors = np.asarray(self.vectors[start:start + chunk])
+            # squared distances; |q|^2 + |v|^2 - 2 q.v
+            dists = query_norms[:, None] + self._norms[start:start + chunk] \
+                - 2 * (queries @ vectors.T)
+            count = min(k + 1, dists.shape[1])
+            part = np.argpartition(dists, count - 1, axis=1)[:, :count] \
+                if count < dists.shape[1] else \
+                np.broadcast_to(np.arange(dists.shape[1]), dists.shape)
+            best_rows.append(part + start)
+            best_dists.append(np.take_along_axis(dists, part, axis=1))
+        best_rows = np.concatenate(best_rows, axis=1)
+        best_dists = np.concatenate(best_dists, axis=1)
+        # exclude the recipe itself
+        best_dists[best_rows == rows[:, None]] = np.inf
+
+        order = np.argsort(best_dists, axis=1, kind='stable')[:, :k]
+        result = {}
+        for recipe_id, row_order, cand_rows, cand_dists in zip(
+                recipe_ids, order, best_rows, best_dists):
+            result[int(recipe_id)] = [
+                (int(self.recipe_ids[cand_rows[idx]]),
+                 float(np.sqrt(max(cand_dists[idx], 0))))
+                for idx in row_order if np.isfinite(cand_dists[idx])
+            ]
+        return result
+
+
+# in-memory index, rebuilt following changes to recipes, at most once per
+# min age
+_index = TableVersionedValue(
+    lambda: NutritionIndex.from_matrix(nutrition_matrix()), MATRIX_TABLES,
+    min_age=lambda: settings.NUTRITION_MATRIX_MIN_AGE,
+    background=lambda: settings.BACKGROUND_INDEX_REBUILD)
+
+# index saved by the 'nutrition_index' management command; only reloaded
+# when the command saves the index again, not following changes to recipes
+_saved_index = TableVersionedValue(
+    lambda: NutritionIndex.load(settings.NUTRITION_INDEX_PATH),
+    [SAVED_INDEX_VERSION],
+    background=lambda: settings.BACKGROUND_INDEX_REBUILD)
+
+
+def _current_index() -> TableVersionedValue:
+    """
+    Get the index to use; the index saved by the 'nutrition_index'
+    management command if there is one, otherwise the in-memory index
+    :return: index value
+    """
+    path = settings.NUTRITION_INDEX_PATH
+    return _saved_index if path and NutritionIndex.exists(path) else _index
+
+
+def nutrition_index() -> NutritionIndex:
+    """
+    Get the nutrition index. The in-memory index is rebuilt if recipes have
+    been written to since it was built, and it is older than
+    settings.NUTRITION_MATRIX_MIN_AGE seconds. A saved index only includes
+    the recipes at the time it was saved, so the 'nutrition_index' command
+    should be rerun on a schedule. If settings.BACKGROUND_INDEX_REBUILD is
+    set, the index is rebuilt in the background and the stale index is
+    returned in the meantime.
+    :return: index
+    """
+    return _current_index().get()
+
+
+def warm_nutrition_index():
+    """ Build the nutrition index in the background, e.g. at startup """
+    _current_index().warm()
+
+
+def similar_nutrition(pk: int, k: int = DEFAULT_K
+                      ) -> List[NutritionNeighbour]:
+    """
+    Get the recipes with the most similar nutrition profiles to a recipe
+    :param pk: id of recipe
+    :param k: number of recipes; default DEFAULT_K
+    :return: list of similar recipe ids and distances, nearest first
+    """
+    return nutrition_index().neighbours([pk], k=k).get(pk, [])
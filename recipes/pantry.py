@@ -0,0 +1,164 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+import time
+from itertools import chain
+from typing import Iterable, List, Optional, TypeVar
+
+import numpy as np
+from django.conf import settings
+
+from utils import table_versions, TableVersionedValue
+
+from .models import RecipeIngredient, Recipe
+
+# workaround for self type hints from https://peps.python.org/pep-0673/
+TypePantryIndex = TypeVar("TypePantryIndex", bound="PantryIndex")
+
+# writes to these tables make the index stale
+INDEX_TABLES = [RecipeIngredient, Recipe]
+INDEX_CHUNK_SIZE = 10000
+
+
+class PantryIndex:
+    """
+    In-memory index of the ingredients of each recipe, in compressed sparse
+    row form, used to rank recipes by the coverage of their ingredients by
+    a set of available ingredients.
+    """
+    recipe_ids: np.ndarray
+    """ Ids of recipes, one per row """
+    row_starts: np.ndarray
+    """ Index in `ingredient_ids` of the first ingredient of each row """
+    ingredient_ids: np.ndarray
+    """ Ingredient ids of each recipe ingredient, grouped by row """
+    totals: np.ndarray
+    """ Number of ingredients of each row """
+    version: str
+    """ Version of the tables the index was built from """
+    built: float
+    """ Time the index was built """
+
+    def __init__(self, recipe_ids: np.ndarray, row_starts: np.ndarray,
+                 ingredient_ids: np.ndarray, version: str):
+        self.recipe_ids = recipe_ids
+        self.row_starts = row_starts
+        self.ingredient_ids = ingredient_ids
+        self.totals = np.diff(
+            np.append(row_starts, len(ingredient_ids)))
+        self.version = version
+        self.built = time.monotonic()
+
+    @classmethod
+    def build(cls) -> TypePantryIndex:
+        """
+        Build the index from the database
+        :return: new index
+        """
+        version = table_versions(INDEX_TABLES)
+        pairs = np.fromiter(
+            chain.from_iterable(
+                RecipeIngredient.objects.order_by(
+                    RecipeIngredient.RECIPE_FIELD
+                ).values_list(
+                    f'{RecipeIngredient.RECIPE_FIELD}_id',
+                    f'{RecipeIngredient.INGREDIENT_FIELD}_id'
+                ).iterator(chunk_size=INDEX_CHUNK_SIZE)
+            ), dtype=np.int64
+        ).reshape(-1, 2)
+
+        recipe_ids, row_starts = np.unique(pairs[:, 0], return_index=True)
+        return cls(recipe_ids, row_starts, pairs[:, 1].copy(), version)
+
+    @property
+    def size(self) -> int:
+        """ Number of recipes in the index """
+        return len(self.recipe_ids)
+
+    def rank(self, ingredient_ids: Iterable[int],
+             limit: Optional[int] = None) -> List[int]:
+        """
+        Rank recipes by the fraction of their ingredients covered by the
+        specified ingredients, then by the number of missing ingredients
+        :param ingredient_ids: ids of available ingredients
+        :param limit: max number of results; default all
+        :return: list of ids of recipes using at least one of the
+                ingredients, in rank order
+        """
+        available = np.fromiter(ingredient_ids, dtype=np.int64)
+        if self.size == 0 or len(available) == 0:
+            return []
+
+        # lookup table of available ingredients
+        max_id = max(int(self.ingredient_ids.max()), int(available.max()))
+        have = np.zeros(max_id + 1, dtype=np.int32)
+        have[available] = 1
+
+        # number of ingredients covered per recipe
+        covered = np.add.reduceat(have[self.ingredient_ids], self.row_starts)
+
+        candidates = np.flatnonzero(covered)
+        covered = covered[candidates]
+        totals = self.totals[candidates]
+        missing = totals - covered
+        coverage = covered / totals
+        # lexsort uses the last key as the primary key
+        order = np.lexsort(
+            (self.recipe_ids[candidates], missing, -coverage))
+        if limit is not None:
+            order = order[:limit]
+        return self.recipe_ids[candidates[order]].tolist()
+
+
+_index = TableVersionedValue(
+    PantryIndex.build, INDEX_TABLES,
+    min_age=lambda: settings.PANTRY_INDEX_MIN_AGE,
+    background=lambda: settings.BACKGROUND_INDEX_REBUILD)
+
+
+def get_pantry_index() -> PantryIndex:
+    """
+    Get the pantry index. The index is rebuilt if the recipe ingredient
+    tables have been written to since it was built, and it is older than
+    settings.PANTRY_INDEX_MIN_AGE seconds. If
+    settings.BACKGROUND_INDEX_REBUILD is set, the index is rebuilt in the
+    background and the stale index is returned in the meantime.
+    :return: index
+    """
+    return _index.get()
+
+
+def warm_pantry_index():
+    """ Build the pantry index in the background, e.g. at startup """
+    _index.warm()
+
+
+def rank_recipes_by_pantry(
+        ingredient_ids: Iterable[int], limit: int = None) -> List[int]:
+    """
+    Rank recipes by the coverage of their ingredients by the specified
+    ingredients
+    :param ingredient_ids: ids of available ingredients
+    :param limit: max number of results; default all
+    :return: list of recipe ids in rank order
+    """
+    return get_pantry_index().rank(ingredient_ids, limit=limit)
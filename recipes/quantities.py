@@ -0,0 +1,179 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+import re
+import unicodedata
+from collections import namedtuple
+from decimal import Decimal
+from fractions import Fraction
+from functools import lru_cache
+from typing import Optional
+
+# parsed quantity; amount and optional upper bound of a range
+ParsedQuantity = namedtuple('ParsedQuantity', ['amount', 'upper'])
+
+# unicode vulgar fractions, e.g. '½'
+VULGAR_FRACTIONS = ''.join(
+    chr(code) for code in range(0x00BC, 0x00BF)) + ''.join(
+    chr(code) for code in range(0x2150, 0x215F))
+
+# number; whole, decimal or fraction, e.g. '1', '1.5', '1/2', '1 1/2', '1½'
+_NUMBER = (
+    rf'(?:\d+\s*[{VULGAR_FRACTIONS}]|[{VULGAR_FRACTIONS}]|'
+    r'\d+\s+\d+\s*[/⁄]\s*\d+|\d+\s*[/⁄]\s*\d+|\d*\.\d+|\d+)'
+)
+QUANTITY_REGEX = re.compile(
+    rf'^\s*({_NUMBER})(?:\s*(?:-|–|—|to)\s*({_NUMBER}))?\s*$',
+    re.IGNORECASE)
+FRACTION_SLASH_REGEX = re.compile(r'\s*[/⁄]\s*')
+
+# denominators of fractions used to display quantities
+DISPLAY_DENOMINATORS = [2, 3, 4, 8]
+FRACTION_TOLERANCE = Decimal('0.02')
+DISPLAY_PLACES = Decimal('0.01')
+MIN_DISPLAY_PLACES = Decimal('0.001')
+
+QUANTITY_CACHE_SIZE = 1024
+
+
+def _fraction(numerator: int, denominator: int) -> Decimal:
+    """
+    Convert a fraction
+    :param numerator: numerator
+    :param denominator: denominator
+    :return: number
+    """
+    return Decimal(numerator) / Decimal(denominator)
+
+
+def _number(text: str) -> Optional[Decimal]:
+    """
+    Convert a number matched by QUANTITY_REGEX
+    :param text: text to convert
+    :return: number or None if invalid
+    """
+    value = Decimal(0)
+    text = text.strip()
+    if text[-1] in VULGAR_FRACTIONS:
+        fraction = Fraction(
+            unicodedata.numeric(text[-1])).limit_denominator(10)
+        value = _fraction(fraction.numerator, fraction.denominator)
+        text = text[:-1].strip()
+        if not text:
+            return value
+
+    # allow for spaces around the slash
+    parts = FRACTION_SLASH_REGEX.sub('/', text).split()
+    if len(parts) == 2:
+        # mixed number, e.g. '1 1/2'
+        value += Decimal(parts[0])
+    text = parts[-1]
+    if '/' in text:
+        numerator, denominator = text.split('/')
+        if int(denominator) == 0:
+            return None
+        value += _fraction(int(numerator), int(denominator))
+    else:
+        value += Decimal(text)
+    return value
+
+
+@lru_cache(maxsize=QUANTITY_CACHE_SIZE)
+def parse_quantity(text: str) -> Optional[ParsedQuantity]:
+    """
+    Parse a quantity, e.g. '2', '1.5', '1/2', '1 1/2', '½' or a range such as
+    '1-2' or '2 to 3'
+    Note: quantities repeat a lot, so results are cached
+    :param text: text to parse
+    :return: parsed quantity, or None if `text` is not a quantity
+    """
+    match = QUANTITY_REGEX.match(text) if text else None
+    if not match:
+        return None
+    amount = _number(match.group(1))
+    upper = _number(match.group(2)) if match.group(2) else None
+    if amount is None or (match.group(2) and upper is None):
+        return None
+    if upper is not None:
+        if upper < amount:
+            return None
+        if upper == amount:
+            upper = None
+    return ParsedQuantity(amount, upper)
+
+
+def stored_quantity(text: str, amount: Optional[Decimal],
+                    upper: Optional[Decimal]) -> Optional[ParsedQuantity]:
+    """
+    Get a quantity from its stored amount and upper bound, parsing the text
+    only if no amount is stored, e.g. rows which have not been backfilled
+    :param text: text of quantity
+    :param amount: stored amount, or lower bound of range
+    :param upper: stored upper bound of range
+    :return: quantity, or None if `text` is not a quantity
+    """
+    return parse_quantity(text) if amount is None \
+        else ParsedQuantity(amount, upper)
+
+
+def format_amount(amount: Decimal, fractions: bool = True) -> str:
+    """
+    Format an amount for display
+    :param amount: amount to format
+    :param fractions: display as fraction if close to a common fraction;
+                default True
+    :return: formatted amount
+    """
+    if fractions:
+        whole = int(amount)
+        remainder = amount - whole
+        for denominator in DISPLAY_DENOMINATORS:
+            numerator = round(remainder * denominator)
+            if 0 < numerator < denominator and abs(
+                    remainder - Decimal(numerator) / denominator
+            ) <= FRACTION_TOLERANCE:
+                fraction = Fraction(numerator, denominator)
+                text = f'{fraction.numerator}/{fraction.denominator}'
+                return f'{whole} {text}' if whole else text
+
+    places = DISPLAY_PLACES
+    if amount and not amount.quantize(places):
+        # small amount, display more places rather than 0
+        places = MIN_DISPLAY_PLACES
+    text = f'{amount.quantize(places):f}'
+    if '.' in text:
+        text = text.rstrip('0').rstrip('.')
+    return text if text != '-0' else '0'
+
+
+def format_quantity(quantity: ParsedQuantity, fractions: bool = True) -> str:
+    """
+    Format a quantity for display
+    :param quantity: quantity to format
+    :param fractions: display as fraction if close to a common fraction;
+                default True
+    :return: formatted quantity
+    """
+    text = format_amount(quantity.amount, fractions=fractions)
+    if quantity.upper is not None:
+        text = f'{text}-{format_amount(quantity.upper, fractions=fractions)}'
+    return text
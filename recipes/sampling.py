@@ -0,0 +1,125 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from random import choice, sample
+from typing import Dict, List, Optional, Tuple, TypeVar
+
+from django.conf import settings
+
+from utils import TableVersionedValue
+
+from .models import Recipe, Category, Keyword
+
+# workaround for self type hints from https://peps.python.org/pep-0673/
+TypeSamplePool = TypeVar("TypeSamplePool", bound="SamplePool")
+
+# terms used to select the recipes featured on the home page
+FEATURED_TERMS = [
+    'chicken', 'beef', 'tuna', 'vegan'
+]
+
+# writes to these tables make the pools stale
+POOL_TABLES = [Recipe, Category, Keyword]
+
+
+class SamplePool:
+    """
+    In-memory pools of the ids of the recipes matching each featured term,
+    used to pick random recipes without querying for matches.
+    """
+    pools: Dict[str, List[int]]
+    """ Ids of matching recipes, by term; only terms with matches """
+    terms: List[str]
+    """ Terms with matches """
+
+    def __init__(self, pools: Dict[str, List[int]]):
+        """
+        Initialise object
+        :param pools: dict of term and list of ids of matching recipes
+        """
+        self.pools = {term: ids for term, ids in pools.items() if ids}
+        self.terms = list(self.pools.keys())
+
+    @classmethod
+    def build(cls, terms: List[str] = None) -> TypeSamplePool:
+        """
+        Build the pools from the database; a recipe matches a term if both
+        its category and one of its keywords contain the term
+        :param terms: terms to build pools for; default FEATURED_TERMS
+        :return: new pools
+        """
+        if terms is None:
+            terms = FEATURED_TERMS
+        return cls({
+            term: list(
+                Recipe.objects.filter(**{
+                    f'{Recipe.CATEGORY_FIELD}__{Category.NAME_FIELD}'
+                    f'__icontains': term,
+                    f'{Recipe.KEYWORDS_FIELD}__{Keyword.NAME_FIELD}'
+                    f'__icontains': term,
+                }).order_by(Recipe.id_field()).values_list(
+                    Recipe.id_field(), flat=True).distinct()
+            ) for term in terms
+        })
+
+    @property
+    def is_empty(self) -> bool:
+        """ Check if there are no matching recipes for any term """
+        return not self.terms
+
+    def sample(self, count: int) -> Tuple[Optional[str], List[int]]:
+        """
+        Pick a random term with matches, and random recipes matching it
+        :param count: max number of recipes to pick
+        :return: tuple of term and list of ids of picked recipes, or None
+                and an empty list if there are no matches
+        """
+        if self.is_empty:
+            return None, []
+        term = choice(self.terms)
+        ids = self.pools[term]
+        return term, sample(ids, min(count, len(ids)))
+
+
+# rebuilt on next access following writes to the tables, at most once per
+# min age
+_pool = TableVersionedValue(
+    SamplePool.build, POOL_TABLES,
+    min_age=lambda: settings.RECIPE_SAMPLE_POOL_MIN_AGE,
+    background=lambda: settings.BACKGROUND_INDEX_REBUILD)
+
+
+def sample_recipes(count: int) -> Tuple[Optional[str], List[int]]:
+    """
+    Pick random recipes matching a random featured term. If
+    settings.BACKGROUND_INDEX_REBUILD is set, stale pools are rebuilt in the
+    background and the stale pools are used in the meantime.
+    :param count: max number of recipes to pick
+    :return: tuple of term and list of ids of picked recipes, or None and
+            an empty list if no recipes match any featured term
+    """
+    return _pool.get().sample(count)
+
+
+def warm_sample_pool():
+    """ Build the featured recipe pools in the background, e.g. at startup """
+    _pool.warm()
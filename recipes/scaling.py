@@ -0,0 +1,327 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from utils import cache_key, table_versions
+
+from .conversion import Measures, MeasureRegistry, convert_many, \
+    measure_registry
+from .models import Ingredient, Measure, Recipe, RecipeIngredient
+from .quantities import ParsedQuantity, format_quantity, stored_quantity
+
+# systems ingredients may be converted to
+SCALE_SYSTEMS = [Measure.SYSTEM_US, Measure.SYSTEM_METRIC]
+
+# writes to these tables change scaled ingredients, in addition to the
+# recipe itself, see Recipe.updated
+SCALE_TABLES = [Ingredient, Measure]
+
+# step in a promotion ladder; measure and min amount of it to promote to it
+LadderStep = Tuple[Measures, Decimal]
+
+# promotion ladders by measure type and system, in ascending order of size;
+# a scaled amount is displayed in the largest measure of which there is at
+# least the min amount, e.g. 6 tsp. is displayed as 2 tbsp.
+PROMOTION_LADDERS: Dict[Tuple[str, str], List[LadderStep]] = {
+    (Measure.DRY_FLUID, Measure.SYSTEM_US): [
+        (Measures.TEASPOON, Decimal(0)),
+        (Measures.TABLESPOON, Decimal(1)),
+        (Measures.CUP, Decimal('0.25')),
+    ],
+    (Measure.DRY_FLUID, Measure.SYSTEM_METRIC): [
+        (Measures.MILLILITRE, Decimal(0)),
+        (Measures.LITRE, Decimal(1)),
+    ],
+    (Measure.WEIGHT, Measure.SYSTEM_US): [
+        (Measures.OUNCE, Decimal(0)),
+        (Measures.POUND, Decimal(1)),
+    ],
+    (Measure.WEIGHT, Measure.SYSTEM_METRIC): [
+        (Measures.GRAM, Decimal(0)),
+        (Measures.KILOGRAM, Decimal(1)),
+    ],
+}
+LADDER_MEASURES = {
+    step: ladder for ladder in PROMOTION_LADDERS.values()
+    for step, _ in ladder
+}
+
+SCALE_PLACES = 3
+
+
+@dataclass
+class ScaledIngredient:
+    """ Recipe ingredient scaled to a number of servings """
+    id: int
+    """ Id of recipe ingredient """
+    ingredient: str
+    """ Name of ingredient """
+    quantity: str
+    """ Display quantity """
+    measure: str
+    """ Abbreviation of measure """
+
+
+class ScaleError(ValueError):
+    """ Recipe can not be scaled as requested """
+
+
+def _ladder(measure: Measure, member: Measures,
+            system: Optional[str]) -> Optional[List[LadderStep]]:
+    """
+    Get the promotion ladder to display an amount of a measure in
+    :param measure: measure of amount
+    :param member: enum member of `measure`
+    :param system: required system or None to keep measure's system
+    :return: ladder or None if the amount's measure is kept
+    """
+    ladder = None
+    if measure.type != Measure.UNIT:
+        if system and system != measure.system:
+            ladder = PROMOTION_LADDERS.get((measure.type, system))
+        elif member in LADDER_MEASURES:
+            ladder = LADDER_MEASURES[member]
+    return ladder
+
+
+# amount to display; quantity, its measure and promotion ladder
+DisplayAmount = Tuple[ParsedQuantity, Optional[Measures],
+                      Optional[List[LadderStep]]]
+
+
+def promote_amounts(
+    amounts: List[DisplayAmount], registry: MeasureRegistry = None
+) -> List[Tuple[ParsedQuantity, Optional[Measures]]]:
+    """
+    Convert amounts to the measures they are displayed in. The amounts are
+    converted in two batches; firstly to the smallest measure of their
+    promotion ladders to select the measures they are displayed in, and
+    then to those measures.
+    :param amounts: amounts to convert
+    :param registry: measure registry; default current registry
+    :return: list of quantities and their measures, in the same order as
+            `amounts`
+    """
+    if registry is None:
+        registry = measure_registry()
+
+    to_base = []
+    for quantity, member, ladder in amounts:
+        if ladder and member is not None:
+            base = ladder[0][0]
+            to_base.append((quantity.amount, member, base))
+            # min amounts of ladder steps in base measure
+            to_base.extend([
+                (min_amount, step, base) for step, min_amount in ladder
+            ])
+
+    base_amounts = iter(convert_many(
+        to_base, quantised=True, places=SCALE_PLACES))
+
+    # select measures to display amounts in
+    targets = []
+    to_display = []
+    for quantity, member, ladder in amounts:
+        target = member
+        if ladder and member is not None:
+            amount = next(base_amounts)
+            for step, _ in ladder:
+                min_amount = next(base_amounts)
+                if amount is not None and min_amount is not None and \
+                        amount >= min_amount:
+                    target = step
+        if member is not None:
+            to_display.extend([
+                (amount, member, target) for amount in quantity
+                if amount is not None
+            ])
+        targets.append(target)
+
+    display_amounts = iter(convert_many(
+        to_display, quantised=True, places=SCALE_PLACES))
+
+    return [
+        (ParsedQuantity(*[
+            next(display_amounts) if amount is not None else None
+            for amount in quantity
+        ]) if target is not None else quantity, target)
+        for (quantity, _, _), target in zip(amounts, targets)
+    ]
+
+
+def display_quantity(quantity: ParsedQuantity, measure: Optional[Measure]
+                     ) -> str:
+    """
+    Format a quantity for display in its measure
+    :param quantity: quantity to format
+    :param measure: measure of quantity
+    :return: formatted quantity
+    """
+    return format_quantity(
+        quantity, fractions=measure is None or
+        measure.system != Measure.SYSTEM_METRIC)
+
+
+def scale_ingredients(
+    ingredients: Iterable[Tuple[int, str, str, int, Optional[Decimal],
+                                Optional[Decimal]]],
+    factor: Decimal, system: Optional[str] = None,
+    registry: MeasureRegistry = None
+) -> List[ScaledIngredient]:
+    """
+    Scale recipe ingredients
+    Note: quantities which are not numeric are not scaled. The stored
+          amounts of the quantities are used, the quantities are only
+          parsed if the amounts have not been stored.
+    :param ingredients: tuples of recipe ingredient id, ingredient name,
+                quantity, measure id, and stored amount and upper bound
+    :param factor: scaling factor
+    :param system: system to convert to, one of SCALE_SYSTEMS or None to
+                keep the measures' systems; default None
+    :param registry: measure registry; default current registry
+    :return: list of scaled ingredients
+    """
+    if registry is None:
+        registry = measure_registry()
+
+    result = []
+    scaled = []
+    amounts = []
+    for pk, name, quantity, measure_id, stored_amount, stored_upper \
+            in ingredients:
+        member = registry.by_id.get(measure_id)
+        measure = registry.measures.get(member)
+        ingredient = ScaledIngredient(
+            id=pk, ingredient=name, quantity=quantity,
+            measure=measure.abbrev if measure is not None else '')
+        result.append(ingredient)
+
+        parsed = stored_quantity(quantity, stored_amount, stored_upper)
+        if parsed is None:
+            continue    # not numeric, so unscaled
+        amounts.append((
+            ParsedQuantity(*[
+                amount * factor if amount is not None else None
+                for amount in parsed
+            ]),
+            member,
+            _ladder(measure, member, system) if measure is not None else None
+        ))
+        scaled.append(ingredient)
+
+    for ingredient, (quantity, target) in zip(
+            scaled, promote_amounts(amounts, registry=registry)):
+        measure = registry.measures.get(target)
+        if measure is not None:
+            ingredient.measure = measure.abbrev
+        ingredient.quantity = display_quantity(quantity, measure)
+
+    return result
+
+
+def parse_scale_args(servings: Optional[str], system: Optional[str]
+                     ) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Parse the scaling request arguments
+    :param servings: number of servings or None to keep recipe servings
+    :param system: system to convert to, or None to keep the measures'
+                systems
+    :return: tuple of servings and system
+    :raises ScaleError: if an argument is invalid
+    """
+    if servings:
+        try:
+            servings = int(servings)
+        except ValueError as exc:
+            raise ScaleError(f'Invalid servings: {servings}') from exc
+        if not 0 < servings <= settings.RECIPE_SCALE_MAX_SERVINGS:
+            raise ScaleError(
+                f'Servings must be between 1 and '
+                f'{settings.RECIPE_SCALE_MAX_SERVINGS}')
+    else:
+        servings = None
+    if system:
+        system = system.lower()
+        if system not in SCALE_SYSTEMS:
+            raise ScaleError(f'Invalid system: {system}')
+    else:
+        system = None
+    return servings, system
+
+
+def scale_recipe(pk: int, servings: Optional[int] = None,
+                 system: Optional[str] = None
+                 ) -> Optional[List[ScaledIngredient]]:
+    """
+    Get the ingredients of a recipe scaled to a number of servings. Results
+    are cached by recipe revision, so edits to the recipe are reflected
+    immediately.
+    :param pk: id of recipe
+    :param servings: number of servings or None to keep recipe servings;
+                default None
+    :param system: system to convert to, one of SCALE_SYSTEMS or None to
+                keep the measures' systems; default None
+    :return: list of scaled ingredients or None if recipe not found
+    :raises ScaleError: if the recipe has no servings to scale from
+    """
+    recipe = Recipe.objects.filter(
+        **Recipe.id_field_query(pk)
+    ).values_list(
+        Recipe.SERVINGS_FIELD, Recipe.UPDATED_FIELD
+    ).first()
+    if recipe is None:
+        return None
+
+    recipe_servings, revision = recipe
+    if servings is None or servings == recipe_servings:
+        factor = Decimal(1)
+    elif recipe_servings > 0:
+        factor = Decimal(servings) / Decimal(recipe_servings)
+    else:
+        raise ScaleError('Recipe servings not specified')
+
+    key = cache_key(
+        'recipe_scale', pk, revision.isoformat(), factor, system,
+        table_versions(SCALE_TABLES))
+    ingredients = cache.get(key)
+    if ingredients is None:
+        ingredients = scale_ingredients(
+            RecipeIngredient.objects.filter(**{
+                f'{RecipeIngredient.RECIPE_FIELD}_id': pk
+            }).order_by(RecipeIngredient.INDEX_FIELD).values_list(
+                RecipeIngredient.id_field(),
+                f'{RecipeIngredient.INGREDIENT_FIELD}__'
+                f'{Ingredient.NAME_FIELD}',
+                RecipeIngredient.QUANTITY_FIELD,
+                f'{RecipeIngredient.MEASURE_FIELD}_id',
+                RecipeIngredient.AMOUNT_FIELD,
+                RecipeIngredient.AMOUNT_UPPER_FIELD
+            ), factor, system=system)
+        cache.set(key, ingredients,
+                  timeout=settings.RECIPE_SCALE_CACHE_TIMEOUT)
+    return ingredients
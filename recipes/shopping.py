@@ -0,0 +1,209 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from .conversion import Measures, MeasureRegistry, convert_many, \
+    measure_registry
+from .models import Ingredient, Measure, RecipeIngredient
+from .quantities import ParsedQuantity, stored_quantity
+from .scaling import (
+    PROMOTION_LADDERS, SCALE_PLACES, display_quantity, promote_amounts
+)
+
+
+@dataclass
+class ShoppingItem:
+    """ Shopping list entry; total quantity of an ingredient """
+    ingredient: str
+    """ Name of ingredient """
+    quantity: str
+    """ Display quantity, or empty if no numeric quantity """
+    measure: str
+    """ Abbreviation of measure """
+    notes: List[str] = field(default_factory=list)
+    """ Quantities which are not numeric, e.g. 'to taste' """
+
+
+@dataclass
+class _Total:
+    """ Running total of an ingredient in a measure """
+    ingredient: str
+    """ Name of ingredient """
+    measure: Optional[Measures]
+    """ Measure of total """
+    ladder: Optional[list] = None
+    """ Promotion ladder of measure """
+    amount: Decimal = Decimal(0)
+    """ Total of amounts, or lower bounds of ranges """
+    upper: Decimal = Decimal(0)
+    """ Total of upper bounds of ranges """
+    is_range: bool = False
+    """ Total includes a range flag """
+    notes: List[str] = field(default_factory=list)
+    """ Quantities which are not numeric """
+
+    def add(self, amount: Decimal, upper: Optional[Decimal]):
+        """
+        Add an amount
+        :param amount: amount, or lower bound of range
+        :param upper: upper bound of range or None
+        """
+        self.amount += amount
+        self.upper += upper if upper is not None else amount
+        self.is_range = self.is_range or upper is not None
+
+    @property
+    def quantity(self) -> ParsedQuantity:
+        """ Total quantity """
+        return ParsedQuantity(
+            self.amount, self.upper if self.is_range else None)
+
+
+def aggregate_ingredients(
+    recipe_counts: Dict[int, int], registry: MeasureRegistry = None
+) -> List[ShoppingItem]:
+    """
+    Aggregate the ingredients of recipes into a shopping list. The
+    ingredients of all the recipes are fetched in one query, and amounts of
+    the same ingredient and measure type are converted to a common measure
+    in one batch and summed.
+    Note: quantities which are not numeric are listed as notes. The stored
+          amounts of the quantities are used, the quantities are only
+          parsed if the amounts have not been stored.
+    :param recipe_counts: number of each recipe, by recipe id
+    :param registry: measure registry; default current registry
+    :return: list of shopping items, ordered by ingredient name
+    """
+    if registry is None:
+        registry = measure_registry()
+
+    rows = RecipeIngredient.objects.filter(**{
+        f'{RecipeIngredient.RECIPE_FIELD}_id__in': list(recipe_counts)
+    }).order_by(
+        f'{RecipeIngredient.RECIPE_FIELD}_id', RecipeIngredient.INDEX_FIELD
+    ).values_list(
+        f'{RecipeIngredient.RECIPE_FIELD}_id',
+        f'{RecipeIngredient.INGREDIENT_FIELD}_id',
+        f'{RecipeIngredient.INGREDIENT_FIELD}__{Ingredient.NAME_FIELD}',
+        RecipeIngredient.QUANTITY_FIELD,
+        f'{RecipeIngredient.MEASURE_FIELD}_id',
+        RecipeIngredient.AMOUNT_FIELD, RecipeIngredient.AMOUNT_UPPER_FIELD
+    )
+
+    # totals by ingredient id and measure type (or measure for units)
+    totals: Dict[tuple, _Total] = {}
+    # quantities which are not numeric, by ingredient id
+    notes: Dict[int, _Total] = {}
+    pending = []        # totals awaiting conversion of amounts
+    to_convert = []
+    for recipe_id, ingredient_id, name, quantity, measure_id, \
+            stored_amount, stored_upper in rows:
+        count = recipe_counts[recipe_id]
+        member = registry.by_id.get(measure_id)
+        measure = registry.measures.get(member)
+        # no quantity, e.g. salt, is just a listing of the ingredient
+        note = ' '.join(filter(None, [
+            quantity, measure.abbrev if measure is not None else None
+        ])) if quantity.strip() else ''
+        parsed = stored_quantity(quantity, stored_amount, stored_upper)
+        if parsed is None or measure is None:
+            _add_note(notes, ingredient_id, name, note)
+            continue
+
+        amount = parsed.amount * count
+        upper = parsed.upper * count if parsed.upper is not None else None
+        if measure.type == Measure.UNIT:
+            # units are counted separately, a can is not a unit
+            totals.setdefault(
+                (ingredient_id, member), _Total(name, member)
+            ).add(amount, upper)
+            continue
+
+        key = (ingredient_id, measure.type)
+        total = totals.get(key)
+        if total is None:
+            # total in smallest measure of first amount's system
+            ladder = PROMOTION_LADDERS[(measure.type, measure.system)]
+            total = _Total(name, ladder[0][0], ladder=ladder)
+            totals[key] = total
+        pending.append((ingredient_id, total, upper is not None, note))
+        to_convert.append((amount, member, total.measure))
+        if upper is not None:
+            to_convert.append((upper, member, total.measure))
+
+    converted = iter(convert_many(
+        to_convert, quantised=True, places=SCALE_PLACES))
+    for ingredient_id, total, is_range, note in pending:
+        amount = next(converted)
+        upper = next(converted) if is_range else None
+        if amount is None or (is_range and upper is None):
+            # measure not convertible
+            _add_note(notes, ingredient_id, total.ingredient, note)
+        else:
+            total.add(amount, upper)
+
+    items = []
+    by_ingredient = {}
+    for (ingredient_id, _), total, (quantity, target) in zip(
+        totals, totals.values(),
+        promote_amounts([
+            (total.quantity, total.measure, total.ladder)
+            for total in totals.values()
+        ], registry=registry)
+    ):
+        if not total.amount and not total.upper:
+            continue    # all amounts not convertible
+        measure = registry.measures.get(target)
+        item = ShoppingItem(
+            ingredient=total.ingredient,
+            quantity=display_quantity(quantity, measure),
+            measure=measure.abbrev if measure is not None else '')
+        items.append(item)
+        by_ingredient.setdefault(ingredient_id, item)
+
+    # add notes to first item of ingredient
+    for ingredient_id, entry in notes.items():
+        item = by_ingredient.get(ingredient_id)
+        if item is None:
+            item = ShoppingItem(
+                ingredient=entry.ingredient, quantity='', measure='')
+            items.append(item)
+        item.notes.extend(entry.notes)
+
+    return sorted(items, key=lambda item: (item.ingredient, item.measure))
+
+
+def _add_note(notes: Dict[int, _Total], ingredient_id: int, name: str,
+              note: str):
+    """
+    Add a quantity which is not numeric to the notes of an ingredient
+    :param notes: notes by ingredient id
+    :param ingredient_id: id of ingredient
+    :param name: name of ingredient
+    :param note: note to add
+    """
+    entry = notes.setdefault(ingredient_id, _Total(name, None))
+    if note and note not in entry.notes:
+        entry.notes.append(note)
@@ -0,0 +1,116 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from django.db.models.signals import (
+    post_save, pre_delete, post_delete, m2m_changed
+)
+from django.dispatch import receiver
+
+from user.models import User
+
+from .models import Recipe, RecipeIngredient, Image, Instruction
+
+# attribute of a deleted instruction in which the ids of its recipes are held
+RECIPE_IDS_ATTR = '_recipe_ids'
+
+# many-to-many relations of a recipe which are part of its revision
+M2M_FIELDS = {
+    Recipe.keywords.through: Recipe.KEYWORDS_FIELD,
+    Recipe.instructions.through: Recipe.INSTRUCTIONS_FIELD,
+}
+
+
+@receiver(post_save, sender=RecipeIngredient)
+@receiver(post_delete, sender=RecipeIngredient)
+@receiver(post_save, sender=Image)
+@receiver(post_delete, sender=Image)
+def recipe_part_written_callback(sender, instance, **kwargs):
+    """
+    Process signal sent when a recipe ingredient or image is saved or
+    deleted; updates the revision stamp of the recipe
+    """
+    if isinstance(kwargs.get('origin', None), Recipe):
+        return  # deleted along with its recipe
+    Recipe.touch(pk=instance.recipe_id)
+
+
+@receiver(post_save, sender=Instruction)
+def instruction_saved_callback(sender, instance, created, **kwargs):
+    """
+    Process signal sent when an instruction is saved; updates the revision
+    stamp of the recipes it belongs to
+    """
+    if not created:
+        Recipe.touch(**{Recipe.INSTRUCTIONS_FIELD: instance})
+
+
+@receiver(pre_delete, sender=Instruction)
+def instruction_deleting_callback(sender, instance, **kwargs):
+    """
+    Process signal sent before an instruction is deleted; records the
+    recipes it belongs to, as the relation is deleted along with it
+    """
+    setattr(instance, RECIPE_IDS_ATTR, list(
+        instance.recipe_set.values_list(Recipe.id_field(), flat=True)))
+
+
+@receiver(post_delete, sender=Instruction)
+def instruction_deleted_callback(sender, instance, **kwargs):
+    """
+    Process signal sent when an instruction is deleted; updates the revision
+    stamp of the recipes it belonged to
+    """
+    recipe_ids = getattr(instance, RECIPE_IDS_ATTR, None)
+    if recipe_ids:
+        Recipe.touch(pk__in=recipe_ids)
+
+
+@receiver(m2m_changed, sender=Recipe.keywords.through)
+@receiver(m2m_changed, sender=Recipe.instructions.through)
+def recipe_m2m_changed_callback(
+        sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Process signal sent when the keywords or instructions of a recipe are
+    changed; updates the revision stamp of the affected recipes
+    """
+    if not reverse:
+        # instance is the recipe
+        if action in ['post_add', 'post_remove', 'post_clear']:
+            Recipe.touch(pk=instance.pk)
+    elif action in ['post_add', 'post_remove']:
+        # instance is the keyword/instruction, pk_set the recipe ids
+        Recipe.touch(pk__in=pk_set)
+    elif action == 'pre_clear':
+        # recipe ids are not available after the clear
+        Recipe.touch(**{M2M_FIELDS[sender]: instance})
+
+
+@receiver(post_save, sender=User)
+def author_saved_callback(sender, instance, created, update_fields=None,
+                          **kwargs):
+    """
+    Process signal sent when a user is saved; updates the revision stamp of
+    the user's recipes, as recipes display the author's username
+    """
+    if not created and (update_fields is None or
+                        User.USERNAME_FIELD in update_fields):
+        Recipe.touch(**{Recipe.AUTHOR_FIELD: instance})
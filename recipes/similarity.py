@@ -0,0 +1,341 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
+from typing import Iterator, List, Tuple, TypeVar
+
+import numpy as np
+
+from .models import Recipe, RecipeIngredient
+
+# workaround for self type hints from https://peps.python.org/pep-0673/
+TypeRecipeTokens = TypeVar("TypeRecipeTokens", bound="RecipeTokens")
+
+# hash functions are (a * x + b) mod HASH_PRIME; with a, b and x less than
+# 2^31, the intermediate results fit in 64 bits
+HASH_PRIME = (1 << 31) - 1
+
+DEFAULT_NUM_PERM = 128
+DEFAULT_BANDS = 32
+DEFAULT_TOP_K = 10
+DEFAULT_MIN_SCORE = 0.2
+DEFAULT_MAX_BUCKET = 1000
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_SEED = 1
+
+LOAD_CHUNK_SIZE = 10000
+
+# (recipe id or row index, similar recipe id or row index, score)
+Neighbour = Tuple[int, int, float]
+
+
+class RecipeTokens:
+    """
+    The keyword and ingredient tokens of each recipe, in compressed sparse
+    row form. Keyword and ingredient ids are mapped to distinct tokens,
+    keyword id to 2 * id and ingredient id to 2 * id + 1.
+    """
+    recipe_ids: np.ndarray
+    """ Ids of recipes, one per row """
+    row_starts: np.ndarray
+    """ Index in `tokens` of the first token of each row """
+    tokens: np.ndarray
+    """ Tokens of each recipe, grouped by row """
+
+    def __init__(self, recipe_ids: np.ndarray, row_starts: np.ndarray,
+                 tokens: np.ndarray):
+        self.recipe_ids = recipe_ids
+        self.row_starts = row_starts
+        self.tokens = tokens
+
+    @classmethod
+    def from_pairs(cls, pairs: np.ndarray) -> TypeRecipeTokens:
+        """
+        Generate from recipe id and token pairs
+        :param pairs: n x 2 array of recipe id and token
+        :return: new object
+        """
+        # sorts by recipe then token, and removes duplicates
+        pairs = np.unique(pairs.reshape(-1, 2), axis=0)
+        recipe_ids, row_starts = np.unique(pairs[:, 0], return_index=True)
+        return cls(recipe_ids, row_starts, pairs[:, 1])
+
+    @classmethod
+    def load(cls) -> TypeRecipeTokens:
+        """
+        Load the recipe keywords and ingredients from the database
+        :return: new object
+        """
+        keywords = Recipe.keywords.through.objects.values_list(
+            'recipe_id', 'keyword_id')
+        ingredients = RecipeIngredient.objects.values_list(
+            f'{RecipeIngredient.RECIPE_FIELD}_id',
+            f'{RecipeIngredient.INGREDIENT_FIELD}_id')
+        return cls.from_pairs(
+            np.fromiter(
+                chain.from_iterable(chain(
+                    ((recipe_id, 2 * pk) for recipe_id, pk in
+                     keywords.iterator(chunk_size=LOAD_CHUNK_SIZE)),
+                    ((recipe_id, 2 * pk + 1) for recipe_id, pk in
+                     ingredients.iterator(chunk_size=LOAD_CHUNK_SIZE)),
+                )), dtype=np.int64)
+        )
+
+    @property
+    def size(self) -> int:
+        """ Number of recipes """
+        return len(self.recipe_ids)
+
+    def chunk(self, start: int, end: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get a chunk of rows
+        :param start: index of first row
+        :param end: index of row after last row
+        :return: tuple of row starts relative to the chunk, and tokens
+        """
+        first = self.row_starts[start]
+        last = self.row_starts[end] if end < self.size else len(self.tokens)
+        return self.row_starts[start:end] - first, self.tokens[first:last]
+
+
+class MinHasher:
+    """
+    MinHash signature generator; the proportion of equal signature values
+    of two sets estimates the Jaccard similarity of the sets
+    """
+    a: np.ndarray
+    """ Hash function multipliers """
+    b: np.ndarray
+    """ Hash function offsets """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM,
+                 seed: int = DEFAULT_SEED):
+        """
+        Initialise object
+        :param num_perm: number of hash functions; default DEFAULT_NUM_PERM
+        :param seed: random seed; default DEFAULT_SEED
+        """
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, HASH_PRIME, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, HASH_PRIME, num_perm, dtype=np.uint64)
+
+    @property
+    def num_perm(self) -> int:
+        """ Number of hash functions """
+        return len(self.a)
+
+    def signatures(self, row_starts: np.ndarray,
+                   tokens: np.ndarray) -> np.ndarray:
+        """
+        Generate the signatures of rows of tokens
+        :param row_starts: index in `tokens` of the first token of each row;
+                        every row must have at least one token
+        :param tokens: tokens of each row, grouped by row
+        :return: rows x num_perm array of signatures
+        """
+        hashes = (np.outer(tokens.astype(np.uint64) % HASH_PRIME, self.a)
+                  + self.b) % HASH_PRIME
+        return np.minimum.reduceat(
+            hashes, row_starts, axis=0).astype(np.uint32)
+
+
+class LshIndex:
+    """
+    Locality-sensitive hashing index of MinHash signatures; signatures are
+    split into bands, and rows with an identical band are candidates for
+    similarity
+    """
+    signatures: np.ndarray
+    """ Signatures of each row """
+    bands: int
+    """ Number of bands """
+    band_groups: np.ndarray
+    """ bands x rows array of the group of each row's band """
+    band_order: np.ndarray
+    """ bands x rows array of row indices ordered by group """
+    group_starts: List[np.ndarray]
+    """ Index in `band_order` of the first row of each group, by band """
+
+    def __init__(self, signatures: np.ndarray, bands: int = DEFAULT_BANDS):
+        """
+        Initialise object
+        :param signatures: rows x num_perm array of signatures
+        :param bands: number of bands, must be a factor of num_perm;
+                    default DEFAULT_BANDS
+        """
+        rows, num_perm = signatures.shape
+        if num_perm % bands:
+            raise ValueError(
+                f'Number of bands ({bands}) is not a factor of the '
+                f'signature length ({num_perm})')
+        band_rows = num_perm // bands
+
+        self.signatures = signatures
+        self.bands = bands
+        self.band_groups = np.empty((bands, rows), dtype=np.int64)
+        self.band_order = np.empty((bands, rows), dtype=np.int64)
+        self.group_starts = []
+        for band in range(bands):
+            _, groups = np.unique(
+                signatures[:, band * band_rows:(band + 1) * band_rows],
+                axis=0, return_inverse=True)
+            groups = groups.reshape(-1)
+            order = np.argsort(groups, kind='stable')
+            self.band_groups[band] = groups
+            self.band_order[band] = order
+            self.group_starts.append(
+                np.searchsorted(groups[order], np.arange(groups.max() + 2))
+                if rows else np.zeros(1, dtype=np.int64))
+
+    def candidates(self, row: int, max_bucket: int) -> np.ndarray:
+        """
+        Get the candidates for similarity to a row
+        :param row: row index
+        :param max_bucket: max size of group to take candidates from; rows
+                        sharing a band with very many others are ignored
+        :return: array of candidate row indices, excluding `row`
+        """
+        members = []
+        for band in range(self.bands):
+            group = self.band_groups[band, row]
+            start, end = self.group_starts[band][group:group + 2]
+            if 1 < end - start <= max_bucket:
+                members.append(self.band_order[band, start:end])
+        if not members:
+            return np.empty(0, dtype=np.int64)
+        candidates = np.unique(np.concatenate(members))
+        return candidates[candidates != row]
+
+    def neighbours(self, start: int, end: int, top_k: int,
+                   min_score: float, max_bucket: int
+                   ) -> List[Neighbour]:
+        """
+        Find the most similar rows of a range of rows
+        :param start: index of first row
+        :param end: index of row after last row
+        :param top_k: max number of similar rows per row
+        :param min_score: min estimated similarity
+        :param max_bucket: max size of group to take candidates from
+        :return: list of tuples of row index, similar row index and
+                estimated similarity, most similar first for each row;
+                see Neighbour
+        """
+        result = []
+        for row in range(start, end):
+            candidates = self.candidates(row, max_bucket)
+            if not len(candidates):
+                continue
+            scores = np.mean(
+                self.signatures[candidates] == self.signatures[row], axis=1)
+            if len(candidates) > top_k:
+                best = np.argpartition(-scores, top_k)[:top_k]
+                candidates, scores = candidates[best], scores[best]
+            for index in np.argsort(-scores, kind='stable'):
+                if scores[index] < min_score:
+                    break
+                result.append(
+                    (row, int(candidates[index]), float(scores[index])))
+        return result
+
+
+def _ranges(size: int, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """ Split a range into chunks """
+    return ((start, min(start + chunk_size, size))
+            for start in range(0, size, chunk_size))
+
+
+_worker_index = None     # index of worker process
+
+
+def _init_worker(index: LshIndex):
+    """ Initialise worker process """
+    global _worker_index
+    _worker_index = index
+
+
+def _worker_neighbours(start: int, end: int, *args) -> list:
+    """ Find neighbours in worker process, see LshIndex.neighbours() """
+    return _worker_index.neighbours(start, end, *args)
+
+
+def find_similar(
+        tokens: RecipeTokens, top_k: int = DEFAULT_TOP_K,
+        min_score: float = DEFAULT_MIN_SCORE,
+        num_perm: int = DEFAULT_NUM_PERM, bands: int = DEFAULT_BANDS,
+        max_bucket: int = DEFAULT_MAX_BUCKET,
+        chunk_size: int = DEFAULT_CHUNK_SIZE, workers: int = 1,
+        seed: int = DEFAULT_SEED) -> Iterator[Neighbour]:
+    """
+    Find the most similar recipes of each recipe
+    :param tokens: recipe tokens
+    :param top_k: max number of similar recipes per recipe;
+                default DEFAULT_TOP_K
+    :param min_score: min estimated similarity; default DEFAULT_MIN_SCORE
+    :param num_perm: signature length; default DEFAULT_NUM_PERM
+    :param bands: number of LSH bands; default DEFAULT_BANDS
+    :param max_bucket: max size of LSH bucket to take candidates from;
+                    default DEFAULT_MAX_BUCKET
+    :param chunk_size: number of recipes per chunk of work;
+                    default DEFAULT_CHUNK_SIZE
+    :param workers: number of worker processes; default 1
+    :param seed: random seed; default DEFAULT_SEED
+    :return: iterator of tuples of recipe id, similar recipe id and score
+    """
+    hasher = MinHasher(num_perm=num_perm, seed=seed)
+    chunks = list(_ranges(tokens.size, chunk_size))
+    params = (top_k, min_score, max_bucket)
+    parallel = workers > 1 and len(chunks) > 1
+
+    # signatures of each chunk of recipes
+    if parallel:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            signatures = list(executor.map(
+                hasher.signatures,
+                *zip(*[tokens.chunk(start, end) for start, end in chunks])))
+    else:
+        signatures = [
+            hasher.signatures(*tokens.chunk(start, end))
+            for start, end in chunks
+        ]
+    index = LshIndex(
+        np.concatenate(signatures) if signatures else
+        np.empty((0, num_perm), dtype=np.uint32), bands=bands)
+
+    # neighbours of each chunk of recipes
+    if parallel:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_worker,
+                                 initargs=(index,)) as executor:
+            results = list(executor.map(
+                _worker_neighbours, *zip(*chunks),
+                *[[param] * len(chunks) for param in params]))
+    else:
+        results = [
+            index.neighbours(start, end, *params) for start, end in chunks
+        ]
+
+    recipe_ids = tokens.recipe_ids
+    return (
+        (int(recipe_ids[row]), int(recipe_ids[similar]), score)
+        for row, similar, score in chain.from_iterable(results)
+    )
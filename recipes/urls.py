@@ -36,14 +36,18 @@ from .constants import (
     RECIPE_INSTRUCTION_ID_ROUTE_NAME, RECIPE_ID_INSTRUCTION_NEW_URL,
     RECIPE_ID_INSTRUCTION_NEW_ROUTE_NAME, RECIPE_INSTRUCTION_ID_URL,
     RECIPE_ID_BUY_BOX_ROUTE_NAME, RECIPE_ID_BUY_BOX_URL,
+    RECIPE_ID_SCALE_ROUTE_NAME, RECIPE_ID_SCALE_URL,
     RECIPE_CATEGORIES_URL, CATEGORIES_ROUTE_NAME,
+    RECIPE_SHOPPING_LIST_URL, RECIPE_SHOPPING_LIST_ROUTE_NAME,
+    RECIPE_MEAL_PLAN_URL, RECIPE_MEAL_PLAN_ROUTE_NAME,
+    RECIPE_AUTOCOMPLETE_URL, RECIPE_AUTOCOMPLETE_ROUTE_NAME,
 )
 from .views import (
     RecipeCreate, recipe_home, RecipeList, SearchRecipeList,
-    RecipeDetail, RecipeDetailUpdate, add_recipe_to_basket,
+    RecipeDetail, RecipeDetailUpdate, add_recipe_to_basket, recipe_scale,
     RecipeIngredientDetail, create_recipe_ingredient,
     InstructionDetail, create_recipe_instruction,
-    CategoryList
+    CategoryList, autocomplete, shopping_list, meal_plan
 )
 
 # https://docs.djangoproject.com/en/4.1/topics/http/urls/#url-namespaces-and-included-urlconfs
@@ -60,6 +64,7 @@ _url_info = [
      RECIPE_ID_UPDATE_ROUTE_NAME),
     (RECIPE_ID_BUY_BOX_URL, add_recipe_to_basket,
      RECIPE_ID_BUY_BOX_ROUTE_NAME),
+    (RECIPE_ID_SCALE_URL, recipe_scale, RECIPE_ID_SCALE_ROUTE_NAME),
 
     (RECIPE_INGREDIENT_ID_URL, RecipeIngredientDetail.as_view(),
      RECIPE_INGREDIENT_ID_ROUTE_NAME),
@@ -72,6 +77,11 @@ _url_info = [
      RECIPE_ID_INSTRUCTION_NEW_ROUTE_NAME),
 
     (RECIPE_CATEGORIES_URL, CategoryList.as_view(), CATEGORIES_ROUTE_NAME),
+    (RECIPE_SHOPPING_LIST_URL, shopping_list,
+     RECIPE_SHOPPING_LIST_ROUTE_NAME),
+    (RECIPE_MEAL_PLAN_URL, meal_plan, RECIPE_MEAL_PLAN_ROUTE_NAME),
+
+    (RECIPE_AUTOCOMPLETE_URL, autocomplete, RECIPE_AUTOCOMPLETE_ROUTE_NAME),
 ]
 
 urlpatterns = [
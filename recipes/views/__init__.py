@@ -22,12 +22,17 @@
 from .recipe_create import RecipeCreate
 from .recipe_home import recipe_home
 from .recipe_list import RecipeList, SearchRecipeList
-from .recipe_by import RecipeDetail, RecipeDetailUpdate, add_recipe_to_basket
+from .recipe_by import (
+    RecipeDetail, RecipeDetailUpdate, add_recipe_to_basket, recipe_scale
+)
 from .ingredient_by import RecipeIngredientDetail
 from .ingredient_create import create_recipe_ingredient
 from .instruction_by import InstructionDetail
 from .instruction_create import create_recipe_instruction
 from .category_list import CategoryList
+from .autocomplete import autocomplete
+from .shopping_list import shopping_list
+from .meal_plan import meal_plan
 from .dto import RecipeDto
 
 
@@ -42,6 +47,7 @@ __all__ = [
     'RecipeDetail',
     'RecipeDetailUpdate',
     'add_recipe_to_basket',
+    'recipe_scale',
 
     'RecipeIngredientDetail',
 
@@ -54,4 +60,10 @@ __all__ = [
     'RecipeDto',
 
     'CategoryList',
+
+    'autocomplete',
+
+    'shopping_list',
+
+    'meal_plan',
 ]
@@ -0,0 +1,73 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from utils import Crud, GET
+
+from .utils import recipe_permission_check
+from ..autocomplete import AUTOCOMPLETE_ENTITIES, autocomplete_names
+from ..constants import PREFIX_QUERY, LIMIT_QUERY
+
+RESULTS_CTX = 'results'     # list of results
+ID_CTX = 'id'               # entity id
+NAME_CTX = 'name'           # entity name
+
+
+@login_required
+@require_http_methods([GET])
+def autocomplete(request: HttpRequest, entity: str) -> HttpResponse:
+    """
+    View function to get the names of entities beginning with a prefix,
+    e.g. '/recipes/autocomplete/ingredients?prefix=chi&limit=10'
+    :param request: http request
+    :param entity: entity name, one of 'ingredients', 'keywords' or
+                'categories'
+    :return: response
+    """
+    recipe_permission_check(request, Crud.READ)
+
+    if entity not in AUTOCOMPLETE_ENTITIES:
+        return JsonResponse({
+            RESULTS_CTX: []
+        }, status=HTTPStatus.NOT_FOUND)
+
+    prefix = request.GET.get(PREFIX_QUERY, '').strip()
+    try:
+        limit = int(
+            request.GET.get(LIMIT_QUERY, settings.AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        limit = settings.AUTOCOMPLETE_LIMIT
+    limit = max(1, min(limit, settings.AUTOCOMPLETE_MAX_LIMIT))
+
+    results = autocomplete_names(entity, prefix, limit) if prefix else []
+
+    return JsonResponse({
+        RESULTS_CTX: [
+            {ID_CTX: pk, NAME_CTX: name} for pk, name in results
+        ]
+    }, status=HTTPStatus.OK)
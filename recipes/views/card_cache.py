@@ -0,0 +1,88 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from typing import List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe, SafeString
+
+from utils import app_template_path, cache_key, CacheStats
+
+from ..constants import THIS_APP, RECIPE_DTO_CTX, TIME_CTX
+from .dto import RecipeCardDto
+
+# template rendering a recipe card
+CARD_TEMPLATE = app_template_path(THIS_APP, 'recipe_dto.html')
+# increment to invalidate cached cards when CARD_TEMPLATE changes
+CARD_VERSION = 1
+# context variable for card identifier, see CARD_TEMPLATE
+IDENTIFIER_CTX = 'identifier'
+
+card_stats = CacheStats('recipe_card')
+""" Rendered recipe card cache hits and misses """
+
+
+def card_key(card: RecipeCardDto, time: str) -> str:
+    """
+    Generate the cache key for a rendered recipe card. The key includes the
+    recipe's revision stamp, so it changes whenever the recipe is updated.
+    :param card: recipe card
+    :param time: recipe time displayed on card; one of 'prep', 'cook' or
+                'total'
+    :return: cache key
+    """
+    stamp = int(card.updated.timestamp() * 1e6) if card.updated else 0
+    return cache_key(
+        'recipe_card', CARD_VERSION, card.id, stamp, time)
+
+
+def render_recipe_cards(
+        cards: List[RecipeCardDto], time: str) -> List[SafeString]:
+    """
+    Render recipe cards, using cached cards where available; only cards not
+    in the cache are rendered, and are then added to the cache
+    :param cards: recipe cards to render
+    :param time: recipe time displayed on cards; one of 'prep', 'cook' or
+                'total'
+    :return: list of rendered cards in the same order as `cards`
+    """
+    keys = [card_key(card, time) for card in cards]
+    rendered = cache.get_many(keys)
+    hits = len(rendered)
+
+    missed = {}
+    for key, card in zip(keys, cards):
+        if key not in rendered:
+            missed[key] = render_to_string(CARD_TEMPLATE, context={
+                RECIPE_DTO_CTX: card,
+                IDENTIFIER_CTX: card.id,
+                TIME_CTX: time,
+            })
+    if missed:
+        cache.set_many(missed, timeout=settings.RECIPE_CARD_CACHE_TIMEOUT)
+        rendered.update(missed)
+
+    card_stats.record(hits=hits, misses=len(missed))
+
+    return [mark_safe(rendered[key]) for key in keys]
@@ -32,15 +32,12 @@ from recipes.models import (
 )
 from user.models import User
 from utils import (
-    SEARCH_QUERY, regex_matchers, QuerySetParams,
-    TERM_GROUP, KEY_TERM_GROUP, get_object_and_related_or_404
+    SEARCH_QUERY, QuerySetParams, get_object_and_related_or_404,
+    SearchTokenizer, SearchToken, cacheable_handler
 )
 from utils.query_params import SearchType
 from utils.search import MARKER_CHARS
 
-NON_DATE_QUERIES = [LETTER_QUERY]
-REGEX_MATCHERS = regex_matchers(NON_DATE_QUERIES)
-
 FIELD_LOOKUPS = {
     # query param: filter lookup
     SEARCH_QUERY: '',
@@ -63,11 +60,26 @@ NON_LOOKUP_ARGS = [
     LETTER_QUERY    # complex non a-z query
 ]
 
-SEARCH_REGEX = [
-    # regex,            query param, regex match group, key & regex match grp
-    (REGEX_MATCHERS[q], q,           TERM_GROUP,        KEY_TERM_GROUP)
-    for q in NON_DATE_QUERIES
-]
+
+@cacheable_handler
+def _letter_handler(
+        query_set_params: QuerySetParams, token: SearchToken) -> bool:
+    """
+    Search term handler for letter query
+    :param query_set_params: query params to update
+    :param token: search term
+    :return: True if successfully added
+    """
+    success = bool(token.value)
+    if success:
+        add_letter_query(query_set_params, token.value)
+    return success
+
+
+SEARCH_TOKENIZER = SearchTokenizer({
+    # query param: term handler
+    LETTER_QUERY: _letter_handler,
+})
 
 
 class QueryParam(Enum):
@@ -120,22 +132,7 @@ def get_search_term(
     if value is None:
         return query_set_params
 
-    for regex, query, group, key_val_group in SEARCH_REGEX:
-        match = regex.match(value)
-        if match:
-            success = True
-            if query == LETTER_QUERY:
-                add_letter_query(query_set_params, value)
-            elif query not in NON_LOOKUP_ARGS:
-                query_set_params.add_and_lookup(
-                    query, FIELD_LOOKUPS[query], match.group(group))
-            else:
-                # complex query term handled elsewhere
-                success = False
-
-            save_term_func = query_set_params.add_search_term if success \
-                else query_set_params.add_invalid_term
-            save_term_func(match.group(key_val_group))
+    SEARCH_TOKENIZER.apply(value, query_set_params)
 
     if query_set_params.is_empty and value:
         query_set_params.search_type = SearchType.FREE if not any(
@@ -20,22 +20,23 @@
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
 from dataclasses import dataclass, field
-from datetime import timedelta
-from typing import List, Union, TypeVar
+from datetime import datetime, timedelta
+from typing import Iterable, List, Union, TypeVar
 import re
 
 from cloudinary.models import CloudinaryField
+from django.db.models import Prefetch, prefetch_related_objects
 from django.db.models.fields.files import ImageFieldFile
 from django.utils.text import slugify
 
 from base.dto import BaseDto, ImagePool
-from recipes.views.recipe_queries import (
-    get_recipe_instructions, get_recipe
-)
+from recipes.views.recipe_queries import get_recipe, MAIN_IMAGE_URL
 from recipes.models import (
     Recipe, RecipeIngredient, Instruction
 )
-from recipes.images import recipe_main_image, recipe_image_pool
+from recipes.images import (
+    recipe_main_image, recipe_image_pool, main_image_pool
+)
 from recipesnstuff import DEVELOPMENT
 from utils import html_tag
 
@@ -130,6 +131,36 @@ NUTRI_FIELDS = {
 }
 NUTRI_REGEX = re.compile(r'<<.*>>', re.IGNORECASE)
 
+# related attributes which may be populated in a RecipeDto
+RELATED_FIELDS = [
+    Recipe.INGREDIENTS_FIELD, Recipe.INSTRUCTIONS_FIELD, Recipe.IMAGES_FIELD,
+    Recipe.AUTHOR_FIELD, Recipe.CATEGORY_FIELD
+]
+
+
+def related_lookups(fields: List[str]) -> List[Union[str, Prefetch]]:
+    """
+    Get the prefetch lookups for the specified related attributes
+    :param fields: list of Recipe.xxx_FIELD names of related attributes
+    :return: list of lookups
+    """
+    lookups = []
+    for fld in fields:
+        if fld == Recipe.INGREDIENTS_FIELD:
+            lookups.append(Prefetch(
+                'recipeingredient_set',
+                queryset=RecipeIngredient.objects.select_related(
+                    RecipeIngredient.INGREDIENT_FIELD,
+                    RecipeIngredient.MEASURE_FIELD
+                ).order_by(RecipeIngredient.INDEX_FIELD)
+            ))
+        elif fld == Recipe.IMAGES_FIELD:
+            lookups.append('image_set')
+        else:
+            # instructions are ordered by index by default
+            lookups.append(fld)
+    return lookups
+
 
 @dataclass
 class RecipeDto(BaseDto):
@@ -153,29 +184,68 @@ class RecipeDto(BaseDto):
         :param nutri_text: generate nutritional info texts; default False
         :return: DTO instance
         """
+        return RecipeDto.from_queryset(
+            [recipe], *args, all_attrib=all_attrib, nutri_text=nutri_text)[0]
+
+    @staticmethod
+    def from_queryset(recipes: Iterable[Recipe], *args,
+                      all_attrib: bool = True,
+                      nutri_text: bool = False) -> List[TypeRecipeDto]:
+        """
+        Generate DTOs from the specified `recipes`. The related attributes
+        of all the recipes are fetched in one query per attribute, so the
+        number of queries is independent of the number of recipes.
+        :param recipes: model instances to populate DTOs from
+        :param args: list of Recipe.xxx_FIELD names to populate in addition
+                    to basic fields
+        :param all_attrib: populate all attributes flag; default True
+        :param nutri_text: generate nutritional info texts; default False
+        :return: list of DTO instances
+        """
+        fields = [
+            fld for fld in RELATED_FIELDS if all_attrib or fld in args
+        ]
+        recipes = list(recipes)
+        prefetch_related_objects(recipes, *related_lookups(fields))
+
+        return [
+            RecipeDto._from_prefetched(recipe, fields, nutri_text)
+            for recipe in recipes
+        ]
+
+    @staticmethod
+    def _from_prefetched(recipe: Recipe, fields: List[str],
+                         nutri_text: bool):
+        """
+        Generate a DTO from the specified `recipe`, whose related attributes
+        have been prefetched
+        :param recipe: model instance to populate DTO from
+        :param fields: list of Recipe.xxx_FIELD names of related attributes
+                    to populate
+        :param nutri_text: generate nutritional info texts
+        :return: DTO instance
+        """
         dto = BaseDto.from_model_to_obj(recipe, RecipeDto())
         # custom handling for specific attributes
 
-        if all_attrib or Recipe.INGREDIENTS_FIELD in args:
-            dto.ingredients = \
-                list(map(IngredientDto.from_model,
-                         list(recipe.recipeingredient_set.order_by(
-                              RecipeIngredient.INDEX_FIELD).all()))
-                     )
+        if Recipe.INGREDIENTS_FIELD in fields:
+            dto.ingredients = list(map(
+                IngredientDto.from_model, recipe.recipeingredient_set.all()
+            ))
             dto._ingredient_alts = scan_alternatives(
                 dto.ingredients, RecipeIngredient.INDEX_FIELD)
-        if all_attrib or Recipe.INSTRUCTIONS_FIELD in args:
-            dto.instructions = get_recipe_instructions(dto.id)
+        if Recipe.INSTRUCTIONS_FIELD in fields:
+            dto.instructions = list(recipe.instructions.all())
             dto._instruction_alts = scan_alternatives(
                 dto.instructions, Instruction.INDEX_FIELD)
-        if all_attrib or Recipe.IMAGES_FIELD in args:
+        if Recipe.IMAGES_FIELD in fields:
             _images = [] if RecipeDto.has_no_uploaded_picture(
                 recipe.picture) else [recipe.picture]
-            _images.extend(list(recipe.image_set.all()))
+            _images.extend(recipe.image_set.all())
             dto.images = _images
-        if all_attrib or Recipe.AUTHOR_FIELD in args:
+        if Recipe.AUTHOR_FIELD in fields:
             dto.author = recipe.author
-        if all_attrib or Recipe.CATEGORY_FIELD in args:
+        if Recipe.CATEGORY_FIELD in fields:
             dto.category = recipe.category
 
         if nutri_text:
@@ -183,11 +253,10 @@ class RecipeDto(BaseDto):
             dto.nutrition_list = []
             for fld in Recipe.nutritional_fields():
                 nutri = round(getattr(dto, fld))
-                nutri_text = re.sub(NUTRI_REGEX, str(nutri),
-                                    NUTRI_FIELDS[fld])
+                text = re.sub(NUTRI_REGEX, str(nutri), NUTRI_FIELDS[fld])
                 percent = round(nutri * 100 / getattr(ADULT_DV, fld))
                 dto.nutrition_list.append(
-                    (nutri_text, f'<strong>{percent}%</strong>')
+                    (text, f'<strong>{percent}%</strong>')
                 )
 
         return dto
@@ -284,6 +353,39 @@ class RecipeDto(BaseDto):
                f'{slugify(self.name)}-{self.food_id}' if self.food_id else ''
 
 
+@dataclass(slots=True)
+class RecipeCardDto(BaseDto):
+    """ Recipe list card data transfer object """
+
+    id: int = 0
+    name: str = ''
+    prep_time: timedelta = timedelta()
+    cook_time: timedelta = timedelta()
+    total_time: timedelta = timedelta()
+    author_name: str = ''
+    main_image: ImagePool = None
+    updated: datetime = None
+
+    @staticmethod
+    def from_model(recipe: Recipe):
+        """
+        Generate a DTO from the specified `recipe`, retrieved via
+        `recipe_card_projection()`
+        :param recipe: model instance to populate DTO from
+        :return: DTO instance
+        """
+        return RecipeCardDto(
+            id=recipe.id, name=recipe.name, prep_time=recipe.prep_time,
+            cook_time=recipe.cook_time, total_time=recipe.total_time,
+            author_name=recipe.author.username, updated=recipe.updated,
+            main_image=main_image_pool(
+                getattr(recipe, MAIN_IMAGE_URL)
+                if RecipeDto.has_no_uploaded_picture(recipe.picture) else
+                recipe.picture.url
+            )
+        )
+
+
 def scan_alternatives(entities: List[Union[Instruction, RecipeIngredient]],
                       attrib: str) -> List[bool]:
     """
@@ -24,18 +24,18 @@ from http import HTTPStatus
 from typing import Union, List
 
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import transaction
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.views import View
 
 from base.templatetags.delete_modal_ids import delete_modal_ids
 from utils import (
     Crud, redirect_on_success_or_render,
-    entity_delete_result_payload
+    entity_delete_result_payload, bump_table_version
 )
 from .recipe_by import RecipeDetailUpdate
 from .recipe_queries import (
-    get_recipe, get_recipe_ingredient, get_recipe_ingredients_list,
-    own_recipe_check
+    get_recipe, get_recipe_ingredient, own_recipe_check
 )
 from .utils import recipe_permission_check
 from ..constants import INGREDIENTS_QUERY
@@ -104,6 +104,8 @@ class RecipeIngredientDetail(LoginRequiredMixin, View):
         status = HTTPStatus.OK
         # delete ingredient
         count, _ = recipe_ingredient.delete()
+        if count:
+            check_ingredient_ordering(recipe_ingredient.recipe)
 
         entity = 'ingredient'
         modal_ids = delete_modal_ids(entity)
@@ -125,36 +127,41 @@ class RecipeIngredientDetail(LoginRequiredMixin, View):
 
 
 def check_ordering(entities: List[Union[RecipeIngredient, Instruction]],
-                   field: str, start: int = 1):
+                   field: str, start: int = 1
+                   ) -> List[Union[RecipeIngredient, Instruction]]:
     """
-    Check and update if necessary the recipe ingredients order for the
-    specified recipe
-    :param entities: list of entities to order
+    Check and update if necessary the order of the specified entities. The
+    new indices are computed in memory, and the entities whose index changes
+    are updated with a single bulk update.
+    Note: as a bulk update doesn't send save signals, the table version of
+          the entities is bumped here, but updating the revision stamp of
+          the recipe is the responsibility of the caller
+    :param entities: list of entities to order, in index order
     :param field: index field of entity
     :param start: first index; default 1
+    :return: list of updated entities
     """
-    expected_idx = start
-    alt_end_idx = 0
-    for index, entity in enumerate(entities):
-        if index < alt_end_idx:
-            continue    # skip alternatives
-
+    changed = []
+    expected_idx = start - 1
+    current_idx = None
+    for entity in entities:
         entity_index = getattr(entity, field)
+        if entity_index != current_idx:
+            # alternative entities have same index
+            current_idx = entity_index
+            expected_idx += 1
 
-        assert entity_index >= expected_idx
-        # alternative entities have same index
-        alt_end_idx = index
-        while alt_end_idx < len(entities) and \
-                getattr(entities[alt_end_idx], field) == entity_index:
-            alt_end_idx += 1
+        if entity_index != expected_idx:
+            setattr(entity, field, expected_idx)
+            changed.append(entity)
 
-        if entity_index > expected_idx:
-            for alt_idx in range(index, alt_end_idx):
-                update_entity = entities[alt_idx]
-                setattr(update_entity, field, expected_idx)
-                update_entity.save()
+    if changed:
+        model = type(changed[0])
+        with transaction.atomic():
+            model.objects.bulk_update(changed, [field])
+        bump_table_version(model)
 
-        expected_idx += 1
+    return changed
 
 
 def check_ingredient_ordering(recipe: Union[int, Recipe]):
@@ -164,10 +171,15 @@ def check_ingredient_ordering(recipe: Union[int, Recipe]):
     :param recipe: id of recipe or recipe object
     """
     if isinstance(recipe, int):
-        recipe = get_recipe(recipe)
-
-    ingredients = get_recipe_ingredients_list(
-        recipe, order_by=RecipeIngredient.INDEX_FIELD)
-
-    check_ordering(ingredients, RecipeIngredient.INDEX_FIELD,
-                   start=RecipeIngredient.RECIPE_INGREDIENT_ATTRIB_INDEX_MIN)
+        recipe, _ = get_recipe(recipe)
+
+    ingredients = RecipeIngredient.objects.filter(**{
+        f'{RecipeIngredient.RECIPE_FIELD}': recipe
+    }).order_by(
+        RecipeIngredient.INDEX_FIELD, RecipeIngredient.id_field()
+    ).only(RecipeIngredient.INDEX_FIELD)
+
+    if check_ordering(
+            list(ingredients), RecipeIngredient.INDEX_FIELD,
+            start=RecipeIngredient.RECIPE_INGREDIENT_ATTRIB_INDEX_MIN):
+        Recipe.touch(pk=recipe.pk)
@@ -114,6 +114,8 @@ class InstructionDetail(LoginRequiredMixin, View):
         status = HTTPStatus.OK
         # delete instruction
         count, _ = instruction.delete()
+        if count:
+            check_instruction_ordering(recipe)
 
         entity = 'instruction'
         modal_ids = delete_modal_ids(entity)
@@ -141,10 +143,12 @@ def check_instruction_ordering(recipe: Union[int, Recipe]):
     :param recipe: id of recipe or recipe object
     """
     if isinstance(recipe, int):
-        recipe = get_recipe(recipe)
+        recipe, _ = get_recipe(recipe)
 
-    instructions = list(
-        recipe.instructions.order_by(Instruction.INDEX_FIELD).all())
+    instructions = recipe.instructions.order_by(
+        Instruction.INDEX_FIELD, Instruction.id_field()
+    ).only(Instruction.INDEX_FIELD)
 
-    check_ordering(instructions, Instruction.INDEX_FIELD,
-                   start=Instruction.INSTRUCTION_ATTRIB_INDEX_MIN)
+    if check_ordering(list(instructions), Instruction.INDEX_FIELD,
+                      start=Instruction.INSTRUCTION_ATTRIB_INDEX_MIN):
+        Recipe.touch(pk=recipe.pk)
@@ -0,0 +1,166 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from dataclasses import asdict
+from http import HTTPStatus
+from typing import List, Optional
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.db.models import Q
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from utils import Crud, GET
+
+from .dto import ADULT_DV
+from .recipe_by import RecipeDetail
+from .utils import recipe_permission_check
+from ..constants import (
+    DAYS_QUERY, MEALS_QUERY, MIN_CALORIES_QUERY, MAX_CALORIES_QUERY,
+    CATEGORY_QUERY, EXCLUDE_QUERY, SEED_QUERY, ERROR_CTX
+)
+from ..meal_plan import meal_planner
+from ..models import Category, Recipe
+
+DAYS_CTX = 'days'                   # list of days
+RECIPES_CTX = 'recipes'             # list of recipes of a day
+TOTALS_CTX = 'totals'               # nutritional totals of a day
+DAILY_VALUES_CTX = 'daily_values'   # totals as percent of daily values
+ID_CTX = 'id'                       # recipe id
+NAME_CTX = 'name'                   # recipe name
+URL_CTX = 'url'                     # recipe url
+
+
+def _number_arg(request: HttpRequest, query: str, default: Optional[float],
+                min_value: float, max_value: float = None,
+                convert=int) -> Optional[float]:
+    """
+    Get a numeric query argument
+    :param request: http request
+    :param query: query key
+    :param default: default value
+    :param min_value: min valid value
+    :param max_value: max valid value; default no max
+    :param convert: conversion function; default int
+    :return: value
+    :raises ValueError: if value is invalid
+    """
+    value = request.GET.get(query)
+    if not value:
+        return default
+    value = convert(value)
+    if value < min_value or (max_value is not None and value > max_value):
+        raise ValueError(f"Invalid '{query}': {value}")
+    return value
+
+
+def _category_ids(request: HttpRequest, query: str) -> List[int]:
+    """
+    Get the ids of the categories in a comma-separated query argument
+    :param request: http request
+    :param query: query key
+    :return: list of ids
+    :raises ValueError: if a category is not found
+    """
+    names = [
+        name.strip() for name in request.GET.get(query, '').split(',')
+        if name.strip()
+    ]
+    if not names:
+        return []
+    found = Category.objects.filter(
+        Q(_connector=Q.OR, *[
+            Q(**{f'{Category.NAME_FIELD}__iexact': name}) for name in names
+        ])
+    ).values_list(Category.id_field(), Category.NAME_FIELD)
+    if len(found) < len({name.lower() for name in names}):
+        unknown = {name.lower() for name in names} - {
+            name.lower() for _, name in found}
+        raise ValueError(f"Unknown categories: {', '.join(sorted(unknown))}")
+    return [pk for pk, _ in found]
+
+
+@login_required
+@require_http_methods([GET])
+def meal_plan(request: HttpRequest) -> HttpResponse:
+    """
+    View function to generate a meal plan of recipes meeting the adult daily
+    values, e.g.
+    '/recipes/meal_plan/?days=7&meals=3&min_cal=1800&max_cal=2200&exclude=dessert'
+    :param request: http request
+    :return: response
+    """
+    recipe_permission_check(request, Crud.READ)
+
+    calories = ADULT_DV.calories
+    tolerance = calories * settings.MEAL_PLAN_CALORIE_TOLERANCE
+    try:
+        days = _number_arg(
+            request, DAYS_QUERY, 7, 1, settings.MEAL_PLAN_MAX_DAYS)
+        meals = _number_arg(
+            request, MEALS_QUERY, 3, 1, settings.MEAL_PLAN_MAX_MEALS)
+        min_calories = _number_arg(
+            request, MIN_CALORIES_QUERY, calories - tolerance, 0,
+            convert=float)
+        max_calories = _number_arg(
+            request, MAX_CALORIES_QUERY, calories + tolerance, 0,
+            convert=float)
+        seed = _number_arg(request, SEED_QUERY, None, 0)
+        categories = _category_ids(request, CATEGORY_QUERY)
+        exclude_categories = _category_ids(request, EXCLUDE_QUERY)
+    except ValueError as exc:
+        return JsonResponse({
+            ERROR_CTX: str(exc)
+        }, status=HTTPStatus.BAD_REQUEST)
+
+    targets = asdict(ADULT_DV)
+    plan = meal_planner(targets).plan(
+        days=days, meals=meals, min_calories=min_calories,
+        max_calories=max_calories, categories=categories,
+        exclude_categories=exclude_categories,
+        variety=settings.MEAL_PLAN_VARIETY, seed=seed)
+    if plan is None:
+        return JsonResponse({
+            ERROR_CTX: 'No meal plan satisfies the constraints'
+        }, status=HTTPStatus.NOT_FOUND)
+
+    names = dict(Recipe.objects.filter(**{
+        f'{Recipe.id_field()}__in': [
+            pk for day in plan for pk in day.recipe_ids
+        ]
+    }).values_list(Recipe.id_field(), Recipe.NAME_FIELD))
+
+    return JsonResponse({
+        DAYS_CTX: [{
+            RECIPES_CTX: [{
+                ID_CTX: pk,
+                NAME_CTX: names.get(pk, ''),
+                URL_CTX: RecipeDetail.url(pk),
+            } for pk in day.recipe_ids],
+            TOTALS_CTX: day.totals,
+            DAILY_VALUES_CTX: {
+                field: round(total * 100 / targets[field])
+                for field, total in day.totals.items()
+            },
+        } for day in plan]
+    }, status=HTTPStatus.OK)
@@ -19,29 +19,40 @@
 #  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
-from dataclasses import dataclass
+import hashlib
+from dataclasses import dataclass, asdict
 from http import HTTPStatus
 from random import choice
-from typing import Union, Tuple, TypeVar
+from typing import Union, Tuple, TypeVar, Optional
 
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.messages import get_messages
 from django.core.exceptions import BadRequest
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render
+from django.utils.cache import (
+    get_conditional_response, patch_cache_control
+)
+from django.utils.http import quote_etag
 from django.views import View
 from django.views.decorators.http import require_http_methods
 
-from base.entity_conv import unescape_entities
 from base.templatetags.delete_modal_ids import delete_modal_ids
-from checkout.basket import add_ingredient_box_to_basket
+from checkout.basket import (
+    add_ingredient_box_to_basket, get_session_basket, navbar_basket_context
+)
+from checkout.models import Currency
+from order.models import OrderProduct
 from order.views.utils import order_permission_check
 from utils.content_list_mixin import get_query_args, SUBMIT_URL_CTX
 from .dto import RecipeDto
 from .recipe_create import for_recipe_form_render, handle_image
 from .recipe_queries import (
     get_recipe, get_recipe_ingredients_list, get_recipe_box_product,
-    get_recipe_count, nutritional_info_valid, chk_permission_get_recipe
+    get_recipe_count, nutritional_info_valid, chk_permission_get_recipe,
+    get_similar_recipes, get_similar_nutrition_recipes
 )
 from ..constants import (
     THIS_APP, INGREDIENTS_CTX, NEW_INGREDIENT_FORM_CTX,
@@ -50,15 +61,18 @@ from ..constants import (
     INSTRUCTIONS_CTX, NEW_INSTRUCTION_FORM_CTX,
     RECIPE_ID_INSTRUCTION_NEW_ROUTE_NAME, COUNT_OPTIONS_CTX,
     SELECTED_COUNT_CTX, CUSTOM_COUNT_CTX, CCY_SYMBOL_CTX, UNIT_PRICE_CTX,
-    QUANTITY_FIELD, NEXT_QUERY, INGREDIENT_LIST_CTX, RECIPE_COUNT_CTX,
+    QUANTITY_FIELD, NEXT_QUERY, RECIPE_COUNT_CTX,
     CAN_PURCHASE_CTX, IS_OWN_CTX, NUTRITIONAL_INFO_CTX, RECIPE_QUERY,
-    RECIPE_FORM_CTX, INGREDIENT_ID_MAP_CTX, RECIPES_ROUTE_NAME, CALL_TO_BUY_CTX
+    RECIPE_FORM_CTX, RECIPES_ROUTE_NAME, CALL_TO_BUY_CTX, SIMILAR_RECIPES_CTX,
+    SIMILAR_NUTRITION_CTX,
+    SERVINGS_QUERY, SYSTEM_QUERY, SCALE_SERVINGS_CTX, SCALE_SYSTEM_CTX,
+    SCALE_SYSTEMS_CTX, MAX_SERVINGS_CTX, ERROR_CTX
 )
 from utils import (
     Crud, app_template_path, reverse_q,
-    namespaced_url, PAGE_HEADING_CTX, TITLE_CTX, QueryOption, PATCH,
+    namespaced_url, PAGE_HEADING_CTX, TITLE_CTX, QueryOption, PATCH, GET,
     redirect_payload, redirect_on_success_or_render,
-    entity_delete_result_payload
+    entity_delete_result_payload, table_versions, permission_snapshot
 )
 from .utils import recipe_permission_check, encode_timedelta
 from ..constants import RECIPE_ID_ROUTE_NAME, RECIPE_DTO_CTX
@@ -66,7 +80,13 @@ from ..forms import (
     RecipeIngredientForm, RecipeIngredientNewForm, RecipeInstructionForm,
     RecipeForm
 )
-from ..models import Recipe, Instruction, Ingredient
+from ..models import (
+    Recipe, Instruction, Category, Keyword, SimilarRecipe, Measure,
+    Ingredient
+)
+from ..scaling import (
+    SCALE_SYSTEMS, ScaleError, parse_scale_args, scale_recipe
+)
 
 TITLE_UPDATE = 'Update Recipe'
 
@@ -95,6 +115,92 @@ CALL_TO_BUY = [
     "ingredient boxes are on the way.",
 ]
 
+# measurement system options for recipe scaling; value and label
+SCALE_SYSTEM_OPTIONS = [('', 'As written')] + [
+    (value, label) for value, label in Measure.SYSTEM_CHOICES
+    if value in SCALE_SYSTEMS
+]
+
+
+# writes to these tables change the content of recipe detail pages, in
+# addition to the recipe itself, see Recipe.updated
+DETAIL_TABLES = [
+    Recipe, Category, Keyword, SimilarRecipe, OrderProduct, Currency,
+    Ingredient, Measure, Instruction, Recipe.instructions.through
+]
+
+
+def detail_validators(request: HttpRequest, pk: int) -> Optional[str]:
+    """
+    Get the validator for a conditional GET of a recipe detail page. The
+    ETag is derived from the recipe revision, the viewer (including their
+    permissions and basket), and the versions of the other tables displayed
+    on the page.
+    Note: no Last-Modified validator is provided, as the recipe revision does
+    not reflect changes to the viewer, so a request with only
+    If-Modified-Since could be answered with a stale page.
+    :param request: http request
+    :param pk: id of recipe
+    :return: ETag, or None if the response may not be conditional
+    """
+    revision = Recipe.objects.filter(
+        **Recipe.id_field_query(pk)
+    ).values_list(Recipe.UPDATED_FIELD, flat=True).first()
+    if revision is None or len(get_messages(request)):
+        # not found, or pending messages to display
+        return None
+
+    user = request.user
+    basket, _ = get_session_basket(request)
+    parts = [
+        pk, revision.isoformat(),
+        # session key is cycled on login, csrf secret is rotated on login
+        user.pk, request.session.session_key,
+        request.META.get('CSRF_COOKIE'), user.username,
+        str(user.avatar), user.is_superuser,
+        sorted(permission_snapshot(user)),
+        sorted(navbar_basket_context(basket).items()),
+        # e.g. scaling arguments
+        sorted(request.GET.items()),
+        table_versions(DETAIL_TABLES),
+    ]
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def set_validators(response: HttpResponse, etag: str) -> HttpResponse:
+    """
+    Set the conditional GET validators of a response
+    :param response: response to update
+    :param etag: quoted ETag
+    :return: updated response
+    """
+    response.headers['ETag'] = etag
+    # always revalidate, content is viewer-specific
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def scale_recipe_dto(recipe_dto: RecipeDto, servings: Optional[int],
+                     system: Optional[str]):
+    """
+    Scale the ingredients of a recipe DTO
+    :param recipe_dto: DTO to update
+    :param servings: number of servings or None to keep recipe servings
+    :param system: system to convert to, or None to keep the measures'
+                systems
+    :raises BadRequest: if the recipe can not be scaled
+    """
+    try:
+        scaled = scale_recipe(recipe_dto.id, servings=servings, system=system)
+    except ScaleError as exc:
+        raise BadRequest(str(exc)) from exc
+
+    scaled = {ingredient.id: ingredient for ingredient in scaled or []}
+    for ingredient in recipe_dto.ingredients:
+        if ingredient.id in scaled:
+            ingredient.quantity = scaled[ingredient.id].quantity
+            ingredient.measure = scaled[ingredient.id].measure
+
 
 class RecipeDetail(LoginRequiredMixin, View):
     """
@@ -113,7 +219,24 @@ class RecipeDetail(LoginRequiredMixin, View):
         """
         recipe_permission_check(request, Crud.READ)
 
+        etag = detail_validators(request, pk)
+        if etag:
+            etag = quote_etag(etag)
+            response = get_conditional_response(request, etag=etag)
+            if response is not None:
+                # not modified or precondition failed
+                return set_validators(response, etag)
+
+        try:
+            servings, system = parse_scale_args(
+                request.GET.get(SERVINGS_QUERY),
+                request.GET.get(SYSTEM_QUERY))
+        except ScaleError as exc:
+            raise BadRequest(str(exc)) from exc
+
         recipe_dto = RecipeDto.from_id(pk, nutri_text=True)
+        if servings or system:
+            scale_recipe_dto(recipe_dto, servings, system)
 
         box_product, currency = get_recipe_box_product(pk, get_or_404=False)
 
@@ -121,6 +244,7 @@ class RecipeDetail(LoginRequiredMixin, View):
         can_purchase = box_product is not None
         can_delete = is_own or recipe_permission_check(
             request, Crud.DELETE, raise_ex=False)
+        nutritional_info = nutritional_info_valid(recipe_dto.id)
 
         context = {
             TITLE_CTX: recipe_dto.name,
@@ -128,7 +252,16 @@ class RecipeDetail(LoginRequiredMixin, View):
             RECIPE_COUNT_CTX: get_recipe_count(recipe_dto.author.username),
             CAN_PURCHASE_CTX: can_purchase,
             IS_OWN_CTX: is_own,
-            NUTRITIONAL_INFO_CTX: nutritional_info_valid(recipe_dto.id),
+            NUTRITIONAL_INFO_CTX: nutritional_info,
+            SIMILAR_NUTRITION_CTX: get_similar_nutrition_recipes(
+                recipe_dto.id, settings.SIMILAR_RECIPES_LIMIT
+            ) if nutritional_info else [],
+            SIMILAR_RECIPES_CTX: get_similar_recipes(
+                recipe_dto.id, settings.SIMILAR_RECIPES_LIMIT),
+            SCALE_SERVINGS_CTX: servings or recipe_dto.servings,
+            SCALE_SYSTEM_CTX: system or '',
+            SCALE_SYSTEMS_CTX: SCALE_SYSTEM_OPTIONS,
+            MAX_SERVINGS_CTX: settings.RECIPE_SCALE_MAX_SERVINGS,
         }
         if can_purchase:
             context.update({
@@ -146,10 +279,13 @@ class RecipeDetail(LoginRequiredMixin, View):
                 )
             })
 
-        return render(
+        response = render(
             request, app_template_path(THIS_APP, 'recipe_view.html'),
             context=context
         )
+        if etag:
+            set_validators(response, etag)
+        return response
 
     def delete(self, request: HttpRequest, pk: int,
                *args, **kwargs) -> HttpResponse:
@@ -333,19 +469,6 @@ class RecipeDetailUpdate(LoginRequiredMixin, View):
                     ingredients)
             ),
             NEW_INGREDIENT_FORM_CTX: new_form,
-            INGREDIENT_LIST_CTX: list(
-                map(lambda ingred: ingred.name,
-                    Ingredient.objects.order_by(Ingredient.NAME_FIELD).all())
-            ),
-            # Due to mixed html entity encoding on ingredient names from the
-            # kaggle dataset, can't look up ingredient by name, so provide a
-            # map with unescaped name as the key and id as the value, so id
-            # may be used as the returned value
-            INGREDIENT_ID_MAP_CTX: {
-                iname: ikey for iname, ikey in map(
-                    lambda ingred: (unescape_entities(ingred.name), ingred.id),
-                    Ingredient.objects.order_by(Ingredient.NAME_FIELD).all())
-            },
             NEW_URL_CTX: reverse_q(
                 namespaced_url(THIS_APP, RECIPE_ID_INGREDIENT_NEW_ROUTE_NAME),
                 args=[recipe.id]
@@ -446,3 +569,38 @@ def add_recipe_to_basket(request: HttpRequest, pk: int) -> HttpResponse:
 
     return JsonResponse(
         payload, status=HTTPStatus.OK if payload else HTTPStatus.BAD_REQUEST)
+
+
+@login_required
+@require_http_methods([GET])
+def recipe_scale(request: HttpRequest, pk: int) -> HttpResponse:
+    """
+    View function to get the ingredients of a recipe scaled to a number of
+    servings, e.g. '/recipes/1/scale/?servings=8&system=si'
+    :param request: http request
+    :param pk: id of recipe
+    :return: response
+    """
+    recipe_permission_check(request, Crud.READ)
+
+    status = HTTPStatus.OK
+    try:
+        servings, system = parse_scale_args(
+            request.GET.get(SERVINGS_QUERY), request.GET.get(SYSTEM_QUERY))
+        scaled = scale_recipe(pk, servings=servings, system=system)
+        if scaled is None:
+            status = HTTPStatus.NOT_FOUND
+            payload = {}
+        else:
+            payload = {
+                SERVINGS_QUERY: servings,
+                SYSTEM_QUERY: system,
+                INGREDIENTS_CTX: [asdict(entry) for entry in scaled]
+            }
+    except ScaleError as exc:
+        status = HTTPStatus.BAD_REQUEST
+        payload = {
+            ERROR_CTX: str(exc)
+        }
+
+    return JsonResponse(payload, status=status)
@@ -37,11 +37,11 @@ from utils import (
 from recipes.constants import (
     THIS_APP, RECIPE_NEW_ROUTE_NAME,
     RECIPE_FORM_CTX, RECIPE_FORM_RHS_FIELDS_CTX,
-    RECIPE_URL_CTX, IMAGE_FILE_TYPES_CTX, CATEGORY_LIST_CTX,
+    RECIPE_URL_CTX, IMAGE_FILE_TYPES_CTX,
     RECIPE_ID_ROUTE_NAME
 )
 from recipes.forms import RecipeForm
-from recipes.models import Recipe, Category
+from recipes.models import Recipe
 from .dto import RecipeDto
 
 from .utils import recipe_permission_check
@@ -171,10 +171,6 @@ def for_recipe_form_render(
             # ImageField in dev mode
             IMAGE_FILE_TYPES_CTX:
                 DEV_IMAGE_FILE_TYPES if DEVELOPMENT else IMAGE_FILE_TYPES,
-            CATEGORY_LIST_CTX: list(
-                map(lambda category: category.name,
-                    Category.objects.order_by(Category.NAME_FIELD).all())
-            ),
             SUBMIT_URL_CTX: kwargs.get(SUBMIT_URL_CTX, None)
         })
 
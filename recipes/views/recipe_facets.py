@@ -0,0 +1,204 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, List, Optional, Type, Union
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, QuerySet, Model
+
+from utils import SEARCH_QUERY, namespaced_url, reverse_q, queryset_key
+
+from recipes.constants import (
+    THIS_APP, RECIPE_SEARCH_ROUTE_NAME, CATEGORY_QUERY, KEYWORD_QUERY
+)
+from recipes.models import Recipe, Category, Keyword
+
+FACETS_KEY = 'facets'
+# number of category/keyword facet entries
+FACET_TOP_N = 8
+
+CATEGORY_NAME_LOOKUP = f'{Recipe.CATEGORY_FIELD}__{Category.NAME_FIELD}'
+KEYWORD_NAME_LOOKUP = f'{Recipe.KEYWORDS_FIELD}__{Keyword.NAME_FIELD}'
+COUNT_ANNOTATION = 'facet_count'
+
+
+@dataclass
+class FacetBucket:
+    """ Class representing a range of values for a facet """
+    label: str
+    """ Display label """
+    lower: Any
+    """ Inclusive lower bound, or None if unbounded """
+    upper: Any
+    """ Exclusive upper bound, or None if unbounded """
+
+    def q(self, lookup: str) -> Q:
+        """
+        Get the query for values in this bucket
+        :param lookup: field lookup
+        :return: query
+        """
+        query = Q()
+        if self.lower is not None:
+            query &= Q(**{f'{lookup}__gte': self.lower})
+        if self.upper is not None:
+            query &= Q(**{f'{lookup}__lt': self.upper})
+        return query
+
+
+PREP_TIME_BUCKETS = [
+    FacetBucket('Under 15 mins', None, timedelta(minutes=15)),
+    FacetBucket('15-30 mins', timedelta(minutes=15), timedelta(minutes=30)),
+    FacetBucket('30-60 mins', timedelta(minutes=30), timedelta(hours=1)),
+    FacetBucket('Over 1 hr', timedelta(hours=1), None),
+]
+CALORIE_BUCKETS = [
+    FacetBucket('Under 300 kcal', None, 300),
+    FacetBucket('300-600 kcal', 300, 600),
+    FacetBucket('600-900 kcal', 600, 900),
+    FacetBucket('Over 900 kcal', 900, None),
+]
+
+
+@dataclass
+class FacetEntry:
+    """ Class representing a facet entry """
+    label: str
+    """ Display label """
+    count: int
+    """ Number of results """
+    href: Optional[str] = None
+    """ Url to refine search by entry """
+
+
+@dataclass
+class RecipeFacets:
+    """ Class representing facet counts for a recipe result set """
+    categories: List[FacetEntry] = field(default_factory=list)
+    keywords: List[FacetEntry] = field(default_factory=list)
+    prep_time: List[FacetEntry] = field(default_factory=list)
+    calories: List[FacetEntry] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        """ Check if there are no facet entries with results """
+        return not any(
+            entry.count for entries in [
+                self.categories, self.keywords, self.prep_time, self.calories
+            ] for entry in entries
+        )
+
+    def add_links(self, search: Optional[str], query: Optional[str] = None):
+        """
+        Add links to refine the specified search to the category and
+        keyword facets
+        :param search: current search
+        :param query: other current query arguments; default None
+        """
+        search = f'{search} ' if search else ''
+        url = reverse_q(namespaced_url(THIS_APP, RECIPE_SEARCH_ROUTE_NAME))
+        url = f'{url}?{query}&' if query else f'{url}?'
+        for query, entries in [
+            (CATEGORY_QUERY, self.categories),
+            (KEYWORD_QUERY, self.keywords),
+        ]:
+            for entry in entries:
+                term = f'{search}{query}="{entry.label}"'
+                entry.href = f'{url}{SEARCH_QUERY}={quote(term)}'
+
+
+def get_recipe_facets(
+    query_set: QuerySet, ids: Optional[List[int]] = None,
+    tables: List[Union[str, Type[Model]]] = None
+) -> RecipeFacets:
+    """
+    Get the facet counts for a recipe result set, from the cache if
+    available. Facets are cached using the same versioned key scheme as
+    the result ids, so are invalidated by the same writes.
+    :param query_set: recipe query set
+    :param ids: ids of recipes in result set if available; default None
+    :param tables: additional tables whose writes invalidate the facets;
+                default None
+    :return: facets
+    """
+    # ordering doesn't affect facets, so exclude from key
+    query_set = query_set.order_by()
+    key = queryset_key(FACETS_KEY, query_set=query_set, tables=tables)
+    facets = cache.get(key)
+    if facets is None:
+        facets = _recipe_facets(
+            Recipe.objects.filter(**{
+                f'{Recipe.id_field()}__in':
+                    ids if ids is not None else query_set.values(
+                        Recipe.id_field())
+            })
+        )
+        cache.set(
+            key, facets, timeout=settings.RESULT_IDS_CACHE_TIMEOUT)
+    return facets
+
+
+def _recipe_facets(recipes: QuerySet) -> RecipeFacets:
+    """
+    Calculate the facet counts for a recipe result set.
+    Runs a fixed number of aggregate queries regardless of result set size
+    :param recipes: recipes query set
+    :return: facets
+    """
+    # prep time & calorie buckets in one conditional aggregate pass
+    bucket_aggs = {}
+    for name, lookup, buckets in [
+        ('prep', Recipe.PREP_TIME_FIELD, PREP_TIME_BUCKETS),
+        ('cal', Recipe.CALORIES_FIELD, CALORIE_BUCKETS),
+    ]:
+        for idx, bucket in enumerate(buckets):
+            bucket_aggs[f'{name}{idx}'] = Count(
+                Recipe.id_field(), filter=bucket.q(lookup))
+    counts = recipes.aggregate(**bucket_aggs)
+
+    def top_n(query_set: QuerySet, lookup: str) -> List[FacetEntry]:
+        """ Get the most common values of lookup """
+        return [
+            FacetEntry(label=entry[lookup], count=entry[COUNT_ANNOTATION])
+            for entry in query_set.filter(**{
+                f'{lookup}__isnull': False
+            }).values(lookup).annotate(**{
+                COUNT_ANNOTATION: Count(Recipe.id_field(), distinct=True)
+            }).order_by(f'-{COUNT_ANNOTATION}', lookup)[:FACET_TOP_N]
+        ]
+
+    return RecipeFacets(
+        categories=top_n(recipes, CATEGORY_NAME_LOOKUP),
+        keywords=top_n(recipes, KEYWORD_NAME_LOOKUP),
+        prep_time=[
+            FacetEntry(label=bucket.label, count=counts[f'prep{idx}'])
+            for idx, bucket in enumerate(PREP_TIME_BUCKETS)
+        ],
+        calories=[
+            FacetEntry(label=bucket.label, count=counts[f'cal{idx}'])
+            for idx, bucket in enumerate(CALORIE_BUCKETS)
+        ],
+    )
@@ -19,7 +19,7 @@
 #  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
-from random import choice, randint
+from random import choice
 from string import capwords
 
 from django.contrib.auth.decorators import login_required
@@ -30,12 +30,11 @@ from django.views.decorators.http import require_http_methods
 
 from base.views import CarouselItem, CAROUSEL_LIST_CTX
 from .dto import RecipeDto
-from .recipe_queries import (
-    get_recipe_by_category_keyword
-)
 from ..constants import (
     THIS_APP, TAGLINE_CTX, RECIPE_LIST_CTX
 )
+from ..models import Recipe
+from ..sampling import sample_recipes
 from utils import (
     Crud, app_template_path, TITLE_CTX, GET
 )
@@ -46,9 +45,6 @@ TITLE = 'Home'
 TAGLINES = [
     "{} tonight?", "Craving {}?", "How about {}?",
 ]
-SEARCH_TERMS = [
-    'chicken', 'beef', 'tuna', 'vegan'
-]
 RECIPES_PER_PAGE = 2
 
 
@@ -62,27 +58,13 @@ def recipe_home(request: HttpRequest) -> HttpResponse:
     """
     recipe_permission_check(request, Crud.READ)
 
-    count = 0
-    while not count:
-        search_term = choice(SEARCH_TERMS)
-        recipes = get_recipe_by_category_keyword(
-            category_name=search_term, keyword_name=search_term)
-        count = recipes.count()
-
-    added_indices = set()
+    search_term, ids = sample_recipes(RECIPES_PER_PAGE)
 
-    def pick_index():
-        while len(added_indices) < RECIPES_PER_PAGE:
-            index = randint(0, count - 1)
-            if index not in added_indices:
-                added_indices.add(index)
-        return list(added_indices)
-
-    indices = [idx for idx in range(count)] \
-        if count <= RECIPES_PER_PAGE else pick_index()
-    recipe_list = [
-        RecipeDto.from_model(recipes[idx]) for idx in indices
-    ]
+    # fetch all picks, and their images, in one batch
+    recipes = Recipe.objects.in_bulk(ids)
+    recipe_list = RecipeDto.from_queryset(
+        [recipes[pk] for pk in ids if pk in recipes], Recipe.IMAGES_FIELD,
+        all_attrib=False)
 
     def carousel_item(r_dto):
         tagline = choice(TAGLINES).format(capwords(search_term))
@@ -99,7 +81,8 @@ def recipe_home(request: HttpRequest) -> HttpResponse:
 
     context = {
         TITLE_CTX: 'Recipe Home',
-        TAGLINE_CTX: choice(TAGLINES).format(capwords(search_term)),
+        TAGLINE_CTX: choice(TAGLINES).format(capwords(search_term))
+        if search_term else '',
         RECIPE_LIST_CTX: recipe_list,
         CAROUSEL_LIST_CTX: carousel_list,
     }
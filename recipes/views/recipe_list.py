@@ -25,7 +25,7 @@ from typing import Type, Callable, Tuple, Optional, List
 from string import capwords
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import F
+from django.db.models import Model, QuerySet
 from django.http import HttpRequest
 from django.template.loader import render_to_string
 
@@ -37,24 +37,28 @@ from utils import (
     Crud, app_template_path, ORDER_QUERY, PAGE_QUERY, PER_PAGE_QUERY, PerPage8,
     REORDER_QUERY, REORDER_REQ_QUERY_ARGS,
     READ_ONLY_CTX, REPEAT_SEARCH_TERM_CTX,
-    query_search_term, LIST_SUB_HEADING_CTX, ChoiceArg
+    query_search_term, LIST_SUB_HEADING_CTX, ChoiceArg, ResultIdList
 )
 from utils.content_list_mixin import SELECTED_SORT_CTX
+from utils.paginator import CountStrategy
 from utils.search import SEARCH_QUERY, USER_QUERY
 
 from recipes.constants import (
     THIS_APP, RECIPE_LIST_CTX, AUTHOR_QUERY, KEYWORD_QUERY, TIME_CTX,
-    CATEGORY_QUERY, CATEGORY_CTX, AUTHOR_CTX, INGREDIENT_QUERY
+    CATEGORY_QUERY, CATEGORY_CTX, AUTHOR_CTX, INGREDIENT_QUERY, FACETS_CTX,
+    PANTRY_QUERY, RECIPE_CARDS_CTX
 )
 from recipes.views.utils import (
     recipe_permission_check
 )
 from recipes.views.recipe_queries import (
-    get_lookup, FILTERS_ORDER, ALWAYS_FILTERS
+    get_lookup, FILTERS_ORDER, ALWAYS_FILTERS, recipe_card_projection
 )
-from .dto import RecipeDto
+from .card_cache import render_recipe_cards
+from .dto import RecipeCardDto
+from .recipe_facets import get_recipe_facets
 from ..enums import RecipeSortOrder, RecipeQueryType
-from ..models import Recipe
+from ..models import Recipe, Keyword, Ingredient, RecipeIngredient
 
 
 # args for an address reorder/next page/etc. request
@@ -75,7 +79,7 @@ LIST_QUERY_ARGS.extend([
     # non-reorder query args
     QueryOption.of_no_cls_dflt(query) for query in [
         SEARCH_QUERY, KEYWORD_QUERY, INGREDIENT_QUERY, CATEGORY_QUERY,
-        AUTHOR_QUERY, USER_QUERY,
+        AUTHOR_QUERY, USER_QUERY, PANTRY_QUERY,
     ]
 ])
 # request arguments for an opinion search request
@@ -207,17 +211,6 @@ class RecipeList(LoginRequiredMixin, ContentListMixin):
 
         query_entered = False  # query term entered flag
 
-        if self.query_value_was_set_as_one_of_values(
-                query_params, ORDER_QUERY, [
-                    RecipeSortOrder.TOTAL_TIME_LH,
-                    RecipeSortOrder.TOTAL_TIME_HL
-                ]):
-            # add total time annotation as needed for ordering
-            query_set_params.add_annotation(
-                ORDER_QUERY, Recipe.TOTAL_TIME_FIELD,
-                F(Recipe.PREP_TIME_FIELD) + F(Recipe.COOK_TIME_FIELD)
-            )
-
         for key in FILTERS_ORDER:
             value, was_set = query_params[key].as_tuple
 
@@ -268,6 +261,50 @@ class RecipeList(LoginRequiredMixin, ContentListMixin):
             # invalid query term entered
             self.queryset = Recipe.objects.none()
 
+    def project_queryset(self, query_set: QuerySet) -> QuerySet:
+        """
+        Restrict the query set used to retrieve the rows for the requested
+        page to the fields displayed on recipe cards
+        :param query_set: query set to restrict
+        :return: restricted query set
+        """
+        return recipe_card_projection(query_set)
+
+    def get_result_ids_tables(self) -> Optional[List[Type[Model]]]:
+        """
+        Get the additional tables whose writes invalidate the cached list of
+        result ids for the current request
+        :return: list of tables, or None to not cache
+        """
+        # all recipes list is well served by estimated counts and limited
+        # queries, so only cache search/filter results
+        return None if self.is_unfiltered() else [
+                # keyword and ingredient queries use subqueries
+                Recipe, Keyword, Ingredient, Recipe.keywords.through,
+                RecipeIngredient
+            ]
+
+    def get_count_strategy(self) -> CountStrategy:
+        """
+        Get the strategy to use when counting the list for pagination
+        :return: count strategy
+        """
+        # all recipes list is a count of the whole table
+        return CountStrategy.ESTIMATED if self.is_unfiltered() else \
+            CountStrategy.CACHED
+
+    def is_unfiltered(self) -> bool:
+        """
+        Check if the current request is for a list of all recipes
+        :return: True if all recipes
+        """
+        params = self.query_set_params
+        # annotations for ordering don't affect the rows in the list, and
+        # an invalid query term results in an empty queryset
+        return params is not None and not params.is_none and \
+            params.and_count + params.or_count + params.qs_func_count == 0 \
+            and not self.queryset.query.is_empty()
+
     def set_sort_order_options(self, query_params: dict[str, QueryArg]):
         """
         Set the sort order options for the response
@@ -323,11 +360,10 @@ class RecipeList(LoginRequiredMixin, ContentListMixin):
             context[PAGE_HEADING_CTX] = context[LIST_HEADING_CTX]
             del context[LIST_HEADING_CTX]
 
-        dto_list = [
-            RecipeDto.from_model(recipe)
+        context[RECIPE_LIST_CTX] = [
+            RecipeCardDto.from_model(recipe)
             for recipe in context[RECIPE_LIST_CTX]
         ]
-        context[RECIPE_LIST_CTX] = dto_list
 
         context[TIME_CTX] = 'prep' if context[SELECTED_SORT_CTX] in [
             RecipeSortOrder.PREP_TIME_LH, RecipeSortOrder.PREP_TIME_HL
@@ -335,6 +371,9 @@ class RecipeList(LoginRequiredMixin, ContentListMixin):
             RecipeSortOrder.COOK_TIME_LH, RecipeSortOrder.COOK_TIME_HL,
         ] else 'total'
 
+        context[RECIPE_CARDS_CTX] = render_recipe_cards(
+            context[RECIPE_LIST_CTX], context[TIME_CTX])
+
         return self.add_no_content_context(context)
 
     def add_no_content_context(self, context: dict) -> dict:
@@ -382,6 +421,12 @@ class SearchRecipeList(RecipeList):
     Class-based view for recipe search
     """
 
+    def __init__(self):
+        super().__init__()
+        # search terms to refine with facets
+        self.search_value = None
+        self.refine_query = None
+
     def valid_req_query_args(self) -> List[QueryOption]:
         """
         Get the valid request query args
@@ -453,6 +498,34 @@ class SearchRecipeList(RecipeList):
                 query_params, exclude_queries=REORDER_REQ_QUERY_ARGS)
         }
 
+        self.search_value = query_params[SEARCH_QUERY].value
+        self.refine_query = query_search_term(
+            query_params,
+            exclude_queries=REORDER_REQ_QUERY_ARGS + [SEARCH_QUERY])
+
+    def get_context_data(self, *, object_list=None, **kwargs) -> dict:
+        """
+        Get template context
+        :param object_list:
+        :param kwargs: additional keyword arguments
+        :return: context
+        """
+        context = super().get_context_data(object_list=object_list, **kwargs)
+
+        if not self.is_list_only_template() and \
+                not self.has_no_content(context):
+            # facets are only displayed on the full page
+            facets = get_recipe_facets(
+                self.queryset,
+                ids=self.object_list.ids
+                if isinstance(self.object_list, ResultIdList) and
+                self.object_list.is_complete else None,
+                tables=self.get_result_ids_tables())
+            facets.add_links(self.search_value, query=self.refine_query)
+            context[FACETS_CTX] = facets
+
+        return context
+
     def add_no_content_context(self, context: dict) -> dict:
         """
         Add no content-specific info to context
@@ -462,6 +535,7 @@ class SearchRecipeList(RecipeList):
         super().add_no_content_context(context)
         if self.has_no_content(context):
             self.render_no_content_help(
-                context, "see_search_terms_help_msg.html")
+                context, app_template_path(
+                    THIS_APP, "messages", "see_search_terms_help_msg.html"))
 
         return context
@@ -20,12 +20,13 @@
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
 #
-from datetime import datetime
 from enum import Enum, auto
 from typing import Any, Optional, Tuple, List, Union
-from zoneinfo import ZoneInfo
 
-from django.db.models import Q, QuerySet, Prefetch, Model
+from django.conf import settings
+from django.db.models import (
+    Q, QuerySet, Prefetch, Model, OuterRef, Subquery
+)
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
 
@@ -33,29 +34,28 @@ from base.utils import raise_permission_denied
 from checkout.models import Currency
 from order.models import OrderProduct
 from recipes.constants import (
-    KEYWORD_QUERY, CATEGORY_QUERY, AUTHOR_QUERY, INGREDIENT_QUERY
+    KEYWORD_QUERY, CATEGORY_QUERY, AUTHOR_QUERY, INGREDIENT_QUERY,
+    PANTRY_QUERY, CALORIES_QUERY, FAT_QUERY, SATURATED_FAT_QUERY,
+    CHOLESTEROL_QUERY, SODIUM_QUERY, CARBOHYDRATE_QUERY, FIBRE_QUERY,
+    SUGAR_QUERY, PROTEIN_QUERY, NUTRITION_QUERY
 )
 from recipes.models import (
-    Recipe, Ingredient, Instruction, RecipeIngredient, Keyword, Category
+    Recipe, Ingredient, Instruction, RecipeIngredient, Keyword, Category,
+    SimilarRecipe, Image
 )
+from recipes.nutrition import filter_recipes_by_nutrition
+from recipes.nutrition_neighbours import similar_nutrition
+from recipes.pantry import rank_recipes_by_pantry
 from recipes.views.utils import recipe_permission_check
 from user.models import User
 from utils import (
-    SEARCH_QUERY, DATE_QUERIES,
-    regex_matchers, regex_date_matchers, QuerySetParams,
-    TERM_GROUP, KEY_TERM_GROUP, DATE_QUERY_GROUP, DATE_KEY_TERM_GROUP,
-    DATE_QUERY_YR_GROUP, DATE_QUERY_MTH_GROUP,
-    DATE_QUERY_DAY_GROUP, USER_QUERY, get_object_and_related_or_404, Crud
+    SEARCH_QUERY, QuerySetParams, USER_QUERY, get_object_and_related_or_404,
+    Crud, range_lookup, RANGE_MARKER_CHARS, SearchToken, SearchTokenizer,
+    lookup_handler, cacheable_handler
 )
 from utils.query_params import SearchType, QueryTerm
 from utils.search import MARKER_CHARS
 
-NON_DATE_QUERIES = [
-    KEYWORD_QUERY, INGREDIENT_QUERY, CATEGORY_QUERY, USER_QUERY, AUTHOR_QUERY
-]
-REGEX_MATCHERS = regex_matchers(NON_DATE_QUERIES)
-REGEX_MATCHERS.update(regex_date_matchers())
-
 FIELD_LOOKUPS = {
     # query param: filter lookup
     SEARCH_QUERY: '',
@@ -66,7 +66,27 @@ FIELD_LOOKUPS = {
     AUTHOR_QUERY: f'{Recipe.AUTHOR_FIELD}__{User.USERNAME_FIELD}__icontains',
     # author username equals query param
     USER_QUERY: f'{Recipe.AUTHOR_FIELD}__{User.USERNAME_FIELD}',
+    # recipes using available ingredients
+    PANTRY_QUERY: f'{Recipe.id_field()}__in',
 }
+# separator for list of available ingredients
+PANTRY_SEPARATOR = ','
+
+NUTRITION_QUERIES = {
+    # query param: nutrition field
+    CALORIES_QUERY: Recipe.CALORIES_FIELD,
+    FAT_QUERY: Recipe.FAT_CONTENT_FIELD,
+    SATURATED_FAT_QUERY: Recipe.SATURATED_FAT_CONTENT_FIELD,
+    CHOLESTEROL_QUERY: Recipe.CHOLESTEROL_CONTENT_FIELD,
+    SODIUM_QUERY: Recipe.SODIUM_CONTENT_FIELD,
+    CARBOHYDRATE_QUERY: Recipe.CARBOHYDRATE_CONTENT_FIELD,
+    FIBRE_QUERY: Recipe.FIBRE_CONTENT_FIELD,
+    SUGAR_QUERY: Recipe.SUGAR_CONTENT_FIELD,
+    PROTEIN_QUERY: Recipe.PROTEIN_CONTENT_FIELD,
+}
+# min number of nutrition ranges in a search to use the nutrition matrix
+NUTRITION_MATRIX_MIN_RANGES = 2
+
 # priority order list of query terms
 FILTERS_ORDER = [
     # search is a shortcut filter, if search is specified nothing
@@ -83,16 +103,50 @@ FILTERS_ORDER.extend(
 NON_LOOKUP_ARGS = [
 ]
 
-SEARCH_REGEX = [
-    # regex,            query param, regex match group, key & regex match grp
-    (REGEX_MATCHERS[q], q,           TERM_GROUP,        KEY_TERM_GROUP)
-    for q in NON_DATE_QUERIES
-]
-SEARCH_REGEX.extend([
-    # regex,            query param, regex match group, key & regex match grp
-    (REGEX_MATCHERS[q], q,           DATE_QUERY_GROUP,  DATE_KEY_TERM_GROUP)
-    for q in DATE_QUERIES
-])
+
+def _name_handler(query_set_params: QuerySetParams,
+                  token: SearchToken) -> bool:
+    """
+    Search term handler for keyword, ingredient & pantry queries.
+    Note: not cacheable as pantry queries are ranked from the database
+    :param query_set_params: query params to update
+    :param token: search term
+    :return: True if successfully added
+    """
+    add_func = add_keyword_query if token.query == KEYWORD_QUERY else \
+        add_ingredient_query if token.query == INGREDIENT_QUERY else \
+        add_pantry_query
+    add_func(query_set_params, token.value)
+    return True
+
+
+@cacheable_handler
+def _nutrition_handler(query_set_params: QuerySetParams,
+                       token: SearchToken) -> bool:
+    """
+    Search term handler for nutrition range queries
+    :param query_set_params: query params to update
+    :param token: search term
+    :return: True if successfully added
+    """
+    query_set_params.add_and_lookup(
+        token.query, range_lookup(NUTRITION_QUERIES[token.query],
+                                  token.operator), float(token.value))
+    return True
+
+
+SEARCH_TOKENIZER = SearchTokenizer({
+    # query param: term handler
+    KEYWORD_QUERY: _name_handler,
+    INGREDIENT_QUERY: _name_handler,
+    PANTRY_QUERY: _name_handler,
+    CATEGORY_QUERY: lookup_handler(FIELD_LOOKUPS),
+    USER_QUERY: lookup_handler(FIELD_LOOKUPS),
+    AUTHOR_QUERY: lookup_handler(FIELD_LOOKUPS),
+}, range_handlers={
+    # query param: term handler
+    query: _nutrition_handler for query in NUTRITION_QUERIES
+})
 
 
 class QueryParam(Enum):
@@ -125,6 +179,8 @@ def get_lookup(
         add_keyword_query(query_set_params, value)
     elif query == INGREDIENT_QUERY:
         add_ingredient_query(query_set_params, value)
+    elif query == PANTRY_QUERY:
+        add_pantry_query(query_set_params, value)
     elif query not in NON_LOOKUP_ARGS and value:
         query_set_params.add_and_lookup(query, FIELD_LOOKUPS[query], value)
     # else no value or complex query term handled elsewhere
@@ -147,36 +203,14 @@ def get_search_term(
     if value is None:
         return query_set_params
 
-    for regex, query, group, key_val_group in SEARCH_REGEX:
-        match = regex.match(value)
-        if match:
-            success = True
-            if query == KEYWORD_QUERY:
-                add_keyword_query(query_set_params, match.group(group))
-            elif query == INGREDIENT_QUERY:
-                add_ingredient_query(query_set_params, match.group(group))
-            elif query in DATE_QUERIES:
-                success = get_date_query(query_set_params, query, *[
-                    match.group(idx) for idx in [
-                        DATE_QUERY_YR_GROUP, DATE_QUERY_MTH_GROUP,
-                        DATE_QUERY_DAY_GROUP
-                    ]
-                ])
-            elif query not in NON_LOOKUP_ARGS:
-                query_set_params.add_and_lookup(
-                    query, FIELD_LOOKUPS[query], match.group(group))
-            else:
-                # complex query term handled elsewhere
-                success = False
-
-            save_term_func = query_set_params.add_search_term if success \
-                else query_set_params.add_invalid_term
-            save_term_func(match.group(key_val_group))
+    SEARCH_TOKENIZER.apply(value, query_set_params)
+    add_nutrition_matrix_query(
+        query_set_params, SEARCH_TOKENIZER.tokenize(value))
 
     if query_set_params.is_empty and value:
         query_set_params.search_type = SearchType.FREE if not any(
             list(
-                map(lambda x: x in value, MARKER_CHARS)
+                map(lambda x: x in value, MARKER_CHARS + RANGE_MARKER_CHARS)
             )
         ) else SearchType.UNKNOWN
 
@@ -302,30 +336,59 @@ def add_ingredient_query(query_set_params: QuerySetParams,
                        query, key=key, query_type=query_type)
 
 
-def get_date_query(query_set_params: QuerySetParams,
-                   query: str, year: str, month: str, day: str) -> bool:
+def add_pantry_query(query_set_params: QuerySetParams, value: str,
+                     query: str = PANTRY_QUERY, key: str = None) -> None:
     """
-    Get a date query
+    Get a pantry query; recipes ranked by the fraction of their ingredients
+    covered by the available ingredients, then by the number of missing
+    ingredients
     :param query_set_params: query params to update
+    :param value: comma-separated list of available ingredient names or
+                parts thereof
     :param query: query key
-    :param year: year
-    :param month: month
-    :param day: day
-    :return: True if successfully added
+    :param key: query params key; default same as query key
     """
-    success = True
-    try:
-        date = datetime(
-            int(year), int(month), int(day), tzinfo=ZoneInfo("UTC")
-        )
-        query_set_params.add_and_lookup(
-            query, FIELD_LOOKUPS[query], date)
-    except ValueError:
-        # ignore invalid date
-        # TODO add errors to QuerySetParams
-        # so they can be returned to user
-        success = False
-    return success
+    if not key:
+        key = query
+    names = [
+        name.strip() for name in value.split(PANTRY_SEPARATOR)
+        if name.strip()
+    ]
+    # ingredients with names like any of the available ingredients, as per
+    # `add_ingredient_query`
+    ingredient_ids = Ingredient.objects.filter(
+        Q(_connector=Q.OR, *[
+            Q(**{f'{Ingredient.NAME_FIELD}__icontains': name})
+            for name in names
+        ])
+    ).values_list(Ingredient.id_field(), flat=True) if names else []
+
+    query_set_params.set_ranked_ids(
+        key, FIELD_LOOKUPS[query], rank_recipes_by_pantry(
+            ingredient_ids, limit=settings.RESULT_IDS_CACHE_MAX))
+
+
+def add_nutrition_matrix_query(query_set_params: QuerySetParams,
+                               tokens: Tuple[SearchToken, ...]) -> None:
+    """
+    Add a nutrition matrix query for the range terms, e.g. 'cal<500', in the
+    specified search terms
+    :param query_set_params: query params to update
+    :param tokens: search terms
+    """
+    ranges = [
+        (NUTRITION_QUERIES[token.query], token.operator, float(token.value))
+        for token in tokens if token.is_range
+    ]
+    if len(ranges) >= NUTRITION_MATRIX_MIN_RANGES:
+        # evaluate all the ranges in one pass over the nutrition matrix, and
+        # if the result is small enough restrict the query to its ids; the
+        # range lookups are retained so results are always correct
+        ids = filter_recipes_by_nutrition(ranges)
+        if ids is not None and len(ids) <= settings.RESULT_IDS_CACHE_MAX:
+            query_set_params.add_qs_func(
+                NUTRITION_QUERY,
+                lambda qs: qs.filter(**{f'{Recipe.id_field()}__in': ids}))
 
 
 def _get_recipe_contents(
@@ -500,6 +563,65 @@ def get_recipe_count(user: Union[User, int, str]) -> int:
     }).count()
 
 
+MAIN_IMAGE_URL = 'main_image_url'   # annotation of url of first image
+
+
+def recipe_card_projection(query_set: QuerySet) -> QuerySet:
+    """
+    Restrict a recipe query set to the fields displayed on recipe list
+    cards, with the url of each recipe's first image as an annotation
+    :param query_set: query set to restrict
+    :return: restricted query set
+    """
+    return query_set.select_related(Recipe.AUTHOR_FIELD).only(
+        Recipe.id_field(), Recipe.NAME_FIELD, Recipe.PREP_TIME_FIELD,
+        Recipe.COOK_TIME_FIELD, Recipe.TOTAL_TIME_FIELD,
+        Recipe.PICTURE_FIELD, Recipe.UPDATED_FIELD,
+        f'{Recipe.AUTHOR_FIELD}__{User.USERNAME_FIELD}'
+    ).annotate(**{
+        MAIN_IMAGE_URL: Subquery(
+            Image.objects.filter(**{
+                f'{Image.RECIPE_FIELD}': OuterRef(Recipe.id_field())
+            }).order_by(Image.id_field()).values(Image.URL_FIELD)[:1]
+        )
+    })
+
+
+def get_similar_recipes(pk: int, limit: int) -> List[Recipe]:
+    """
+    Get the most similar recipes of the specified recipe, as precomputed by
+    the 'similar_recipes' management command
+    :param pk: id of recipe
+    :param limit: max number of recipes
+    :return: list of recipes, most similar first
+    """
+    return [
+        similar.similar for similar in SimilarRecipe.objects.select_related(
+            SimilarRecipe.SIMILAR_FIELD
+        ).filter(**{
+            f'{SimilarRecipe.RECIPE_FIELD}_id': pk
+        }).order_by(f'-{SimilarRecipe.SCORE_FIELD}')[:limit]
+    ]
+
+
+def get_similar_nutrition_recipes(pk: int, limit: int) -> List[Recipe]:
+    """
+    Get the recipes with the most similar nutrition profiles to the
+    specified recipe
+    :param pk: id of recipe
+    :param limit: max number of recipes
+    :return: list of recipes, most similar first
+    """
+    similar_ids = [
+        recipe_id for recipe_id, _ in similar_nutrition(pk, k=limit)
+    ]
+    recipes = Recipe.objects.only(Recipe.NAME_FIELD).in_bulk(similar_ids)
+    return [
+        recipes[recipe_id] for recipe_id in similar_ids
+        if recipe_id in recipes
+    ]
+
+
 def nutritional_info_valid(pk: int) -> bool:
     """
     Check the nutritional info for a recipe is valid
@@ -0,0 +1,79 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from collections import Counter
+from dataclasses import asdict
+from http import HTTPStatus
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.http import require_http_methods
+
+from checkout.basket import basket_recipe_counts, get_session_basket
+from utils import Crud, GET
+from utils.misc import is_boolean_true
+
+from .utils import recipe_permission_check
+from ..constants import IDS_QUERY, BASKET_QUERY, ERROR_CTX
+from ..shopping import aggregate_ingredients
+
+ITEMS_CTX = 'items'         # list of shopping items
+
+
+@login_required
+@require_http_methods([GET])
+def shopping_list(request: HttpRequest) -> HttpResponse:
+    """
+    View function to get a shopping list of the total ingredients of
+    recipes, e.g. '/recipes/shopping_list/?ids=1,2,2&basket=y' for one of
+    recipe 1, two of recipe 2 and the ingredient boxes in the basket
+    :param request: http request
+    :return: response
+    """
+    recipe_permission_check(request, Crud.READ)
+
+    try:
+        counts = Counter(
+            int(pk) for pk in request.GET.get(IDS_QUERY, '').split(',')
+            if pk.strip()
+        )
+    except ValueError:
+        return JsonResponse({
+            ERROR_CTX: 'Invalid recipe ids'
+        }, status=HTTPStatus.BAD_REQUEST)
+
+    if is_boolean_true(request.GET.get(BASKET_QUERY, '')):
+        basket, _ = get_session_basket(request)
+        counts.update(basket_recipe_counts(basket))
+
+    if len(counts) > settings.SHOPPING_LIST_MAX_RECIPES:
+        return JsonResponse({
+            ERROR_CTX: f'Maximum of {settings.SHOPPING_LIST_MAX_RECIPES} '
+                       f'recipes exceeded'
+        }, status=HTTPStatus.BAD_REQUEST)
+
+    items = aggregate_ingredients(counts) if counts else []
+
+    return JsonResponse({
+        ITEMS_CTX: [asdict(item) for item in items]
+    }, status=HTTPStatus.OK)
@@ -239,6 +239,9 @@ MIDDLEWARE.extend([
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # resolve the request url once for the following middleware and the
+    # context processors
+    f'{BASE_APP_NAME}.middleware.ResolverMatchMiddleware',
     f'{SUBSCRIPTION_APP_NAME}.middleware.SubscriptionMiddleware',
 ])
 
@@ -317,6 +320,21 @@ if not TEST:
         )
     })
 
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+# The application caches are invalidated via table versions held in the
+# cache, so all processes serving requests must share the cache backend.
+# read os.environ['CACHE_URL'], e.g. 'redis://host:6379/0' or
+# 'dbcache://rns_cache' (requires 'python manage.py createcachetable')
+CACHES = {
+    'default': env.cache_url(
+        'CACHE_URL',
+        default='locmemcache://' if DEVELOPMENT else 'dbcache://rns_cache'
+    ),
+}
+# max number of web worker processes, as used by gunicorn
+WEB_CONCURRENCY = env.int('WEB_CONCURRENCY', default=1)
+
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-user-model
 AUTH_USER_MODEL = f'{USER_APP_NAME}.User'
 
@@ -560,3 +578,90 @@ DEFAULT_RATES_REQUEST_INTERVAL = timedelta(days=1)
 # Miscellaneous settings
 FOOD_DOT_COM = env('FOOD_DOT_COM', default=False)
 FACEBOOK_PAGE = env('FACEBOOK_PAGE', default="https://facebook.com")
+
+# List pagination counts
+# timeout in seconds for cached list counts
+LIST_COUNT_CACHE_TIMEOUT = env.int('LIST_COUNT_CACHE_TIMEOUT', default=60)
+# minimum table row estimate at which an estimate is used in preference to
+# an exact count, for lists of all the rows in a table
+LIST_COUNT_ESTIMATE_THRESHOLD = env.int(
+    'LIST_COUNT_ESTIMATE_THRESHOLD', default=1000)
+
+# List result id caching
+# timeout in seconds for cached result ids
+RESULT_IDS_CACHE_TIMEOUT = env.int('RESULT_IDS_CACHE_TIMEOUT', default=300)
+# maximum number of result ids to cache for a query
+RESULT_IDS_CACHE_MAX = env.int('RESULT_IDS_CACHE_MAX', default=5000)
+
+# Permission snapshots
+# timeout in seconds of cached user permission snapshots; snapshots are only
+# cached across requests if the default cache is shared between processes
+PERMISSION_SNAPSHOT_CACHE_TIMEOUT = env.int(
+    'PERMISSION_SNAPSHOT_CACHE_TIMEOUT', default=3600)
+
+# In-memory search indexes
+# rebuild stale indexes in a background thread, serving the stale index in
+# the meantime; disabled in test mode as test data is not visible to other
+# threads
+BACKGROUND_INDEX_REBUILD = env.bool(
+    'BACKGROUND_INDEX_REBUILD', default=not TEST)
+# build the indexes in the background when the web server starts
+INDEX_WARM_ON_STARTUP = env.bool('INDEX_WARM_ON_STARTUP', default=True)
+
+# Pantry search
+# minimum age in seconds of the pantry index before it is rebuilt following
+# changes to recipe ingredients
+PANTRY_INDEX_MIN_AGE = env.int('PANTRY_INDEX_MIN_AGE', default=300)
+
+# Nutrition search
+# minimum age in seconds of the nutrition matrix before it is rebuilt
+# following changes to recipes
+NUTRITION_MATRIX_MIN_AGE = env.int('NUTRITION_MATRIX_MIN_AGE', default=60)
+# directory of the nutrition index built by the 'nutrition_index' management
+# command; if not set or not built, the index is built in memory
+NUTRITION_INDEX_PATH = env('NUTRITION_INDEX_PATH', default='')
+
+# Meal plans
+# max number of days and meals per day in a meal plan
+MEAL_PLAN_MAX_DAYS = env.int('MEAL_PLAN_MAX_DAYS', default=14)
+MEAL_PLAN_MAX_MEALS = env.int('MEAL_PLAN_MAX_MEALS', default=6)
+# number of best recipes to randomly choose from for each meal
+MEAL_PLAN_VARIETY = env.int('MEAL_PLAN_VARIETY', default=5)
+# default tolerance of daily calories, as a fraction of the daily value
+MEAL_PLAN_CALORIE_TOLERANCE = env.float(
+    'MEAL_PLAN_CALORIE_TOLERANCE', default=0.1)
+
+# Recipe home
+# minimum age in seconds of the featured recipe pools before they are
+# rebuilt following changes to recipes
+RECIPE_SAMPLE_POOL_MIN_AGE = env.int(
+    'RECIPE_SAMPLE_POOL_MIN_AGE', default=300)
+
+# Recipe cards
+# timeout in seconds of rendered recipe cards in the cache
+RECIPE_CARD_CACHE_TIMEOUT = env.int(
+    'RECIPE_CARD_CACHE_TIMEOUT', default=86400)
+
+# Recipe scaling
+# timeout in seconds of scaled recipe ingredients in the cache
+RECIPE_SCALE_CACHE_TIMEOUT = env.int(
+    'RECIPE_SCALE_CACHE_TIMEOUT', default=3600)
+# max number of servings a recipe may be scaled to
+RECIPE_SCALE_MAX_SERVINGS = env.int('RECIPE_SCALE_MAX_SERVINGS', default=500)
+
+# Shopping list
+# max number of different recipes in a shopping list
+SHOPPING_LIST_MAX_RECIPES = env.int('SHOPPING_LIST_MAX_RECIPES', default=100)
+
+# Similar recipes
+# max number of similar recipes displayed with a recipe
+SIMILAR_RECIPES_LIMIT = env.int('SIMILAR_RECIPES_LIMIT', default=6)
+
+# Autocomplete
+# default and maximum number of autocomplete results
+AUTOCOMPLETE_LIMIT = env.int('AUTOCOMPLETE_LIMIT', default=20)
+AUTOCOMPLETE_MAX_LIMIT = env.int('AUTOCOMPLETE_MAX_LIMIT', default=50)
+# minimum age in seconds of the autocomplete indexes before they are rebuilt
+# following changes to the indexed names
+AUTOCOMPLETE_INDEX_MIN_AGE = env.int(
+    'AUTOCOMPLETE_INDEX_MIN_AGE', default=60)
@@ -14,3 +14,20 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'recipesnstuff.settings')
 
 application = get_wsgi_application()
+
+# build the in-memory search indexes in the background, so the first
+# requests don't have to wait for them to be built
+from django.conf import settings   # noqa: E402
+
+if settings.INDEX_WARM_ON_STARTUP:
+    from recipes.pantry import warm_pantry_index   # noqa: E402
+    from recipes.nutrition import warm_nutrition_matrix   # noqa: E402
+    from recipes.nutrition_neighbours import warm_nutrition_index  # noqa: E402
+    from recipes.autocomplete import warm_autocomplete_indices  # noqa: E402
+    from recipes.sampling import warm_sample_pool   # noqa: E402
+
+    warm_pantry_index()
+    warm_nutrition_matrix()
+    warm_nutrition_index()
+    warm_autocomplete_indices()
+    warm_sample_pool()
@@ -0,0 +1,95 @@
+/**
+ * Class to populate the datalist of an input with the names beginning with the entered text,
+ * from an autocomplete endpoint.
+ */
+class Autocomplete {
+
+    /**
+     * Constructor
+     * @param inputSelector - input selector for text input
+     * @param datalistSelector - datalist selector for input options
+     * @param url - autocomplete endpoint url
+     * @param delay - msec to wait after last keypress before requesting names
+     */
+    constructor(inputSelector, datalistSelector, url, delay = 250) {
+        this.inputSelector = inputSelector;
+        this.datalistSelector = datalistSelector;
+        this.url = url;
+        this.delay = delay;
+
+        this.input = undefined;         // text input
+        this.datalist = undefined;      // input options
+        this.timer = undefined;         // keypress delay timer
+        this.idMap = new Map();         // map of known names to ids
+    }
+
+    /**
+     * Initialise the autocomplete
+     */
+    initialise() {
+        this.input = document.querySelector(this.inputSelector);
+        this.datalist = document.querySelector(this.datalistSelector);
+
+        this.input.addEventListener('input', (event) => {
+            clearTimeout(this.timer);
+            this.timer = setTimeout(() => this.lookup(this.input.value), this.delay);
+        });
+
+        if (this.input.value) {
+            // initial value
+            this.lookup(this.input.value);
+        }
+    }
+
+    /**
+     * Request the names beginning with the specified prefix, and update the datalist
+     * @param prefix - name prefix
+     * @returns {Promise}
+     */
+    lookup(prefix) {
+        prefix = prefix.trim();
+        if (!prefix) {
+            return Promise.resolve();
+        }
+        const url = new URL(this.url, window.location.origin);
+        url.searchParams.set('prefix', prefix);
+
+        return fetch(url, {
+            headers: { 'Accept': 'application/json' }
+        })
+        .then(response => response.ok ? response.json() : { results: [] })
+        .then(data => {
+            this.datalist.replaceChildren(...data.results.map(entry => {
+                const option = document.createElement('option');
+                option.value = entry.name;
+                return option;
+            }));
+            for (const entry of data.results) {
+                this.idMap.set(entry.name, entry.id);
+            }
+            if (this.isKnown(this.input.value) && this.input.classList.contains('is-invalid')) {
+                // value was validated before its name was received, so revalidate
+                this.input.dispatchEvent(new Event('change'));
+            }
+        })
+        .catch(error => console.error(error));
+    }
+
+    /**
+     * Check if a name is one of the names received
+     * @param name - name to check
+     * @returns {boolean}
+     */
+    isKnown(name) {
+        return this.idMap.has(name);
+    }
+
+    /**
+     * Get the id corresponding to a name
+     * @param name - name to get id of
+     * @returns {number|undefined}
+     */
+    idOf(name) {
+        return this.idMap.get(name);
+    }
+}
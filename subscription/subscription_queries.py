@@ -23,7 +23,6 @@
 from datetime import datetime, timezone
 from enum import Enum, auto
 from typing import Any, Optional, Tuple, List, Union
-from zoneinfo import ZoneInfo
 from decimal import Decimal, InvalidOperation
 
 from django.db.models import QuerySet
@@ -34,21 +33,11 @@ from subscription.models import (
 )
 from user.models import User
 from utils import (
-    SEARCH_QUERY, DATE_QUERIES,
-    regex_matchers, regex_date_matchers, QuerySetParams,
-    TERM_GROUP, KEY_TERM_GROUP, DATE_QUERY_GROUP, DATE_KEY_TERM_GROUP,
-    DATE_QUERY_YR_GROUP, DATE_QUERY_MTH_GROUP,
-    DATE_QUERY_DAY_GROUP, USER_QUERY, YesNo, amount_lookups
+    SEARCH_QUERY, QuerySetParams, YesNo, amount_lookups, SearchTokenizer,
+    cacheable_handler
 )
 from utils.search import AMOUNT_QUERIES
 
-NON_DATE_QUERIES = [
-    USER_QUERY
-]
-NON_DATE_QUERIES.extend(AMOUNT_QUERIES)
-REGEX_MATCHERS = regex_matchers(NON_DATE_QUERIES)
-REGEX_MATCHERS.update(regex_date_matchers())
-
 FIELD_LOOKUPS = {
     # query param: filter lookup
     SEARCH_QUERY: '',
@@ -72,16 +61,13 @@ FILTERS_ORDER.extend(
 NON_LOOKUP_ARGS = [
 ]
 
-SEARCH_REGEX = [
-    # regex,            query param, regex match group, key & regex match grp
-    (REGEX_MATCHERS[q], q,           TERM_GROUP,        KEY_TERM_GROUP)
-    for q in NON_DATE_QUERIES
-]
-SEARCH_REGEX.extend([
-    # regex,            query param, regex match group, key & regex match grp
-    (REGEX_MATCHERS[q], q,           DATE_QUERY_GROUP,  DATE_KEY_TERM_GROUP)
-    for q in DATE_QUERIES
-])
+SEARCH_TOKENIZER = SearchTokenizer({
+    # query param: term handler
+    query: cacheable_handler(
+        lambda query_set_params, token: get_amount_query(
+            query_set_params, token.query, token.value))
+    for query in AMOUNT_QUERIES
+})
 
 
 class QueryParam(Enum):
@@ -137,60 +123,11 @@ def get_search_term(
     if value is None:
         return query_set_params
 
-    for regex, query, group, key_val_group in SEARCH_REGEX:
-        match = regex.match(value)
-        if match:
-            success = True
-            if query in DATE_QUERIES:
-                success = get_date_query(query_set_params, query, *[
-                    match.group(idx) for idx in [
-                        DATE_QUERY_YR_GROUP, DATE_QUERY_MTH_GROUP,
-                        DATE_QUERY_DAY_GROUP
-                    ]
-                ])
-            elif query in AMOUNT_QUERIES:
-                success = get_amount_query(
-                    query_set_params, query, match.group(group))
-            elif query not in NON_LOOKUP_ARGS:
-                query_set_params.add_and_lookup(
-                    query, FIELD_LOOKUPS[query], match.group(group))
-            else:
-                # complex query term handled elsewhere
-                success = False
-
-            save_term_func = query_set_params.add_search_term if success \
-                else query_set_params.add_invalid_term
-            save_term_func(match.group(key_val_group))
+    SEARCH_TOKENIZER.apply(value, query_set_params)
 
     return query_set_params
 
 
-def get_date_query(query_set_params: QuerySetParams,
-                   query: str, year: str, month: str, day: str) -> bool:
-    """
-    Get a date query
-    :param query_set_params: query params to update
-    :param query: query key
-    :param year: year
-    :param month: month
-    :param day: day
-    :return: True if successfully added
-    """
-    success = True
-    try:
-        date = datetime(
-            int(year), int(month), int(day), tzinfo=ZoneInfo("UTC")
-        )
-        query_set_params.add_and_lookup(
-            query, FIELD_LOOKUPS[query], date)
-    except ValueError:
-        # ignore invalid date
-        # TODO add errors to QuerySetParams
-        # so they can be returned to user
-        success = False
-    return success
-
-
 def get_amount_query(query_set_params: QuerySetParams,
                      query: str, amount: str) -> bool:
     """
@@ -0,0 +1,101 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+from dataclasses import dataclass
+from decimal import Decimal
+from unittest import TestCase
+
+from django_countries.fields import Country
+
+from base.dto import BaseDto, model_field_specs
+from checkout.currency import CurrencyDto
+from checkout.models import Currency
+from profiles.models import Address
+from recipes.views.dto import RecipeCardDto
+
+
+@dataclass
+class DynamicDto(BaseDto):
+    """ DTO populated with model attributes """
+
+
+class TestBaseDto(TestCase):
+    """
+    Test BaseDto class
+    """
+
+    def test_field_specs_cached(self):
+        """ Test field specs are generated once per model class """
+        specs = model_field_specs(Currency)
+        self.assertIs(specs, model_field_specs(Currency))
+        self.assertEqual(
+            [spec.name for spec in specs],
+            [field.attname for field in Currency._meta.concrete_fields])
+
+    def test_from_model_to_obj(self):
+        """ Test populating a DTO from a model """
+        currency = Currency(
+            id=1, code='EUR', numeric_code=978, digits=2, name='Euro',
+            symbol='€')
+        currency.rate = Decimal('1.1')    # e.g. annotation
+        currency.tags = ['a', 'b']
+
+        dto = BaseDto.from_model_to_obj(currency, CurrencyDto())
+        for key in ['id', 'code', 'numeric_code', 'digits', 'name',
+                    'symbol', 'rate']:
+            with self.subTest(key=key):
+                self.assertEqual(getattr(dto, key), getattr(currency, key))
+        # mutable values are copied
+        self.assertEqual(dto.tags, currency.tags)
+        self.assertIsNot(dto.tags, currency.tags)
+        self.assertFalse(dto.add_new)
+
+    def test_from_model_to_obj_exclude(self):
+        """ Test populating a DTO from a model excluding fields """
+        currency = Currency(id=1, code='EUR', name='Euro')
+        dto = BaseDto.from_model_to_obj(
+            currency, DynamicDto(), exclude=['code', 'name'])
+        self.assertEqual(dto.id, 1)
+        self.assertFalse(hasattr(dto, 'code'))
+        self.assertFalse(hasattr(dto, 'name'))
+
+    def test_from_model_to_obj_deferred(self):
+        """ Test deferred fields are not populated """
+        currency = Currency(id=1, code='EUR')
+        del currency.__dict__['name']
+        dto = BaseDto.from_model_to_obj(currency, DynamicDto())
+        self.assertEqual(dto.code, 'EUR')
+        self.assertFalse(hasattr(dto, 'name'))
+
+    def test_from_model_to_obj_descriptor(self):
+        """ Test fields with custom descriptors are read via descriptor """
+        address = Address(id=1, street='Main St', country='IE')
+        dto = BaseDto.from_model_to_obj(address, DynamicDto())
+        self.assertIsInstance(dto.country, Country)
+        self.assertEqual(dto.country.code, 'IE')
+        self.assertEqual(dto.street, 'Main St')
+
+    def test_slotted_dto(self):
+        """ Test slotted DTOs have no instance dict """
+        dto = RecipeCardDto(id=1, name='Cake')
+        self.assertFalse(hasattr(dto, '__dict__'))
+        with self.assertRaises(AttributeError):
+            dto.unknown = True
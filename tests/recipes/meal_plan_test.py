@@ -0,0 +1,109 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+from unittest import TestCase
+
+import numpy as np
+
+from recipes.meal_plan import MealPlanner
+from recipes.nutrition import NutritionMatrix
+
+FIELDS = [
+    'calories', 'fat_content', 'saturated_fat_content',
+    'cholesterol_content', 'sodium_content', 'carbohydrate_content',
+    'fibre_content', 'sugar_content', 'protein_content'
+]
+TARGETS = {
+    'calories': 2000, 'fat_content': 78, 'saturated_fat_content': 20,
+    'cholesterol_content': 300, 'sodium_content': 2300,
+    'carbohydrate_content': 275, 'fibre_content': 28, 'sugar_content': 50,
+    'protein_content': 50
+}
+
+
+def matrix_of(rows, category_ids=None):
+    """ Matrix of rows of multiples of a third of the targets """
+    values = np.array(rows, dtype=np.float64) * np.array(
+        [TARGETS[field] for field in FIELDS]) / 3
+    return NutritionMatrix(
+        np.arange(1, len(rows) + 1, dtype=np.int64), values, FIELDS,
+        category_ids=np.array(category_ids, dtype=np.int64)
+        if category_ids is not None else None)
+
+
+class TestMealPlanner(TestCase):
+
+    def test_plan(self):
+        planner = MealPlanner(matrix_of([
+            [1] * 9,                    # 1 ideal
+            [2] * 9,                    # 2 too much
+            [1, 1, 3, 1, 1, 1, 1, 1, 1],   # 3 excess saturated fat
+            [1, 1, 0, 0, 0, 1, 1, 0, 1],   # 4 no limit nutrients
+            [0] * 9,                    # 5 no nutritional info
+            [0.9] * 9,                  # 6 nearly ideal
+        ]), TARGETS)
+
+        plan = planner.plan(days=1, meals=3)
+        self.assertEqual(len(plan), 1)
+        self.assertEqual(sorted(plan[0].recipe_ids), [1, 4, 6])
+        self.assertAlmostEqual(plan[0].totals['calories'], 1933.3, places=1)
+
+        # recipes are not repeated
+        plan = planner.plan(days=2, meals=2)
+        recipe_ids = [pk for day in plan for pk in day.recipe_ids]
+        self.assertEqual(len(recipe_ids), len(set(recipe_ids)))
+        self.assertNotIn(5, recipe_ids)
+
+        # not enough recipes
+        self.assertIsNone(planner.plan(days=3, meals=3))
+
+    def test_calories(self):
+        planner = MealPlanner(matrix_of([
+            [1] * 9, [1] * 9, [0.5] * 9, [2] * 9,
+        ]), TARGETS)
+
+        plan = planner.plan(days=1, meals=2, max_calories=1000)
+        self.assertEqual(sorted(plan[0].recipe_ids), [1, 3])
+        self.assertIsNone(planner.plan(days=1, meals=2, max_calories=500))
+        self.assertIsNone(planner.plan(days=1, meals=2, min_calories=3000))
+
+        plan = planner.plan(days=1, meals=2, min_calories=1900)
+        self.assertGreaterEqual(plan[0].totals['calories'], 1900)
+
+    def test_categories(self):
+        planner = MealPlanner(matrix_of([
+            [1] * 9, [1] * 9, [0.9] * 9, [0.9] * 9,
+        ], category_ids=[1, 1, 2, 3]), TARGETS)
+
+        plan = planner.plan(days=1, meals=2, categories=[2, 3])
+        self.assertEqual(sorted(plan[0].recipe_ids), [3, 4])
+        plan = planner.plan(days=1, meals=2, exclude_categories=[1])
+        self.assertEqual(sorted(plan[0].recipe_ids), [3, 4])
+
+    def test_variety(self):
+        planner = MealPlanner(matrix_of([[1] * 9] * 20), TARGETS)
+        plans = [
+            planner.plan(days=1, meals=3, variety=10, seed=seed)[0].recipe_ids
+            for seed in range(5)
+        ]
+        self.assertEqual(plans[0], planner.plan(
+            days=1, meals=3, variety=10, seed=0)[0].recipe_ids)
+        self.assertGreater(len({tuple(plan) for plan in plans}), 1)
@@ -0,0 +1,110 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+import numpy as np
+
+from recipes import nutrition_neighbours
+from recipes.nutrition import NutritionMatrix
+from recipes.nutrition_neighbours import NutritionIndex
+
+FIELDS = ['calories', 'fat_content', 'protein_content']
+
+
+def random_matrix(count: int, seed: int = 0) -> NutritionMatrix:
+    rng = np.random.default_rng(seed)
+    values = rng.uniform(1, 1000, size=(count, len(FIELDS)))
+    return NutritionMatrix(
+        np.arange(1, count + 1, dtype=np.int64) * 2, values, FIELDS)
+
+
+def brute_force(index: NutritionIndex, recipe_id: int, k: int):
+    row = int(np.searchsorted(index.recipe_ids, recipe_id))
+    dists = np.linalg.norm(
+        index.vectors.astype(np.float64) - index.vectors[row], axis=1)
+    dists[row] = np.inf
+    return [int(index.recipe_ids[idx]) for idx in np.argsort(dists)[:k]]
+
+
+class TestNutritionIndex(TestCase):
+
+    def test_neighbours(self):
+        matrix = NutritionMatrix(
+            np.array([1, 2, 3, 4, 5], dtype=np.int64),
+            np.array([
+                [400, 20, 35],
+                [410, 21, 34],
+                [900, 60, 10],
+                [880, 58, 11],
+                [0, 0, 0],
+            ], dtype=np.float64),
+            FIELDS)
+        index = NutritionIndex.from_matrix(matrix)
+        # recipes without nutritional info are not indexed
+        self.assertEqual(index.size, 4)
+        self.assertEqual(index.vectors.dtype, np.float32)
+
+        neighbours = index.neighbours([1, 3, 5, 9], k=2)
+        self.assertEqual(list(neighbours.keys()), [1, 3])
+        self.assertEqual([pk for pk, _ in neighbours[1]], [2, 4])
+        self.assertEqual([pk for pk, _ in neighbours[3]], [4, 2])
+        distances = [dist for _, dist in neighbours[1]]
+        self.assertEqual(distances, sorted(distances))
+
+        self.assertEqual(index.neighbours([5]), {})
+
+    def test_brute_force(self):
+        index = NutritionIndex.from_matrix(random_matrix(500))
+        recipe_ids = [2, 100, 512, 1000]
+        # small chunks, so the best of each chunk are merged
+        with patch.object(nutrition_neighbours, 'DISTANCE_CHUNK_SIZE', 200):
+            neighbours = index.neighbours(recipe_ids, k=5)
+        for recipe_id in recipe_ids:
+            with self.subTest(recipe_id=recipe_id):
+                self.assertEqual(
+                    [pk for pk, _ in neighbours[recipe_id]],
+                    brute_force(index, recipe_id, 5))
+
+    def test_save_load(self):
+        index = NutritionIndex.from_matrix(random_matrix(50))
+        with TemporaryDirectory() as path:
+            self.assertFalse(NutritionIndex.exists(path))
+            index.save(path)
+            self.assertTrue(NutritionIndex.exists(path))
+
+            loaded = NutritionIndex.load(path)
+            self.assertIsInstance(loaded.vectors, np.memmap)
+            np.testing.assert_array_equal(loaded.recipe_ids, index.recipe_ids)
+            np.testing.assert_array_equal(loaded.vectors, index.vectors)
+            self.assertEqual(loaded.neighbours([10], k=3),
+                             index.neighbours([10], k=3))
+            del loaded
+
+    def test_small_index(self):
+        index = NutritionIndex.from_matrix(random_matrix(3))
+        neighbours = index.neighbours([2], k=10)
+        self.assertEqual(len(neighbours[2]), 2)
+
+        index = NutritionIndex.from_matrix(random_matrix(1))
+        self.assertEqual(index.neighbours([2]), {})
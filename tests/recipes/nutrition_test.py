@@ -0,0 +1,49 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+from unittest import TestCase
+
+import numpy as np
+
+from recipes.nutrition import NutritionMatrix
+
+
+class TestNutritionMatrix(TestCase):
+
+    def test_filter(self):
+        matrix = NutritionMatrix(
+            np.array([1, 2, 3, 4], dtype=np.int64),
+            np.array([
+                [400, 35],
+                [600, 40],
+                [450, 10],
+                [500, 30],
+            ], dtype=np.float64),
+            ['calories', 'protein_content'])
+        self.assertEqual(matrix.size, 4)
+
+        self.assertEqual(matrix.filter([('calories', '<', 500)]), [1, 3])
+        self.assertEqual(matrix.filter([
+            ('calories', '<=', 500), ('protein_content', '>=', 30)
+        ]), [1, 4])
+        self.assertEqual(matrix.filter([
+            ('calories', '>', 1000), ('protein_content', '>', 0)
+        ]), [])
@@ -0,0 +1,67 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+from unittest import TestCase
+
+import numpy as np
+
+from recipes.pantry import PantryIndex
+
+
+class TestPantryIndex(TestCase):
+
+    @staticmethod
+    def make_index(recipes: dict[int, list[int]]) -> PantryIndex:
+        """
+        Make an index from a dict of recipe id and list of ingredient ids
+        """
+        recipe_ids = sorted(recipes.keys())
+        ingredient_ids = []
+        row_starts = []
+        for recipe_id in recipe_ids:
+            row_starts.append(len(ingredient_ids))
+            ingredient_ids.extend(recipes[recipe_id])
+        return PantryIndex(
+            np.array(recipe_ids, dtype=np.int64),
+            np.array(row_starts, dtype=np.int64),
+            np.array(ingredient_ids, dtype=np.int64), '')
+
+    def test_rank(self):
+        index = self.make_index({
+            1: [10, 11, 12, 13],    # 2 of 4 covered
+            2: [10, 11],            # all covered
+            3: [20, 21],            # none covered
+            4: [10, 20],            # 1 of 2 covered
+            5: [11, 12, 30, 31],    # 1 of 4 covered
+            6: [10, 11, 40, 41, 42, 43],    # 2 of 6 covered
+        })
+        self.assertEqual(index.size, 6)
+
+        # coverage descending, then missing ascending, then recipe id
+        self.assertEqual(index.rank([10, 11]), [2, 4, 1, 6, 5])
+        self.assertEqual(index.rank([10, 11], limit=2), [2, 4])
+
+    def test_rank_no_matches(self):
+        index = self.make_index({
+            1: [10, 11],
+        })
+        self.assertEqual(index.rank([]), [])
+        self.assertEqual(index.rank([99]), [])
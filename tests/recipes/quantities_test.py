@@ -0,0 +1,87 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+from decimal import Decimal
+from unittest import TestCase
+
+from recipes.quantities import (
+    ParsedQuantity, parse_quantity, format_amount, format_quantity,
+    stored_quantity
+)
+
+
+class TestQuantities(TestCase):
+
+    def test_parse_quantity(self):
+        for text, expected in [
+            ('2', ParsedQuantity(Decimal(2), None)),
+            (' 1.5 ', ParsedQuantity(Decimal('1.5'), None)),
+            ('.5', ParsedQuantity(Decimal('0.5'), None)),
+            ('1/2', ParsedQuantity(Decimal('0.5'), None)),
+            ('3 / 4', ParsedQuantity(Decimal('0.75'), None)),
+            ('1 1/2', ParsedQuantity(Decimal('1.5'), None)),
+            ('½', ParsedQuantity(Decimal('0.5'), None)),
+            ('1½', ParsedQuantity(Decimal('1.5'), None)),
+            ('1-2', ParsedQuantity(Decimal(1), Decimal(2))),
+            ('2 -3', ParsedQuantity(Decimal(2), Decimal(3))),
+            ('1/2 to 1', ParsedQuantity(Decimal('0.5'), Decimal(1))),
+            ('2-2', ParsedQuantity(Decimal(2), None)),
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(parse_quantity(text), expected)
+
+    def test_parse_invalid(self):
+        for text in ['', 'to taste', '1/0', '3-1', '1 cup', '-1']:
+            with self.subTest(text=text):
+                self.assertIsNone(parse_quantity(text))
+
+    def test_stored_quantity(self):
+        self.assertEqual(
+            stored_quantity('2', Decimal(3), None),
+            ParsedQuantity(Decimal(3), None))
+        self.assertEqual(
+            stored_quantity('1-2', Decimal(1), Decimal(2)),
+            ParsedQuantity(Decimal(1), Decimal(2)))
+        # not stored
+        self.assertEqual(
+            stored_quantity('1/2', None, None),
+            ParsedQuantity(Decimal('0.5'), None))
+        self.assertIsNone(stored_quantity('to taste', None, None))
+
+    def test_format(self):
+        for amount, fractions, expected in [
+            ('2', True, '2'),
+            ('0.5', True, '1/2'),
+            ('1.333', True, '1 1/3'),
+            ('2.75', True, '2 3/4'),
+            ('0.125', True, '1/8'),
+            ('1.06', True, '1.06'),
+            ('1.5', False, '1.5'),
+            ('453.592', False, '453.59'),
+            ('0.004', False, '0.004'),
+        ]:
+            with self.subTest(amount=amount, fractions=fractions):
+                self.assertEqual(
+                    format_amount(Decimal(amount), fractions=fractions),
+                    expected)
+
+        self.assertEqual(format_quantity(
+            ParsedQuantity(Decimal('1.5'), Decimal(3))), '1 1/2-3')
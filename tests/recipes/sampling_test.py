@@ -0,0 +1,45 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+from unittest import TestCase
+
+from recipes.sampling import SamplePool
+
+
+class TestSamplePool(TestCase):
+
+    def test_sample(self):
+        pool = SamplePool({
+            'chicken': [1, 2, 3], 'beef': [4], 'tuna': [],
+        })
+        self.assertEqual(pool.terms, ['chicken', 'beef'])
+
+        for _ in range(10):
+            term, ids = pool.sample(2)
+            self.assertIn(term, ['chicken', 'beef'])
+            self.assertEqual(len(ids), 2 if term == 'chicken' else 1)
+            self.assertEqual(len(set(ids)), len(ids))
+            self.assertTrue(set(ids) <= set(pool.pools[term]))
+
+    def test_empty(self):
+        pool = SamplePool({'tuna': []})
+        self.assertTrue(pool.is_empty)
+        self.assertEqual(pool.sample(2), (None, []))
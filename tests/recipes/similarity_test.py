@@ -0,0 +1,86 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+from unittest import TestCase
+
+import numpy as np
+
+from recipes.similarity import (
+    RecipeTokens, MinHasher, LshIndex, find_similar
+)
+
+
+class TestSimilarity(TestCase):
+
+    @staticmethod
+    def tokens() -> RecipeTokens:
+        pairs = []
+        for recipe_id in range(1, 41):
+            # groups of 4 recipes sharing 10 of 11 tokens
+            base = (recipe_id % 10) * 100
+            pairs.extend(
+                (recipe_id, token) for token in range(base, base + 10))
+            pairs.append((recipe_id, 10000 + recipe_id))
+        pairs.append((1, 100))      # duplicate is ignored
+        return RecipeTokens.from_pairs(np.array(pairs))
+
+    def test_tokens(self):
+        tokens = self.tokens()
+        self.assertEqual(tokens.size, 40)
+        self.assertEqual(len(tokens.tokens), 40 * 11)
+        row_starts, chunk = tokens.chunk(2, 4)
+        self.assertEqual(row_starts.tolist(), [0, 11])
+        self.assertEqual(len(chunk), 22)
+
+    def test_signatures(self):
+        hasher = MinHasher(num_perm=64)
+        signatures = hasher.signatures(
+            np.array([0, 3, 6]), np.array([1, 2, 3, 3, 2, 1, 7, 8, 9]))
+        self.assertEqual(signatures.shape, (3, 64))
+        # identical sets have identical signatures
+        self.assertEqual(signatures[0].tolist(), signatures[1].tolist())
+        self.assertLess(np.mean(signatures[0] == signatures[2]), 0.5)
+
+        with self.assertRaises(ValueError):
+            LshIndex(signatures, bands=5)
+
+    def test_find_similar(self):
+        tokens = self.tokens()
+        similar = list(find_similar(tokens, top_k=5, chunk_size=7))
+
+        by_recipe = {}
+        for recipe_id, similar_id, score in similar:
+            by_recipe.setdefault(recipe_id, []).append((similar_id, score))
+        self.assertEqual(len(by_recipe), 40)
+        for recipe_id, neighbours in by_recipe.items():
+            with self.subTest(recipe_id=recipe_id):
+                # only the other recipes in the group, most similar first
+                self.assertEqual(
+                    sorted(pk for pk, _ in neighbours),
+                    [pk for pk in range(1, 41)
+                     if pk % 10 == recipe_id % 10 and pk != recipe_id])
+                scores = [score for _, score in neighbours]
+                self.assertEqual(scores, sorted(scores, reverse=True))
+                self.assertTrue(all(0.5 < score <= 1 for score in scores))
+
+        self.assertEqual(
+            list(find_similar(tokens, top_k=2, chunk_size=7, workers=2)),
+            list(find_similar(tokens, top_k=2, chunk_size=7)))
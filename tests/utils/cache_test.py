@@ -0,0 +1,82 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+import time
+from threading import Event
+from unittest import TestCase
+
+from utils import TableVersionedValue, bump_table_version
+
+TABLE = 'table_versioned_value_test'
+TIMEOUT = 5
+
+
+class TestTableVersionedValue(TestCase):
+
+    def setUp(self):
+        self.builds = 0
+        self.release = Event()
+        self.release.set()
+
+    def builder(self) -> int:
+        """ Build a value, waiting until released """
+        self.assertTrue(self.release.wait(TIMEOUT))
+        self.builds += 1
+        return self.builds
+
+    def wait_for(self, value: TableVersionedValue, expected: int):
+        """ Wait for a background build to complete """
+        end = time.monotonic() + TIMEOUT
+        while value.get() != expected and time.monotonic() < end:
+            time.sleep(0.01)
+        self.assertEqual(value.get(), expected)
+
+    def test_foreground_rebuild(self):
+        value = TableVersionedValue(self.builder, [TABLE])
+        self.assertEqual(value.get(), 1)
+        self.assertEqual(value.get(), 1)
+
+        bump_table_version(TABLE)
+        self.assertEqual(value.get(), 2)
+
+    def test_background_rebuild(self):
+        value = TableVersionedValue(self.builder, [TABLE], background=True)
+        # no previous value, so built in the foreground
+        self.assertEqual(value.get(), 1)
+
+        self.release.clear()
+        bump_table_version(TABLE)
+        # stale value served while rebuilding
+        self.assertEqual(value.get(), 1)
+        self.assertEqual(value.get(), 1)
+        self.assertIsNone(value.get(current_only=True))
+
+        self.release.set()
+        self.wait_for(value, 2)
+        self.assertEqual(self.builds, 2)
+
+    def test_warm(self):
+        value = TableVersionedValue(self.builder, [TABLE], background=True)
+        value.warm()
+        self.wait_for(value, 1)
+        value.warm()
+        self.assertEqual(self.builds, 1)
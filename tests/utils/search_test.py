@@ -0,0 +1,128 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+from unittest import TestCase
+
+from utils import (
+    SearchToken, SearchTokenizer, QuerySetParams, lookup_handler,
+    date_lookup_handler, range_lookup, cacheable_handler
+)
+
+
+def _range_handler(query_set_params: QuerySetParams,
+                   token: SearchToken) -> bool:
+    query_set_params.add_and_lookup(
+        token.query, range_lookup(token.query, token.operator),
+        float(token.value))
+    return True
+
+
+FIELD_LOOKUPS = {
+    'key': 'keywords__name',
+    'on-or-after': 'date__gte',
+    'after': 'date__gt',
+}
+
+
+class TestSearchTokenizer(TestCase):
+
+    def setUp(self):
+        self.tokenizer = SearchTokenizer({
+            'key': lookup_handler(FIELD_LOOKUPS),
+            'on-or-after': date_lookup_handler(FIELD_LOOKUPS),
+            'after': date_lookup_handler(FIELD_LOOKUPS),
+        }, range_handlers={
+            'cal': _range_handler,
+            'carbs': _range_handler,
+        })
+
+    def test_tokenize(self):
+        self.assertEqual(self.tokenizer.tokenize(
+            'cal<500 KEY="easy" on-or-after=\'1/2/2023\' Carbs>=30.5 '
+            'x-key="no" cal>.5 cal<5x'
+        ), (
+            SearchToken('cal', 'cal<500', '500', '<'),
+            SearchToken('key', 'KEY="easy"', 'easy'),
+            SearchToken('on-or-after', 'on-or-after=\'1/2/2023\'',
+                        '1/2/2023'),
+            SearchToken('carbs', 'Carbs>=30.5', '30.5', '>='),
+            SearchToken('cal', 'cal>.5', '.5', '>'),
+        ))
+
+    def test_no_tokens(self):
+        for value in ['', 'easy', 'key=easy', 'cal<', 'cal<abc', 'xcal<5',
+                      'cal => 5', 'key="easy', 'before="1/2/2023"']:
+            with self.subTest(value=value):
+                self.assertEqual(self.tokenizer.tokenize(value), ())
+
+    def test_memoised(self):
+        value = 'key="easy" cal<500'
+        tokens = self.tokenizer.tokenize(value)
+        self.assertIs(self.tokenizer.tokenize(value), tokens)
+        self.assertEqual(self.tokenizer.tokenize.cache_info().hits, 1)
+
+    def test_apply(self):
+        params = self.tokenizer.apply(
+            'key="easy" cal<500 cal>=100 after="31/12/2022" '
+            'on-or-after="31/2/2022"', QuerySetParams())
+
+        self.assertEqual(params.and_lookups['keywords__name'], 'easy')
+        self.assertEqual(params.and_lookups['cal__lt'], 500)
+        self.assertEqual(params.and_lookups['cal__gte'], 100)
+        self.assertEqual(params.and_lookups['date__gt'].date().isoformat(),
+                         '2022-12-31')
+        self.assertNotIn('date__gte', params.and_lookups)
+        self.assertEqual(params.search_terms, [
+            'key="easy"', 'cal<500', 'cal>=100', 'after="31/12/2022"'
+        ])
+        self.assertEqual(params.invalid_terms, ['on-or-after="31/2/2022"'])
+
+    def test_handler_results_memoised(self):
+        calls = []
+
+        def counting_handler(query_set_params: QuerySetParams,
+                             token: SearchToken) -> bool:
+            calls.append(token.query)
+            query_set_params.add_and_lookup(
+                token.query, f'{token.query}__exact', token.value)
+            return token.value != 'bad'
+
+        tokenizer = SearchTokenizer({
+            'cached': cacheable_handler(
+                lambda params, token: counting_handler(params, token)),
+            'uncached': lambda params, token: counting_handler(
+                params, token),
+        })
+        value = 'cached="a" uncached="b" cached="bad"'
+        for _ in range(3):
+            params = tokenizer.apply(value, QuerySetParams())
+            self.assertEqual(params.and_lookups, {
+                'cached__exact': 'bad', 'uncached__exact': 'b'
+            })
+            self.assertEqual(params.search_terms,
+                             ['cached="a"', 'uncached="b"'])
+            self.assertEqual(params.invalid_terms, ['cached="bad"'])
+            self.assertEqual(params.params, {'cached', 'uncached'})
+
+        # cacheable handler only called when first parsed
+        self.assertEqual(calls.count('cached'), 2)
+        self.assertEqual(calls.count('uncached'), 3)
+        self.assertEqual(tokenizer.parse.cache_info().hits, 2)
@@ -30,7 +30,7 @@ from recipesnstuff.constants import (
     CHANGE_PASSWORD_ROUTE_NAME, AVATAR_URL_CTX, NO_ROBOTS_CTX
 )
 from recipesnstuff.settings import AVATAR_BLANK_URL
-from utils import resolve_req, add_navbar_attr
+from utils import resolve_req, add_navbar_attr, navbar_menu_map
 from . import USER_ID_ROUTE_NAME
 from .constants import USER_USERNAME_ROUTE_NAME
 from .models import User
@@ -41,17 +41,21 @@ from .queries import get_social_providers
 SOCIAL_REGEX = re.compile(
     rf'^/{ACCOUNTS_URL}(.*)/login/', re.IGNORECASE)
 
+# navbar menus activated by route names
+NAVBAR_MENUS = navbar_menu_map([
+    (USER_MENU_CTX, [
+        USER_ID_ROUTE_NAME, USER_USERNAME_ROUTE_NAME,
+        CHANGE_PASSWORD_ROUTE_NAME, LOGOUT_ROUTE_NAME
+    ]),
+    (SIGN_IN_MENU_CTX, [LOGIN_ROUTE_NAME]),
+    (REGISTER_MENU_CTX, [REGISTER_ROUTE_NAME]),
+])
 
-def _sign_in_route_check(request: HttpRequest, route: str):
-    """ Check if sign in route """
-    sign_in = route == LOGIN_ROUTE_NAME
-    if not sign_in:
-        # check socials
-        match = SOCIAL_REGEX.match(request.path)
-        if match:
-            sign_in = match.group(1) in get_social_providers()
 
-    return sign_in
+def _social_sign_in_check(request: HttpRequest):
+    """ Check if social sign in route """
+    match = SOCIAL_REGEX.match(request.path)
+    return match is not None and match.group(1) in get_social_providers()
 
 
 def user_context(request: HttpRequest) -> dict:
@@ -64,17 +68,15 @@ def user_context(request: HttpRequest) -> dict:
     no_robots = False
     called_by = resolve_req(request)
     if called_by:
-        for ctx, check_func, is_dropdown_toggle in [
-            (USER_MENU_CTX, lambda name: name in [
-                USER_ID_ROUTE_NAME, USER_USERNAME_ROUTE_NAME,
-                CHANGE_PASSWORD_ROUTE_NAME, LOGOUT_ROUTE_NAME
-            ], True),
-            (SIGN_IN_MENU_CTX,
-             lambda name: _sign_in_route_check(request, name), False),
-            (REGISTER_MENU_CTX,
-             lambda name: name == REGISTER_ROUTE_NAME, False),
+        active = NAVBAR_MENUS.get(called_by.url_name)
+        if active is None and _social_sign_in_check(request):
+            active = SIGN_IN_MENU_CTX
+        for ctx, is_dropdown_toggle in [
+            (USER_MENU_CTX, True),
+            (SIGN_IN_MENU_CTX, False),
+            (REGISTER_MENU_CTX, False),
         ]:
-            is_active = check_func(called_by.url_name)
+            is_active = ctx == active
             if is_active:
                 no_robots = True
             add_navbar_attr(
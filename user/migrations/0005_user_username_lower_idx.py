@@ -0,0 +1,20 @@
+# Generated by Django 4.2.2 on 2026-10-19 04:46
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_add_recipe_etc_permission'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(
+                django.db.models.functions.text.Lower('username'),
+                name='user_username_lower_idx'),
+        ),
+    ]
@@ -22,6 +22,7 @@
 
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.db.models.functions import Lower
 from django.utils.translation import gettext_lazy as _
 from cloudinary.models import CloudinaryField
 
@@ -79,6 +80,10 @@ class User(ModelMixin, AbstractUser):
 
     class Meta:
         ordering = ["date_joined"]
+        indexes = [
+            # case-insensitive recipe author sort orders
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+        ]
 
     def __str__(self):
         return self.username
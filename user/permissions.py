@@ -40,7 +40,10 @@ from recipesnstuff.constants import (
     SUBSCRIPTION_APP_NAME, ORDER_APP_NAME, RECIPES_APP_NAME, USER_APP_NAME
 )
 from subscription.models import Subscription
-from utils import permission_name, Crud, ensure_list
+from utils import (
+    permission_name, Crud, ensure_list, invalidate_user_permissions,
+    invalidate_group_permissions
+)
 from .constants import REGISTERED_GROUP
 from .models import User
 
@@ -187,6 +190,7 @@ def set_basic_permissions(group: [Group, str],
             grp.permissions.add(*perms)
         elif setting.action == REMOVE:
             grp.permissions.remove(*perms)
+        invalidate_group_permissions(grp)
 
     if apps:    # called from a migration
         db_alias = schema_editor.connection.alias
@@ -244,6 +248,7 @@ def add_to_registered(user: User):
     user.groups.add(
         create_registered_group()
     )
+    invalidate_user_permissions(user)
 
 
 def migrate_permissions(apps: StateApps = None,
@@ -291,7 +296,8 @@ def set_group_permissions(
     to_assign = ensure_list(assignees)
     if not apps:    # called from the app
         to_assign = list(
-            map(lambda grp: Group.objects.get_or_create(name=grp), to_assign)
+            map(lambda grp: Group.objects.get_or_create(name=grp)[0],
+                to_assign)
         )
     # else called from a migration
 
@@ -22,6 +22,10 @@
 #
 from allauth.socialaccount.models import SocialLogin
 from django.contrib import messages
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete
+)
 from django.dispatch import receiver
 from allauth.account.signals import (
     user_logged_in, user_logged_out, user_signed_up
@@ -33,7 +37,10 @@ from allauth.socialaccount.signals import (
 from django.http import HttpRequest
 from django.template.loader import render_to_string
 
-from utils import app_template_path
+from utils import (
+    app_template_path, invalidate_user_permissions,
+    invalidate_group_permissions
+)
 from .constants import USER_CTX, THIS_APP
 from .models import User
 from .permissions import add_to_registered
@@ -106,6 +113,99 @@ def social_account_removed_callback(sender, **kwargs):
     """ Process signal sent when a user begins a social account is removed """
 
 
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_created_deleted_callback(sender, **kwargs):
+    """
+    Process signal sent when a user is saved or deleted;
+    invalidates any permission snapshot of a previous user with the same id
+    """
+    if kwargs.get('created', True):
+        invalidate_user_permissions(kwargs['instance'].pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed_callback(sender, **kwargs):
+    """
+    Process signal sent when group membership is changed;
+    invalidates the permission snapshots of the affected users
+    """
+    instance = kwargs['instance']
+    if isinstance(instance, User):
+        if kwargs['action'].startswith('post_'):
+            invalidate_user_permissions(instance)
+    elif kwargs['action'] in ['post_add', 'post_remove']:
+        # snapshots of existing members depend on the group, so only
+        # changed users need to be invalidated
+        for pk in kwargs['pk_set']:
+            invalidate_user_permissions(pk)
+    elif kwargs['action'] == 'post_clear':
+        invalidate_group_permissions(instance)
+
+
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def user_permissions_changed_callback(sender, **kwargs):
+    """
+    Process signal sent when user permissions are changed;
+    invalidates the permission snapshots of the affected users
+    """
+    instance = kwargs['instance']
+    action = kwargs['action']
+    if isinstance(instance, User):
+        if action.startswith('post_'):
+            invalidate_user_permissions(instance)
+    elif action in ['post_add', 'post_remove']:
+        for pk in kwargs['pk_set']:
+            invalidate_user_permissions(pk)
+    elif action == 'pre_clear':
+        # users are unknown after the clear
+        for pk in instance.user_set.values_list('pk', flat=True):
+            invalidate_user_permissions(pk)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed_callback(sender, **kwargs):
+    """
+    Process signal sent when group permissions are changed;
+    invalidates the permission snapshots of the groups' members
+    """
+    instance = kwargs['instance']
+    action = kwargs['action']
+    if isinstance(instance, Group):
+        if action.startswith('post_'):
+            invalidate_group_permissions(instance)
+    elif action in ['post_add', 'post_remove']:
+        for pk in kwargs['pk_set']:
+            invalidate_group_permissions(pk)
+    elif action == 'pre_clear':
+        # groups are unknown after the clear
+        for pk in instance.group_set.values_list('pk', flat=True):
+            invalidate_group_permissions(pk)
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted_callback(sender, **kwargs):
+    """
+    Process signal sent when a group is deleted;
+    invalidates the permission snapshots of the group's members
+    """
+    invalidate_group_permissions(kwargs['instance'])
+
+
+@receiver(pre_delete, sender=Permission)
+def permission_deleted_callback(sender, **kwargs):
+    """
+    Process signal sent when a permission is about to be deleted;
+    invalidates the permission snapshots of the users and groups which have
+    it
+    """
+    instance = kwargs['instance']
+    for pk in instance.user_set.values_list('pk', flat=True):
+        invalidate_user_permissions(pk)
+    for pk in instance.group_set.values_list('pk', flat=True):
+        invalidate_group_permissions(pk)
+
+
 def process_register_new_user(request: HttpRequest, user: User):
     """
     Process registration of a new user
@@ -24,7 +24,12 @@ from .content_list_mixin import (
     TITLE_CTX, PAGE_HEADING_CTX, LIST_HEADING_CTX, LIST_SUB_HEADING_CTX,
     REPEAT_SEARCH_TERM_CTX, NO_CONTENT_MSG_CTX, NO_CONTENT_HELP_CTX,
     READ_ONLY_CTX, SUBMIT_URL_CTX, SUBMIT_BTN_TEXT_CTX, STATUS_CTX,
-    SNIPPETS_CTX, ContentListMixin
+    SNIPPETS_CTX, RESULT_COUNT_CTX, COUNT_ESTIMATED_CTX, ContentListMixin
+)
+from .cache import (
+    is_shared_cache, cache_key, table_versions, bump_table_version,
+    queryset_tables, queryset_digest, queryset_key, TableVersionedValue,
+    CacheStats
 )
 from .enums import (
     ChoiceArg, QueryArg, SortOrder, PerPage6, PerPage8, PerPage50,
@@ -34,7 +39,7 @@ from .file import find_parent_of_folder
 from .forms import (
     update_field_widgets, error_messages, ErrorMsgs, form_auto_id, FormMixin
 )
-from .html import add_navbar_attr, html_tag
+from .html import add_navbar_attr, navbar_menu_map, html_tag
 from .misc import (
     Crud, permission_name, permission_check, ensure_list, find_index,
     dict_drill
@@ -43,15 +48,20 @@ from .models import (
     ModelMixin, ModelFacadeMixin, NameChoiceMixin,
     DESC_LOOKUP, DATE_OLDEST_LOOKUP, DATE_NEWEST_LOOKUP
 )
+from .paginator import CountStrategy, CountingPaginator, estimated_count
+from .permission_cache import (
+    permission_snapshot, invalidate_user_permissions,
+    invalidate_group_permissions
+)
 from .query_params import QuerySetParams
+from .result_ids import cached_result_ids, ResultIdList
 from .queries import get_yes_no_ignore_query, get_object_and_related_or_404
 from .search import (
     ORDER_QUERY, PAGE_QUERY, PER_PAGE_QUERY, REORDER_QUERY, SEARCH_QUERY,
     USER_QUERY, REORDER_REQ_QUERY_ARGS, DATE_QUERIES, AMOUNT_QUERY_ARGS,
-    regex_matchers, regex_date_matchers, amount_lookups,
-    KEY_TERM_GROUP, TERM_GROUP,
-    DATE_KEY_TERM_GROUP, DATE_QUERY_GROUP, DATE_QUERY_DAY_GROUP,
-    DATE_QUERY_MTH_GROUP, DATE_QUERY_YR_GROUP
+    amount_lookups, RANGE_OPERATORS, RANGE_MARKER_CHARS, range_lookup,
+    SearchToken, SearchTokenizer, TokenHandler, ParsedTerm,
+    cacheable_handler, lookup_handler, date_lookup_handler
 )
 from .sitemap import SitemapEntry, SitemapMixin
 from .url_path import (
@@ -78,8 +88,20 @@ __all__ = [
     'SUBMIT_BTN_TEXT_CTX',
     'STATUS_CTX',
     'SNIPPETS_CTX',
+    'RESULT_COUNT_CTX',
+    'COUNT_ESTIMATED_CTX',
     'ContentListMixin',
 
+    'is_shared_cache',
+    'cache_key',
+    'table_versions',
+    'bump_table_version',
+    'queryset_tables',
+    'queryset_digest',
+    'queryset_key',
+    'TableVersionedValue',
+    'CacheStats',
+
     'ChoiceArg',
     'QueryArg',
     'SortOrder',
@@ -105,6 +127,7 @@ __all__ = [
     'dict_drill',
 
     'add_navbar_attr',
+    'navbar_menu_map',
     'html_tag',
 
     'ModelMixin',
@@ -114,8 +137,19 @@ __all__ = [
     'DATE_OLDEST_LOOKUP',
     'DATE_NEWEST_LOOKUP',
 
+    'CountStrategy',
+    'CountingPaginator',
+    'estimated_count',
+
+    'permission_snapshot',
+    'invalidate_user_permissions',
+    'invalidate_group_permissions',
+
     'QuerySetParams',
 
+    'cached_result_ids',
+    'ResultIdList',
+
     'get_yes_no_ignore_query',
     'get_object_and_related_or_404',
 
@@ -128,16 +162,17 @@ __all__ = [
     'REORDER_REQ_QUERY_ARGS',
     'DATE_QUERIES',
     'AMOUNT_QUERY_ARGS',
-    'regex_matchers',
-    'regex_date_matchers',
     'amount_lookups',
-    'KEY_TERM_GROUP',
-    'TERM_GROUP',
-    'DATE_KEY_TERM_GROUP',
-    'DATE_QUERY_GROUP',
-    'DATE_QUERY_DAY_GROUP',
-    'DATE_QUERY_MTH_GROUP',
-    'DATE_QUERY_YR_GROUP',
+    'RANGE_OPERATORS',
+    'RANGE_MARKER_CHARS',
+    'range_lookup',
+    'SearchToken',
+    'SearchTokenizer',
+    'TokenHandler',
+    'ParsedTerm',
+    'cacheable_handler',
+    'lookup_handler',
+    'date_lookup_handler',
 
     'SitemapEntry',
     'SitemapMixin',
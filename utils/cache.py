@@ -0,0 +1,386 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+import hashlib
+import logging
+import time
+from collections import namedtuple
+from threading import Lock, Thread
+from typing import Any, Callable, Iterable, List, Optional, Type, Union
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import QuerySet, Model
+
+# prefix for all application cache keys
+CACHE_KEY_PREFIX = 'rns'
+# prefix for table version keys
+VERSION_KEY = 'version'
+# prefix for cache statistics keys
+STATS_KEY = 'stats'
+
+logger = logging.getLogger(__name__)
+
+HitRatio = namedtuple('HitRatio', ['hits', 'misses', 'ratio'])
+
+# cache backends whose entries are not shared between processes
+PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+
+def is_shared_cache(alias: str = 'default') -> bool:
+    """
+    Check if the specified cache is shared between processes
+    :param alias: cache alias; default 'default'
+    :return: True if shared
+    """
+    return not isinstance(caches[alias], PROCESS_LOCAL_BACKENDS)
+
+
+def cache_key(*args: Any) -> str:
+    """
+    Generate a cache key from the specified parts
+    :param args: key parts
+    :return: cache key
+    """
+    return ':'.join(
+        [CACHE_KEY_PREFIX] + [str(arg) for arg in args])
+
+
+def _table_name(table: Union[str, Type[Model], Model]) -> str:
+    """
+    Get the database table name of the specified table or model
+    :param table: table name, model or model instance
+    :return: table name
+    """
+    return table if isinstance(table, str) else table._meta.db_table
+
+
+def _version_key(table: Union[str, Type[Model], Model]) -> str:
+    """
+    Generate the version key for a table
+    :param table: table name, model or model instance
+    :return: cache key
+    """
+    return cache_key(VERSION_KEY, _table_name(table))
+
+
+def _initial_version() -> int:
+    """
+    Get an initial version number. Time-based so versions restarted after
+    a cache eviction don't collide with keys generated before the eviction
+    :return: version number
+    """
+    return time.time_ns() // 1000
+
+
+def table_versions(
+        tables: Iterable[Union[str, Type[Model], Model]]) -> str:
+    """
+    Get the combined current version of the specified tables
+    :param tables: table names, models or model instances
+    :return: version string
+    """
+    keys = [_version_key(table) for table in tables]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            version = _initial_version()
+            # another process may have set it in the meantime
+            if not cache.add(key, version, timeout=None):
+                version = cache.get(key, version)
+            versions[key] = version
+    return '.'.join([str(versions[key]) for key in keys])
+
+
+def bump_table_version(table: Union[str, Type[Model], Model]):
+    """
+    Bump the version of the specified table, invalidating all cache entries
+    generated from it
+    :param table: table name, model or model instance
+    """
+    key = _version_key(table)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # no current version
+        cache.add(key, _initial_version(), timeout=None)
+
+
+def queryset_tables(query_set: QuerySet) -> List[str]:
+    """
+    Get the names of the tables directly referenced by the specified query
+    set. Note: tables only referenced in subqueries are not included.
+    :param query_set: query set
+    :return: sorted list of table names
+    """
+    tables = {join.table_name for join in query_set.query.alias_map.values()}
+    tables.add(query_set.model._meta.db_table)
+    return sorted(tables)
+
+
+def queryset_digest(query_set: QuerySet) -> str:
+    """
+    Generate a digest identifying the specified query set.
+    The digest is generated from the compiled sql and parameters, so query
+    sets which would run the same query have the same digest, regardless
+    of the order in which their terms were added.
+    :param query_set: query set
+    :return: digest or empty string if the query set can never return
+            results
+    """
+    try:
+        sql, params = query_set.query.sql_with_params()
+    except EmptyResultSet:
+        return ''
+    return hashlib.sha1(
+        f'{sql}|{params!r}'.encode('utf-8')).hexdigest()
+
+
+def queryset_key(
+    *args: Any, query_set: QuerySet,
+    tables: Iterable[Union[str, Type[Model]]] = None
+) -> str:
+    """
+    Generate a cache key for the specified query set. The key includes the
+    versions of the tables referenced by the query set, so it changes
+    whenever one of those tables is written to.
+    :param args: key parts to prefix the query set digest with
+    :param query_set: query set
+    :param tables: additional tables to include versions of, e.g. tables
+                referenced in subqueries; default None
+    :return: cache key
+    """
+    digest = queryset_digest(query_set)
+    all_tables = set(queryset_tables(query_set))
+    if tables:
+        all_tables.update(map(_table_name, tables))
+    return cache_key(
+        *args, query_set.model._meta.label_lower, digest,
+        table_versions(sorted(all_tables)))
+
+
+class TableVersionedValue:
+    """
+    In-process value built from database tables, which is rebuilt, or
+    updated if an updater is specified, when the tables have been written to
+    since it was built
+    """
+    builder: Callable[[], Any]
+    """ Function to build the value """
+    tables: List[Union[str, Type[Model]]]
+    """ Tables the value is built from """
+    min_age: Union[float, Callable[[], float]]
+    """
+    Min age in seconds before a stale value is rebuilt, or function
+    returning same
+    """
+    updater: Optional[Callable[[Any], Any]]
+    """
+    Function to update a stale value, returning the updated value; if None
+    a stale value is rebuilt
+    """
+    background: Union[bool, Callable[[], bool]]
+    """
+    Rebuild a stale value in a background thread, serving the stale value
+    in the meantime, or function returning same
+    """
+
+    def __init__(self, builder: Callable[[], Any],
+                 tables: Iterable[Union[str, Type[Model]]],
+                 min_age: Union[float, Callable[[], float]] = 0,
+                 updater: Callable[[Any], Any] = None,
+                 background: Union[bool, Callable[[], bool]] = False):
+        self.builder = builder
+        self.tables = list(tables)
+        self.min_age = min_age
+        self.updater = updater
+        self.background = background
+        self._value = None
+        self._version = None
+        self._built = 0.0
+        self._rebuilding = False
+        # guards the value; never held while building
+        self._lock = Lock()
+        # serialises builds
+        self._build_lock = Lock()
+
+    @property
+    def min_age_secs(self) -> float:
+        """ Min age in seconds before a stale value is rebuilt """
+        return self.min_age() if callable(self.min_age) else self.min_age
+
+    @property
+    def is_background(self) -> bool:
+        """ Rebuild a stale value in a background thread """
+        return self.background() if callable(self.background) \
+            else self.background
+
+    def get(self, current_only: bool = False) -> Optional[Any]:
+        """
+        Get the value, building it if required. A stale value is rebuilt if
+        it is older than the min age, otherwise the stale value is returned.
+        If background rebuilding is enabled, the stale value is returned
+        while it is rebuilt.
+        :param current_only: only return a value which is current; default
+                            False
+        :return: value, or None if `current_only` and the value is stale
+        """
+        version = table_versions(self.tables)
+        with self._lock:
+            value = self._value
+            if value is not None:
+                if self._version == version:
+                    return value
+                age = time.monotonic() - self._built
+                if age < self.min_age_secs:
+                    return None if current_only else value
+                if self.is_background:
+                    if not self._rebuilding:
+                        self._rebuilding = True
+                        Thread(target=self._rebuild, args=(version, ),
+                               daemon=True).start()
+                    return None if current_only else value
+
+        # no value or rebuilding in the foreground
+        return self._build(version)
+
+    def _build(self, version: str) -> Any:
+        """
+        Build or update the value
+        :param version: version of the tables before building
+        :return: value
+        """
+        with self._build_lock:
+            with self._lock:
+                value = self._value
+                if value is not None and self._version == version:
+                    # built by another thread while waiting
+                    return value
+
+            value = self.builder() \
+                if value is None or self.updater is None \
+                else self.updater(value)
+
+            with self._lock:
+                self._value = value
+                self._version = version
+                self._built = time.monotonic()
+            return value
+
+    def _rebuild(self, version: str):
+        """
+        Rebuild the value in a background thread
+        :param version: version of the tables before building
+        """
+        try:
+            self._build(version)
+        except Exception:
+            logger.exception('Background rebuild failed')
+        finally:
+            with self._lock:
+                self._rebuilding = False
+            # database connections are per thread
+            connections.close_all()
+
+    def warm(self, wait: bool = False):
+        """
+        Build the value if it has not been built, e.g. at startup
+        :param wait: wait for the value to be built; default False
+        """
+        if wait:
+            self.get()
+        else:
+            with self._lock:
+                if self._value is not None or self._rebuilding:
+                    return
+                self._rebuilding = True
+            Thread(target=self._rebuild,
+                   args=(table_versions(self.tables), ),
+                   daemon=True).start()
+
+    def invalidate(self):
+        """ Discard the value, so it is rebuilt on next access """
+        with self._lock:
+            self._value = None
+            self._version = None
+
+
+class CacheStats:
+    """
+    Hit and miss counters for a cache, held in the default cache. The
+    counters are only shared between processes if the cache backend is,
+    see is_shared_cache()
+    """
+    name: str
+    """ Name of the cache """
+
+    _registry = {}
+
+    def __init__(self, name: str):
+        self.name = name
+        self._keys = [cache_key(STATS_KEY, name, counter)
+                      for counter in ['hits', 'misses']]
+        CacheStats._registry[name] = self
+
+    @staticmethod
+    def all() -> List['CacheStats']:
+        """
+        Get all cache stats
+        :return: list of cache stats ordered by name
+        """
+        return [CacheStats._registry[name]
+                for name in sorted(CacheStats._registry)]
+
+    def record(self, hits: int = 0, misses: int = 0):
+        """
+        Record cache hits and misses
+        :param hits: number of hits
+        :param misses: number of misses
+        """
+        for key, count in zip(self._keys, [hits, misses]):
+            if count:
+                try:
+                    cache.incr(key, count)
+                except ValueError:
+                    # no current count, another process may have set it
+                    # in the meantime
+                    if not cache.add(key, count, timeout=None):
+                        cache.incr(key, count)
+
+    def get(self) -> HitRatio:
+        """
+        Get the hit ratio
+        :return: tuple of hits, misses and ratio of hits to lookups
+        """
+        counts = cache.get_many(self._keys)
+        hits, misses = [counts.get(key, 0) for key in self._keys]
+        lookups = hits + misses
+        return HitRatio(
+            hits=hits, misses=misses,
+            ratio=hits / lookups if lookups else 0.0)
+
+    def reset(self):
+        """ Reset the counters """
+        cache.delete_many(self._keys)
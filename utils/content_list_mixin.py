@@ -25,6 +25,7 @@ from http import HTTPStatus
 from typing import Type, Callable, Tuple, Optional, List, Any, Union
 
 from django.core.paginator import Paginator
+from django.db.models import QuerySet, Model
 from django.db.models.functions import Lower
 from django.http import HttpRequest, HttpResponse
 from django.template.loader import render_to_string
@@ -37,7 +38,9 @@ from .search import (
 
 from .misc import Crud
 from .models import DESC_LOOKUP
+from .paginator import CountingPaginator, CountStrategy
 from .query_params import QuerySetParams
+from .result_ids import cached_result_ids, ResultIdList
 from .enums import (
     QueryOption, QueryArg, SortOrder, PerPage6, ChoiceArg, PerPageMixin
 )
@@ -66,6 +69,8 @@ HREF_CTX = 'href'
 LABEL_CTX = 'label'
 HIDDEN_CTX = 'hidden'
 STATUS_CTX = 'status'
+RESULT_COUNT_CTX = 'result_count'
+COUNT_ESTIMATED_CTX = 'count_estimated'
 
 # from django.views.generic.list.MultipleObjectMixin
 PAGINATOR_CTX = 'paginator'
@@ -78,6 +83,8 @@ OPINION_PAGINATION_ON_ENDS = 1
 class ContentListMixin(generic.ListView):
     """ Mixin for content list views """
 
+    paginator_class = CountingPaginator
+
     # sort order options to display
     sort_order: Type[SortOrder]
     # user which initiated request
@@ -88,6 +95,10 @@ class ContentListMixin(generic.ListView):
     # query type
     query_type: Any
     sub_query_type: Any
+    # query set params applied to queryset
+    query_set_params: Optional[QuerySetParams]
+    # query set to count for pagination, without the display projection
+    count_query_set: Optional[QuerySet]
 
     def __init__(self):
         self.sort_order = None
@@ -98,6 +109,8 @@ class ContentListMixin(generic.ListView):
         # query type
         self.query_type = None
         self.sub_query_type = None
+        self.query_set_params = None
+        self.count_query_set = None
 
     def initialise(self, non_reorder_args: List[str] = None):
         """
@@ -134,6 +147,7 @@ class ContentListMixin(generic.ListView):
         # set queryset
         query_set_params, query_entered, query_kwargs = \
             self.set_queryset(query_params)
+        self.query_set_params = query_set_params
         self.apply_queryset_param(
             query_params, query_set_params, query_entered,
             **(query_kwargs or {}))
@@ -304,6 +318,74 @@ class ContentListMixin(generic.ListView):
             if isinstance(per_page, PerPageMixin) and per_page.is_all else \
             query_params[PER_PAGE_QUERY].value_arg_or_value
 
+    def get_result_ids_tables(
+            self) -> Optional[List[Union[str, Type[Model]]]]:
+        """
+        Get the additional tables whose writes invalidate the cached list of
+        result ids for the current request.
+        (Subclasses may override this to enable result id caching)
+        :return: list of tables (may be empty), or None to not cache
+        """
+        return None
+
+    def get_queryset(self):
+        """
+        Return the list of items for this view. If result id caching is
+        enabled, the ordered list of matching ids is cached and only the
+        rows for the requested page are retrieved; pages beyond the cached
+        ids are retrieved from the database. If the query set params
+        specify ranked ids, the results are in ranked order.
+        """
+        query_set = super().get_queryset()
+        tables = self.get_result_ids_tables()
+        if tables is not None and isinstance(query_set, QuerySet):
+            ids, count = cached_result_ids(query_set, tables=tables)
+            ranked_ids = None if self.query_set_params is None else \
+                self.query_set_params.ranked_ids
+            if ranked_ids is not None:
+                # ranking overrides ordering, but other terms may have
+                # excluded some of the ranked results
+                matched = set(ids)
+                ids = [pk for pk in ranked_ids if pk in matched]
+            if ranked_ids is None or len(ids) == count:
+                query_set = ResultIdList(
+                    ids, self.project_queryset(
+                        query_set.model._default_manager.all()),
+                    count=count, remainder=self.project_queryset(query_set))
+        if not isinstance(query_set, QuerySet):
+            return query_set
+        # the projection is only required for the rows of the page
+        self.count_query_set = query_set
+        return self.project_queryset(query_set)
+
+    def project_queryset(self, query_set: QuerySet) -> QuerySet:
+        """
+        Restrict the query set used to retrieve the rows for the requested
+        page to the fields required to display the list.
+        (Subclasses may override this to only retrieve the displayed fields)
+        :param query_set: query set to restrict
+        :return: restricted query set
+        """
+        return query_set
+
+    def get_count_strategy(self) -> CountStrategy:
+        """
+        Get the strategy to use when counting the list for pagination.
+        (Subclasses may override this to use estimates for lists of all the
+         rows in a table)
+        :return: count strategy
+        """
+        return CountStrategy.CACHED
+
+    def get_paginator(self, queryset, per_page, orphans=0,
+                      allow_empty_first_page=True, **kwargs):
+        """ Return an instance of the paginator for this view """
+        return self.paginator_class(
+            queryset, per_page, orphans=orphans,
+            allow_empty_first_page=allow_empty_first_page,
+            count_strategy=self.get_count_strategy(),
+            count_list=self.count_query_set, **kwargs)
+
     def get_ordering(self):
         """ Get ordering of list """
         ordering = self.ordering
@@ -326,12 +408,14 @@ class ContentListMixin(generic.ListView):
         - sort order
         - per page
         - pagination
+        - result count
         :param context: context to update
         :return: context
         """
         # initial ordering if secondary sort
         main_order = self.ordering \
             if isinstance(self.ordering, str) else self.ordering[0]
+        paginator = context[PAGINATOR_CTX]
         context.update({
             SORT_ORDER_CTX: self.sort_order,
             SELECTED_SORT_CTX: list(
@@ -348,11 +432,13 @@ class ContentListMixin(generic.ListView):
                 LABEL_CTX:
                     f"page {page}" if page != Paginator.ELLIPSIS else '',
                 HIDDEN_CTX: f'{str(bool(page != Paginator.ELLIPSIS)).lower()}',
-            } for page in context[PAGINATOR_CTX].get_elided_page_range(
+            } for page in paginator.get_elided_page_range(
                 number=context[PAGE_OBJ_CTX].number,
                 on_each_side=OPINION_PAGINATION_ON_EACH_SIDE,
                 on_ends=OPINION_PAGINATION_ON_ENDS)
-            ]
+            ],
+            RESULT_COUNT_CTX: paginator.count,
+            COUNT_ESTIMATED_CTX: getattr(paginator, 'is_estimate', False),
         })
         return context
 
@@ -20,6 +20,7 @@
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
 from dataclasses import dataclass
+from typing import Dict, List, Tuple
 
 
 @dataclass
@@ -64,6 +65,17 @@ def add_navbar_attr(context: dict, key: str, is_active: bool = False,
     return context
 
 
+def navbar_menu_map(menus: List[Tuple[str, List[str]]]) -> Dict[str, str]:
+    """
+    Generate a map of route names to the navbar menus they activate
+    :param menus: list of tuples of menu context key and route names
+    :return: map of route name to menu context key
+    """
+    return {
+        route: key for key, routes in menus for route in routes
+    }
+
+
 def html_tag(tag_name: str, tag_content: str = '', **kwargs):
     """
     Generate a html tag
@@ -31,6 +31,8 @@ from django.core.exceptions import PermissionDenied
 from django.db import models
 from django.http import HttpRequest
 
+from .permission_cache import permission_snapshot
+
 # workaround for self type hints from https://peps.python.org/pep-0673/
 TypeCrud = TypeVar("TypeCrud", bound="Crud")
 
@@ -134,9 +136,10 @@ def permission_check(
     user = request.user if isinstance(request, HttpRequest) else request
     has_perm = user.is_superuser
     if not has_perm:
+        perms = permission_snapshot(user)
         for chk_perm in ensure_list(perm_op):
-            has_perm = user.has_perm(
-                permission_name(model, chk_perm, app_label=app_label))
+            has_perm = permission_name(
+                model, chk_perm, app_label=app_label) in perms
             if not has_perm:
                 break
 
@@ -0,0 +1,150 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from enum import Enum, auto
+from typing import Optional, Type
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet, Model
+from django.utils.functional import cached_property
+
+from .cache import queryset_key
+
+COUNT_KEY = 'count'
+
+
+class CountStrategy(Enum):
+    """ Enum representing strategies for counting paginated lists """
+    EXACT = auto()
+    """ Always perform an exact count """
+    CACHED = auto()
+    """ Exact count, cached for the count cache timeout """
+    ESTIMATED = auto()
+    """
+    Database planner estimate if available, otherwise a cached exact count.
+    Only suitable for lists of all the rows in a table
+    """
+
+
+def estimated_count(
+        model: Type[Model], using: str = 'default') -> Optional[int]:
+    """
+    Get the planner estimate of the number of rows in a model's table.
+    Only available for PostgreSQL, where the estimate is maintained by
+    VACUUM/ANALYZE in `pg_class.reltuples`.
+    :param model: model to get estimate for
+    :param using: database alias; default 'default'
+    :return: estimated row count or None if not available
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class "
+            "WHERE oid = %s::regclass", [model._meta.db_table])
+        row = cursor.fetchone()
+
+    # reltuples is -1 if the table has never been vacuumed or analyzed
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 \
+        else None
+
+
+class CountingPaginator(Paginator):
+    """
+    Paginator which counts its object list using a CountStrategy.
+    Note: when an estimate is used, the last page(s) may be empty or
+    rows at the end of the list may not be reachable until the estimate
+    is refreshed by the database.
+    """
+    count_strategy: CountStrategy
+    """ Strategy to use when counting """
+    cache_timeout: int
+    """ Timeout in seconds for cached counts """
+    is_estimate: bool
+    """ Count is an estimate flag """
+    count_list: Optional[QuerySet]
+    """
+    Query set to count instead of the object list, e.g. without the
+    annotations only required to display the objects
+    """
+
+    def __init__(self, object_list, per_page, orphans=0,
+                 allow_empty_first_page=True,
+                 count_strategy: CountStrategy = CountStrategy.EXACT,
+                 cache_timeout: int = None, count_list: QuerySet = None):
+        super().__init__(object_list, per_page, orphans=orphans,
+                         allow_empty_first_page=allow_empty_first_page)
+        self.count_strategy = count_strategy
+        self.count_list = count_list
+        self.cache_timeout = settings.LIST_COUNT_CACHE_TIMEOUT \
+            if cache_timeout is None else cache_timeout
+        self.is_estimate = False
+
+    @cached_property
+    def count(self) -> int:
+        """ Total number of objects, across all pages """
+        count = None
+        if isinstance(self._counted, QuerySet):
+            if self.count_strategy == CountStrategy.ESTIMATED:
+                count = self._estimated_count()
+                self.is_estimate = count is not None
+            if count is None:
+                count = self._counted.count() \
+                    if self.count_strategy == CountStrategy.EXACT \
+                    else self._cached_count()
+        return super().count if count is None else count
+
+    @property
+    def _counted(self):
+        """ List to count """
+        return self.object_list if self.count_list is None \
+            else self.count_list
+
+    def _estimated_count(self) -> Optional[int]:
+        """
+        Get the estimated count of the object list
+        :return: count or None if estimate not available or below threshold
+        """
+        count = estimated_count(
+            self._counted.model, using=self._counted.db)
+        # small tables are cheap to count exactly
+        return count if count is not None and \
+            count >= settings.LIST_COUNT_ESTIMATE_THRESHOLD else None
+
+    def _cached_count(self) -> int:
+        """
+        Get the cached exact count of the object list
+        :return: count
+        """
+        # ordering doesn't affect count, so exclude from key
+        query_set = self._counted.order_by()
+        key = queryset_key(COUNT_KEY, query_set=query_set)
+        count = cache.get(key)
+        if count is None:
+            count = query_set.count()
+            cache.set(key, count, timeout=self.cache_timeout)
+        return count
@@ -0,0 +1,141 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from typing import TYPE_CHECKING, Any, FrozenSet, Iterable, Union
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import (
+    cache_key, table_versions, bump_table_version, is_shared_cache
+)
+
+if TYPE_CHECKING:
+    from user.models import User
+
+# prefix for permission snapshot keys
+PERMS_KEY = 'perms'
+# attribute of user object in which the request's snapshot is memoised
+SNAPSHOT_ATTR = '_perm_snapshot'
+# attributes of user object in which the auth backends cache permissions
+BACKEND_CACHE_ATTRS = [
+    '_perm_cache', '_user_perm_cache', '_group_perm_cache'
+]
+
+
+def _pk_of(obj: Any) -> Any:
+    """
+    Get the primary key of the specified object
+    :param obj: model instance or primary key
+    :return: primary key
+    """
+    return getattr(obj, 'pk', obj)
+
+
+def _user_version_name(user: Any) -> str:
+    """
+    Get the version name of a user's permissions
+    :param user: user or user id
+    :return: version name
+    """
+    return f'{PERMS_KEY}_user_{_pk_of(user)}'
+
+
+def _group_version_names(groups: Iterable[Any]) -> list[str]:
+    """
+    Get the version names of groups' permissions
+    :param groups: groups or group ids
+    :return: list of version names
+    """
+    return [f'{PERMS_KEY}_group_{_pk_of(group)}' for group in groups]
+
+
+def permission_snapshot(user: 'User') -> FrozenSet[str]:
+    """
+    Get the set of permissions the specified user has. The snapshot is
+    memoised on the user object for the duration of the request, and if the
+    default cache is shared between processes, cached across requests under
+    the versions of the user's and their groups' permissions.
+    :param user: user
+    :return: set of permission names; `<app_label>.<codename>`
+    """
+    snapshot = getattr(user, SNAPSHOT_ATTR, None)
+    if snapshot is not None:
+        return snapshot
+
+    if not user.is_active or user.is_anonymous:
+        snapshot = frozenset()
+    elif not is_shared_cache():
+        # invalidations in other processes would not be seen, so revoked
+        # permissions could still be granted; memoise for the request only
+        snapshot = frozenset(user.get_all_permissions())
+    else:
+        key = cache_key(PERMS_KEY, user.pk,
+                        table_versions([_user_version_name(user)]))
+        entry = cache.get(key)
+        if entry is not None:
+            group_ids, group_versions, snapshot = entry
+            if table_versions(
+                    _group_version_names(group_ids)) != group_versions:
+                # permissions of one of the groups have changed
+                snapshot = None
+
+        if snapshot is None:
+            group_ids = sorted(
+                user.groups.values_list('pk', flat=True))
+            # get versions before the permissions, so a change while they
+            # are being read invalidates the snapshot
+            group_versions = table_versions(_group_version_names(group_ids))
+            snapshot = frozenset(user.get_all_permissions())
+            cache.set(key, (group_ids, group_versions, snapshot),
+                      timeout=settings.PERMISSION_SNAPSHOT_CACHE_TIMEOUT)
+
+    setattr(user, SNAPSHOT_ATTR, snapshot)
+    return snapshot
+
+
+def _forget_snapshot(user: 'User'):
+    """
+    Remove the permissions memoised on a user object
+    :param user: user
+    """
+    for attr in [SNAPSHOT_ATTR] + BACKEND_CACHE_ATTRS:
+        if hasattr(user, attr):
+            delattr(user, attr)
+
+
+def invalidate_user_permissions(user: Union['User', int, str]):
+    """
+    Invalidate the permission snapshot of the specified user
+    :param user: user or user id
+    """
+    bump_table_version(_user_version_name(user))
+    if not isinstance(user, (int, str)):
+        _forget_snapshot(user)
+
+
+def invalidate_group_permissions(group: Any):
+    """
+    Invalidate the permission snapshots of the members of the specified group
+    :param group: group or group id
+    """
+    bump_table_version(_group_version_names([group])[0])
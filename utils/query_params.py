@@ -21,7 +21,7 @@
 #  DEALINGS IN THE SOFTWARE.
 #
 from enum import Enum, auto
-from typing import Callable, Any, Type, TypeVar, Union
+from typing import Callable, Any, Type, TypeVar, Union, Optional, List
 
 from django.db.models import Q, QuerySet, Model
 
@@ -75,6 +75,10 @@ class QuerySetParams:
     """ List of invalid search terms in set """
     search_type: SearchType
     """ Search result type """
+    ranked_ids: Optional[List[int]]
+    """
+    Ids of results in ranked order, overrides ordering of results if set
+    """
 
     def __init__(self, is_distinct: bool = True):
         self.is_distinct = is_distinct
@@ -88,6 +92,7 @@ class QuerySetParams:
         self.search_terms = []
         self.invalid_terms = []
         self.search_type = SearchType.NONE
+        self.ranked_ids = None
 
     def clear(self):
         """ Clear the query set params """
@@ -101,6 +106,7 @@ class QuerySetParams:
         self.search_terms = []
         self.invalid_terms = []
         self.search_type = SearchType.NONE
+        self.ranked_ids = None
 
     @property
     def and_count(self):
@@ -192,6 +198,8 @@ class QuerySetParams:
             self.params.update(query_set_param.params)
             self.search_terms.extend(query_set_param.search_terms)
             self.invalid_terms.extend(query_set_param.invalid_terms)
+            if query_set_param.ranked_ids is not None:
+                self.ranked_ids = query_set_param.ranked_ids
 
     def add_or_lookup(self, key: str, value: Any):
         """
@@ -244,6 +252,17 @@ class QuerySetParams:
         else:
             raise NotImplementedError(f'Unknown query term: {query_type}')
 
+    def set_ranked_ids(self, key: str, lookup: str, ids: List[int]):
+        """
+        Set the ids of the results in ranked order, and restrict the results
+        to those ids
+        :param key: query key
+        :param lookup: id lookup term
+        :param ids: ids in ranked order
+        """
+        self.ranked_ids = ids
+        self.add_and_lookup(key, lookup, ids)
+
     def add_search_term(self, term: str):
         """
         Add a search term
@@ -0,0 +1,155 @@
+#  MIT License
+#
+#  Copyright (c) 2023 Ian Buttimer
+#
+#  Permission is hereby granted, free of charge, to any person obtaining a copy
+#  of this software and associated documentation files (the "Software"), to
+#  deal in the Software without restriction, including without limitation the
+#  rights to use, copy, modify, merge, publish, distribute, sublicense, and/or
+#  sell copies of the Software, and to permit persons to whom the Software is
+#  furnished to do so, subject to the following conditions:
+#
+#  The above copyright notice and this permission notice shall be included in
+#  all copies or substantial portions of the Software.
+#
+#  THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+#  IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+#  FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+#  AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+#  LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+#  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
+#  DEALINGS IN THE SOFTWARE.
+#
+from collections.abc import Sequence
+from typing import Iterable, List, Optional, Tuple, Type, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import QuerySet, Model
+
+from .cache import queryset_key
+
+RESULT_IDS_KEY = 'ids'
+
+
+def cached_result_ids(
+    query_set: QuerySet,
+    tables: Iterable[Union[str, Type[Model]]] = None,
+    timeout: int = None, max_ids: int = None
+) -> Tuple[List[int], int]:
+    """
+    Get the ordered list of ids of the objects matching the specified
+    query set, and the number of matching objects, from the cache if
+    available. If there are more than `max_ids` matches, only the ids of the
+    first `max_ids` are cached.
+    The cache key is generated from the compiled sql of the query set,
+    (i.e. query terms and ordering) and the versions of the tables it
+    references, plus the versions of any additional `tables`.
+    :param query_set: ordered query set
+    :param tables: additional tables whose writes invalidate the result,
+                e.g. tables referenced in subqueries; default None
+    :param timeout: cache timeout in seconds;
+                default settings.RESULT_IDS_CACHE_TIMEOUT
+    :param max_ids: maximum number of ids to cache;
+                default settings.RESULT_IDS_CACHE_MAX
+    :return: tuple of list of ids (at most `max_ids`) and number of matches
+    """
+    if timeout is None:
+        timeout = settings.RESULT_IDS_CACHE_TIMEOUT
+    if max_ids is None:
+        max_ids = settings.RESULT_IDS_CACHE_MAX
+
+    key = queryset_key(RESULT_IDS_KEY, query_set=query_set, tables=tables)
+    entry = cache.get(key)
+    if entry is None:
+        ids = list(
+            query_set.values_list(
+                query_set.model._meta.pk.name, flat=True)[:max_ids]
+        )
+        # ordering doesn't affect count
+        count = query_set.order_by().count() \
+            if len(ids) == max_ids else len(ids)
+        entry = (ids, count)
+        cache.set(key, entry, timeout=timeout)
+
+    return entry
+
+
+class ResultIdList(Sequence):
+    """
+    Sequence of model instances backed by an ordered list of ids.
+    Slicing only fetches the rows for the ids in the slice, so paginating
+    only retrieves the rows for the requested page. If the list of ids only
+    covers the start of the results, the rows beyond them are retrieved
+    from the `remainder` query set.
+    """
+    ids: List[int]
+    """ Ordered list of ids """
+    rows: QuerySet
+    """ Query set to retrieve rows from """
+    count: int
+    """ Number of instances in the sequence """
+    remainder: Optional[QuerySet]
+    """ Ordered query set of all instances, to retrieve rows beyond `ids` """
+    chunk_size: int
+    """ Number of rows to fetch at a time when iterating """
+
+    def __init__(self, ids: List[int], rows: QuerySet,
+                 chunk_size: int = 100, count: int = None,
+                 remainder: QuerySet = None):
+        self.ids = ids
+        self.rows = rows
+        self.count = len(ids) if count is None or remainder is None \
+            else count
+        self.remainder = remainder
+        self.chunk_size = chunk_size
+
+    @property
+    def model(self) -> Type[Model]:
+        """ Model of instances in the sequence """
+        return self.rows.model
+
+    @property
+    def is_complete(self) -> bool:
+        """ The ids of all the instances are available """
+        return len(self.ids) >= self.count
+
+    def fetch(self, ids: List[int]) -> List[Model]:
+        """
+        Fetch the instances with the specified ids
+        :param ids: ids of instances to fetch
+        :return: list of instances in the order of `ids`
+        """
+        if not ids:
+            return []
+        by_id = {
+            obj.pk: obj for obj in self.rows.filter(pk__in=ids)
+        }
+        # objects deleted since the ids were cached are skipped
+        return [by_id[pk] for pk in ids if pk in by_id]
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if stop <= len(self.ids):
+                return self.fetch(self.ids[item])
+            # beyond the cached ids
+            return list(self.remainder[start:stop])[::step]
+        if item < 0:
+            item += len(self)
+        if item >= len(self.ids) and item < len(self):
+            return self.remainder[item]
+        obj = self.fetch([self.ids[item]])
+        if not obj:
+            raise IndexError('ResultIdList object no longer exists')
+        return obj[0]
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for start in range(0, len(self.ids), self.chunk_size):
+            yield from self.fetch(self.ids[start:start + self.chunk_size])
+        if not self.is_complete:
+            yield from self.remainder[len(self.ids):].iterator(
+                chunk_size=self.chunk_size)
@@ -20,11 +20,16 @@
 #  FROM,OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 #  DEALINGS IN THE SOFTWARE.
 #
+import operator
 import re
+from datetime import datetime
+from functools import lru_cache
 from re import Pattern
-from typing import Any, Dict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
 
 from .enums import QueryOption
+from .query_params import QuerySetParams
 
 # chars used to delimit queries
 MARKER_CHARS = ['=', '"', "'"]
@@ -79,38 +84,6 @@ AMOUNT_LOOKUP = {
 }
 
 
-KEY_TERM_GROUP = 1  # match group of required text & key of non-date terms
-TERM_GROUP = 3      # match group of required text of non-date terms
-
-
-def regex_pattern(mark: str, pattern: str) -> Pattern[Any]:
-    """
-    Compile a regex pattern for query params
-    :param mark: query key
-    :param pattern: value pattern
-    :return: compiled regex
-    """
-    return re.compile(
-        # match single/double-quoted text after 'mark='
-        # if 'mark=' is not preceded by a non-space
-        rf'.*(?<!\S)({mark}=(?P<quote>[\'\"])({pattern})(?P=quote))\s*.*',
-        re.IGNORECASE)
-
-
-def regex_matchers(queries: list[str]) -> dict:
-    """
-    Generate regex matchers for specified query terms
-    :param queries: list of query terms to generate matchers for
-    :return: matchers
-    """
-    return {
-        q: regex_pattern(mark, r'.*?') for q, mark in [
-            # use query term as marker
-            (qm, qm) for qm in queries
-        ]
-    }
-
-
 DATE_SEP = '-'
 SLASH_SEP = '/'
 DOT_SEP = '.'
@@ -121,27 +94,9 @@ DATE_SEPARATORS = [
 SEP_REGEX = rf'[{"".join(DATE_SEPARATORS)}]'
 DMY_REGEX = r'(\d+)(?P<sep>[-/. ])(\d+)(?P=sep)(\d*)'
 
-
-DATE_KEY_TERM_GROUP = 1     # match group of required text & key of date terms
-DATE_QUERY_GROUP = 2        # match group of required text
-DATE_QUERY_DAY_GROUP = 4    # match group of day text
-DATE_QUERY_MTH_GROUP = 6    # match group of month text
-DATE_QUERY_YR_GROUP = 7     # match group of year text
-
-
-def regex_date_matchers() -> dict:
-    """
-    Generate regex matchers for date query terms
-    :return: matchers
-    """
-    return {
-        # match single/double-quoted date after 'xxx='
-        # if 'xxx=' is not preceded by a non-space
-        q: regex_pattern(mark, DMY_REGEX) for q, mark in [
-            # use query term as marker
-            (qm, qm) for qm in DATE_QUERIES
-        ]
-    }
+DMY_DAY_GROUP = 1       # match group of day text
+DMY_MTH_GROUP = 3       # match group of month text
+DMY_YR_GROUP = 4        # match group of year text
 
 
 def amount_lookups(field: str) -> Dict[str, str]:
@@ -154,3 +109,272 @@ def amount_lookups(field: str) -> Dict[str, str]:
         # query param: filter lookup
         query: f'{field}{AMOUNT_LOOKUP[query]}' for query in AMOUNT_QUERIES
     }
+
+
+# range query operators, e.g. 'cal<500'
+RANGE_LTE = '<='
+RANGE_GTE = '>='
+RANGE_LT = '<'
+RANGE_GT = '>'
+RANGE_EQ = '='
+RANGE_OPERATORS = {
+    # operator: (filter lookup suffix, comparison function)
+    RANGE_LTE: ('__lte', operator.le),
+    RANGE_GTE: ('__gte', operator.ge),
+    RANGE_LT: ('__lt', operator.lt),
+    RANGE_GT: ('__gt', operator.gt),
+    RANGE_EQ: ('__exact', operator.eq),
+}
+# chars used to delimit range queries
+RANGE_MARKER_CHARS = [RANGE_LT, RANGE_GT, RANGE_EQ]
+RANGE_NUMBER_REGEX = r'\d+(?:\.\d*)?|\.\d+'
+
+
+def range_lookup(field: str, op: str) -> str:
+    """
+    Generate a range lookup
+    :param field: field term to do lookup on
+    :param op: range operator, one of RANGE_OPERATORS
+    :return: filter lookup
+    """
+    return f'{field}{RANGE_OPERATORS[op][0]}'
+
+
+class SearchToken(NamedTuple):
+    """ Class representing a term in a search value """
+    query: str
+    """ Query key, in lowercase """
+    term: str
+    """ Complete text of the term, e.g. 'key="easy"' """
+    value: str
+    """ Value of the term, e.g. 'easy' """
+    operator: Optional[str] = None
+    """ Range operator of range terms, e.g. '<', otherwise None """
+
+    @property
+    def is_range(self) -> bool:
+        """ Range term flag """
+        return self.operator is not None
+
+
+# function to add the query for a term to query set params;
+# returns True if successfully added
+TokenHandler = Callable[[QuerySetParams, SearchToken], bool]
+# attribute of handlers whose results only depend on the term
+CACHEABLE_ATTR = 'cacheable'
+
+
+class ParsedTerm(NamedTuple):
+    """ Class representing a term in a search value and its handler result """
+    token: SearchToken
+    """ Search term """
+    params: Optional[QuerySetParams]
+    """
+    Query set params added by the term's handler, or None if the handler
+    is not cacheable
+    """
+    valid: bool
+    """ Term successfully added flag """
+
+
+def cacheable_handler(handler: TokenHandler) -> TokenHandler:
+    """
+    Mark a term handler as cacheable; i.e. the query set params it adds
+    only depend on the term, so may be reused for the same term.
+    Handlers which access the database are not cacheable.
+    :param handler: handler
+    :return: handler
+    """
+    setattr(handler, CACHEABLE_ATTR, True)
+    return handler
+
+
+# max number of search values to memoise tokens and handler results of,
+# per tokenizer
+TOKENIZE_CACHE_SIZE = 256
+
+
+def _alternatives(options: List[str]) -> str:
+    """
+    Generate a regex alternation of options, longest first so an option
+    which is a prefix of another doesn't match first
+    :param options: options
+    :return: regex
+    """
+    return '|'.join([
+        re.escape(option)
+        for option in sorted(options, key=len, reverse=True)
+    ])
+
+
+class SearchTokenizer:
+    """
+    Class to split a search value into terms in a single pass, and apply
+    the terms to query set params using the registered term handlers.
+    Terms are either:
+    - single/double-quoted text after 'mark=', e.g. 'key="easy"', or
+    - a range, 'mark' followed by a range operator and a number,
+      e.g. 'cal<500'
+    where 'mark' is a query key, which is not preceded by a non-space.
+    """
+    handlers: Dict[str, TokenHandler]
+    """ Handlers of quoted terms """
+    range_handlers: Dict[str, TokenHandler]
+    """ Handlers of range terms """
+    regex: Pattern[Any]
+    """ Combined pattern of all terms """
+
+    def __init__(self, handlers: Dict[str, TokenHandler],
+                 range_handlers: Dict[str, TokenHandler] = None,
+                 cache_size: int = TOKENIZE_CACHE_SIZE):
+        """
+        Initialise object
+        :param handlers: dict of query key and handler of quoted terms
+        :param range_handlers: dict of query key and handler of range
+                            terms; default None
+        :param cache_size: max number of search values to memoise tokens
+                        and handler results of
+        """
+        self.handlers = {
+            query.lower(): handler for query, handler in handlers.items()
+        }
+        self.range_handlers = {
+            query.lower(): handler
+            for query, handler in (range_handlers or {}).items()
+        }
+
+        patterns = []
+        if self.handlers:
+            # single/double-quoted text after 'mark='
+            patterns.append(
+                rf'(?P<query>{_alternatives(list(self.handlers))})='
+                rf'(?P<quote>[\'\"])(?P<value>.*?)(?P=quote)')
+        if self.range_handlers:
+            # 'mark', range operator and number not followed by a non-space
+            patterns.append(
+                rf'(?P<range_query>{_alternatives(list(self.range_handlers))})'
+                rf'(?P<operator>{_alternatives(list(RANGE_OPERATORS))})'
+                rf'(?P<range_value>{RANGE_NUMBER_REGEX})(?!\S)')
+        # terms must not be preceded by a non-space
+        self.regex = re.compile(
+            rf'(?<!\S)(?:{"|".join(patterns) or "(?!)"})', re.IGNORECASE)
+
+        self.tokenize = lru_cache(maxsize=cache_size)(self._tokenize)
+        self.parse = lru_cache(maxsize=cache_size)(self._parse)
+
+    def _tokenize(self, value: str) -> Tuple[SearchToken, ...]:
+        """
+        Split a search value into terms.
+        Note: use `tokenize` which memoises results
+        :param value: search value
+        :return: tuple of terms in the order they appear in `value`
+        """
+        tokens = []
+        for match in self.regex.finditer(value):
+            groups = match.groupdict()
+            if groups.get('range_query'):
+                tokens.append(SearchToken(
+                    query=groups['range_query'].lower(),
+                    term=match.group(0), value=groups['range_value'],
+                    operator=groups['operator']))
+            else:
+                tokens.append(SearchToken(
+                    query=groups['query'].lower(),
+                    term=match.group(0), value=groups['value']))
+        return tuple(tokens)
+
+    def _handler(self, token: SearchToken) -> TokenHandler:
+        """
+        Get the handler of a term
+        :param token: search term
+        :return: handler
+        """
+        return self.range_handlers[token.query] if token.is_range \
+            else self.handlers[token.query]
+
+    def _parse(self, value: str) -> Tuple[ParsedTerm, ...]:
+        """
+        Split a search value into terms, and get the results of the
+        cacheable term handlers.
+        Note: use `parse` which memoises results
+        :param value: search value
+        :return: tuple of parsed terms in the order they appear in `value`
+        """
+        terms = []
+        for token in self.tokenize(value):
+            handler = self._handler(token)
+            params = None
+            valid = False
+            if getattr(handler, CACHEABLE_ATTR, False):
+                params = QuerySetParams()
+                valid = handler(params, token)
+            terms.append(ParsedTerm(token=token, params=params, valid=valid))
+        return tuple(terms)
+
+    def apply(self, value: str,
+              query_set_params: QuerySetParams) -> QuerySetParams:
+        """
+        Apply the terms in a search value to query set params. The results
+        of cacheable term handlers are memoised, other handlers are called
+        every time.
+        :param value: search value
+        :param query_set_params: query set params to update
+        :return: query set params
+        """
+        for term in self.parse(value):
+            if term.params is not None:
+                # replay the cached result
+                query_set_params.add(term.params)
+                valid = term.valid
+            else:
+                valid = self._handler(term.token)(
+                    query_set_params, term.token)
+
+            save_term_func = query_set_params.add_search_term \
+                if valid else query_set_params.add_invalid_term
+            save_term_func(term.token.term)
+
+        return query_set_params
+
+
+def lookup_handler(field_lookups: Dict[str, str]) -> TokenHandler:
+    """
+    Generate a term handler which adds an AND lookup of the term value
+    :param field_lookups: dict of query key and filter lookup
+    :return: handler
+    """
+    @cacheable_handler
+    def handler(query_set_params: QuerySetParams, token: SearchToken) -> bool:
+        query_set_params.add_and_lookup(
+            token.query, field_lookups[token.query], token.value)
+        return True
+    return handler
+
+
+def date_lookup_handler(field_lookups: Dict[str, str]) -> TokenHandler:
+    """
+    Generate a term handler which adds an AND lookup of the date term value,
+    e.g. 'before="31/12/2023"'
+    :param field_lookups: dict of query key and filter lookup
+    :return: handler
+    """
+    @cacheable_handler
+    def handler(query_set_params: QuerySetParams, token: SearchToken) -> bool:
+        match = re.fullmatch(DMY_REGEX, token.value.strip())
+        if not match:
+            return False
+        try:
+            date = datetime(*[
+                int(match.group(idx)) for idx in [
+                    DMY_YR_GROUP, DMY_MTH_GROUP, DMY_DAY_GROUP
+                ]
+            ], tzinfo=ZoneInfo("UTC"))
+        except ValueError:
+            # ignore invalid date
+            # TODO add errors to QuerySetParams
+            # so they can be returned to user
+            return False
+        query_set_params.add_and_lookup(
+            token.query, field_lookups[token.query], date)
+        return True
+    return handler
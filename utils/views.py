@@ -40,6 +40,8 @@ HTML_CTX = 'html'                           # html for rewrite
 INNER_HTML_CTX = 'inner_html'               # inner html for rewrite
 ENTITY_CTX = 'entity'                       # entity name
 
+RESOLVER_MATCH_ATTR = 'resolver_match'      # request resolver match
+
 
 def redirect_on_success_or_render(request: HttpRequest, success: bool,
                                   redirect_to: str = '/',
@@ -72,23 +74,35 @@ def resolve_req(
         request: HttpRequest, query: str = None) -> Optional[ResolverMatch]:
     """
     Resolve a request, or a request query parameter
+    Note: the resolver match of the request is cached on the request, see
+          `base.middleware.ResolverMatchMiddleware`
     :param request: http request
     :param query: optional query parameter to resolve
     :return: resolver match or None
     """
-    match = None
-    path = None
     if query and query in request.GET:
-        path = request.GET[query].lower()
-    else:
-        path = request.path
+        return _resolve_path(request.GET[query].lower())
+
+    match = getattr(request, RESOLVER_MATCH_ATTR, None)
+    if match is None:
+        match = _resolve_path(request.path)
+        # same attribute django sets when it resolves the request
+        setattr(request, RESOLVER_MATCH_ATTR, match)
+    return match
+
 
+def _resolve_path(path: str) -> Optional[ResolverMatch]:
+    """
+    Resolve a path
+    :param path: path to resolve
+    :return: resolver match or None
+    """
+    match = None
     if path:
         try:
             match = resolve(path)
         except Resolver404:
             pass    # unable to resolve
-
     return match
 
 